@@ -18,6 +18,7 @@ from TwitchChannelPointsMiner.classes.entities.Streamer import (
     StreamerSettings,
 )
 from TwitchChannelPointsMiner.classes.Exceptions import StreamerDoesNotExistException
+from TwitchChannelPointsMiner.classes.HttpPool import HttpSettings
 from TwitchChannelPointsMiner.classes.Settings import FollowersOrder, Priority, Settings
 from TwitchChannelPointsMiner.classes.Twitch import Twitch
 from TwitchChannelPointsMiner.classes.WebSocketsPool import WebSocketsPool
@@ -27,7 +28,6 @@ from TwitchChannelPointsMiner.utils import (
     at_least_one_value_in_settings_is,
     check_versions,
     get_user_agent,
-    internet_connection_available,
     set_default_settings,
 )
 
@@ -62,6 +62,7 @@ class TwitchChannelPointsMiner:
         "events_predictions",
         "minute_watcher_thread",
         "sync_campaigns_thread",
+        "stream_poller_thread",
         "ws_pool",
         "session_id",
         "running",
@@ -85,6 +86,8 @@ class TwitchChannelPointsMiner:
         logger_settings: LoggerSettings = LoggerSettings(),
         # Default values for all streamers
         streamer_settings: StreamerSettings = StreamerSettings(),
+        # Connection pool and timeouts used for all the Twitch requests
+        http_settings: HttpSettings = HttpSettings(),
     ):
         # Fixes TypeError: 'NoneType' object is not subscriptable
         if not username or username == "your-twitch-username":
@@ -97,25 +100,6 @@ class TwitchChannelPointsMiner:
 
         Settings.disable_at_in_nickname = disable_at_in_nickname
 
-        import socket
-
-        def is_connected():
-            try:
-                # resolve the IP address of the Twitch.tv domain name
-                socket.gethostbyname("twitch.tv")
-                return True
-            except OSError:
-                pass
-            return False
-
-        # check for Twitch.tv connectivity every 5 seconds
-        error_printed = False
-        while not is_connected():
-            if not error_printed:
-                logger.error("Waiting for Twitch.tv connectivity...")
-                error_printed = True
-            time.sleep(5)
-
         # Analytics switch
         Settings.enable_analytics = enable_analytics
 
@@ -137,7 +121,12 @@ class TwitchChannelPointsMiner:
 
         # user_agent = get_user_agent("FIREFOX")
         user_agent = get_user_agent("CHROME")
-        self.twitch = Twitch(self.username, user_agent, password)
+        self.twitch = Twitch(self.username, user_agent, password, http_settings)
+
+        # The connectivity monitor checks Twitch.tv in background
+        if self.twitch.http.connectivity.wait_online(timeout=5) is False:
+            logger.error("Waiting for Twitch.tv connectivity...")
+            self.twitch.http.connectivity.wait_online()
 
         self.claim_drops_startup = claim_drops_startup
         self.priority = priority if isinstance(priority, list) else [priority]
@@ -146,6 +135,7 @@ class TwitchChannelPointsMiner:
         self.events_predictions = {}
         self.minute_watcher_thread = None
         self.sync_campaigns_thread = None
+        self.stream_poller_thread = None
         self.ws_pool = None
 
         self.session_id = str(uuid.uuid4())
@@ -259,9 +249,10 @@ class TwitchChannelPointsMiner:
                 f"Loading data for {len(streamers_name)} streamers. Please wait...",
                 extra={"emoji": ":nerd_face:"},
             )
+            # GQL requests are paced by the rate limiter of Twitch (Twitch.gql_limiter)
+            self.twitch.resolve_channel_ids(streamers_name)
             for username in streamers_name:
                 if username in streamers_name:
-                    time.sleep(random.uniform(0.3, 0.7))
                     try:
                         streamer = (
                             streamers_dict[username]
@@ -293,10 +284,13 @@ class TwitchChannelPointsMiner:
             # 2. Check if streamers are online
             # 3. DEACTIVATED: Check if the user is a moderator. (was used before the 5th of April 2021 to deactivate predictions)
             for streamer in self.streamers:
-                time.sleep(random.uniform(0.3, 0.7))
                 self.twitch.load_channel_points_context(streamer)
-                self.twitch.check_streamer_online(streamer)
                 # self.twitch.viewer_is_mod(streamer)
+            self.twitch.check_streamers_online(self.streamers)
+            # The streamers still offline didn't change status, apply it once
+            for streamer in self.streamers:
+                if streamer.is_online is False:
+                    streamer.notify_status()
 
             self.original_streamers = [
                 streamer.channel_points for streamer in self.streamers
@@ -328,6 +322,13 @@ class TwitchChannelPointsMiner:
             self.minute_watcher_thread.name = "Minute watcher"
             self.minute_watcher_thread.start()
 
+            self.stream_poller_thread = threading.Thread(
+                target=self.twitch.poll_streams_status,
+                args=(self.streamers,),
+            )
+            self.stream_poller_thread.name = "Stream status poller"
+            self.stream_poller_thread.start()
+
             self.ws_pool = WebSocketsPool(
                 twitch=self.twitch,
                 streamers=self.streamers,
@@ -382,7 +383,6 @@ class TwitchChannelPointsMiner:
                         PubsubTopic("community-points-channel-v1", streamer=streamer)
                     )
 
-            refresh_context = time.time()
             while self.running:
                 time.sleep(random.uniform(20, 60))
                 # Do an external control for WebSocket. Check if the thread is running
@@ -391,20 +391,18 @@ class TwitchChannelPointsMiner:
                     if (
                         self.ws_pool.ws[index].is_reconnecting is False
                         and self.ws_pool.ws[index].elapsed_last_ping() > 10
-                        and internet_connection_available() is True
+                        and self.twitch.http.connectivity.is_online() is True
                     ):
                         logger.info(
                             f"#{index} - The last PING was sent more than 10 minutes ago. Reconnecting to the WebSocket..."
                         )
                         WebSocketsPool.handle_reconnection(self.ws_pool.ws[index])
 
-                if ((time.time() - refresh_context) // 60) >= 30:
-                    refresh_context = time.time()
-                    for index in range(0, len(self.streamers)):
-                        if self.streamers[index].is_online:
-                            self.twitch.load_channel_points_context(
-                                self.streamers[index]
-                            )
+                # The balances are kept up to date by PubSub, refresh only the channels that may have drifted
+                for streamer in self.twitch.balance_tracker.pop_drifted(
+                    [streamer for streamer in self.streamers if streamer.is_online]
+                ):
+                    self.twitch.load_channel_points_context(streamer)
 
     def end(self, signum, frame):
         if not self.running:
@@ -422,6 +420,7 @@ class TwitchChannelPointsMiner:
                     streamer.irc_chat.join()
 
         self.running = self.twitch.running = False
+        self.twitch.watch_selector.wake()
         if self.ws_pool is not None:
             self.ws_pool.end()
 
@@ -431,6 +430,9 @@ class TwitchChannelPointsMiner:
         if self.sync_campaigns_thread is not None:
             self.sync_campaigns_thread.join()
 
+        if self.stream_poller_thread is not None:
+            self.stream_poller_thread.join()
+
         # Check if all the mutex are unlocked.
         # Prevent breaks of .json file
         for streamer in self.streamers:
@@ -458,6 +460,19 @@ class TwitchChannelPointsMiner:
             f"Duration {datetime.now() - self.start_datetime}",
             extra={"emoji": ":hourglass:"},
         )
+        logger.debug(f"GQL rate limiter: {self.twitch.gql_limiter.stats()}")
+        logger.debug(f"Hosts health: {self.twitch.http.health()}")
+        logger.debug(f"Connectivity: {self.twitch.http.connectivity.stats()}")
+        logger.debug(f"PubSub balances: {self.twitch.balance_tracker.stats()}")
+        if Priority.EXPECTED_POINTS in self.priority:
+            logger.debug(
+                f"Expected points per minute: {self.twitch.watch_selector.scores()}"
+            )
+        if self.ws_pool is not None:
+            logger.debug(f"PubSub actions: {self.ws_pool.actions.stats()}")
+            logger.debug(
+                f"PubSub duplicates: {self.ws_pool.deduplicator.stats()}"
+            )
 
         if not Settings.logger.less and self.events_predictions != {}:
             print("")
@@ -0,0 +1,119 @@
+import heapq
+import itertools
+import logging
+import time
+from enum import IntEnum
+from threading import Condition, Thread
+
+logger = logging.getLogger(__name__)
+
+
+# Lower value = executed first
+class ActionPriority(IntEnum):
+    URGENT = 0  # Claims that expire (bonus, moments)
+    NORMAL = 1  # Stream status checks, raids
+    BACKGROUND = 2  # Analytics, community goals
+
+    def __str__(self):
+        return self.name
+
+
+class ActionQueue(object):
+    __slots__ = [
+        "max_size",
+        "heap",
+        "keys",
+        "counter",
+        "condition",
+        "threads",
+        "executed",
+        "dropped",
+        "coalesced",
+        "total_latency",
+        "max_latency",
+    ]
+
+    # Bounded priority queue of the actions requested by the PubSub messages (claims, raids, ...),
+    # executed by a pool of workers so the WebSocket threads never wait for a HTTP request.
+    # An action with a key already waiting in the queue (e.g. the same claim id) is coalesced.
+    def __init__(self, workers=4, max_size=1000):
+        self.max_size = max_size
+        # (priority, sequence, key, enqueued_at, function, args)
+        self.heap = []
+        self.keys = set()
+        self.counter = itertools.count()
+        self.condition = Condition()
+        self.executed = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.total_latency = 0
+        self.max_latency = 0
+        self.threads = []
+        for index in range(workers):
+            thread = Thread(target=self.__run)
+            thread.daemon = True
+            thread.name = f"PubSub action #{index}"
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, function, *args, priority=ActionPriority.NORMAL, key=None):
+        with self.condition:
+            if key is not None and key in self.keys:
+                self.coalesced += 1
+                return
+            if len(self.heap) >= self.max_size:
+                # Full, make room by dropping the least important action (maybe this one)
+                worst = max(self.heap)
+                if priority >= worst[0]:
+                    self.__drop(function.__name__)
+                    return
+                self.heap.remove(worst)
+                heapq.heapify(self.heap)
+                self.keys.discard(worst[2])
+                self.__drop(worst[4].__name__)
+            if key is not None:
+                self.keys.add(key)
+            heapq.heappush(
+                self.heap,
+                (priority, next(self.counter), key, time.time(), function, args),
+            )
+            self.condition.notify()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def stats(self):
+        with self.condition:
+            return {
+                "pending": len(self.heap),
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+                "avg_latency": round(self.total_latency / max(self.executed, 1), 3),
+                "max_latency": round(self.max_latency, 3),
+            }
+
+    def __drop(self, name):
+        self.dropped += 1
+        logger.warning(f"Too many PubSub actions waiting, {name} dropped")
+
+    def __run(self):
+        while True:
+            with self.condition:
+                while self.heap == []:
+                    self.condition.wait()
+                _, _, key, enqueued_at, function, args = heapq.heappop(self.heap)
+                self.keys.discard(key)
+                # Time spent in the queue
+                latency = time.time() - enqueued_at
+                self.executed += 1
+                self.total_latency += latency
+                self.max_latency = max(self.max_latency, latency)
+
+            try:
+                function(*args)
+            except Exception:
+                logger.error(
+                    f"Exception raised in PubSub action {function.__name__}",
+                    exc_info=True,
+                )
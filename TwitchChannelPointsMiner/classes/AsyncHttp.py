@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from threading import Thread
+
+import requests
+
+try:
+    import h2  # noqa: F401
+    import httpx
+except ImportError:
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+
+# Optional asyncio transport (pip install httpx[http2]).
+# All the requests share one HTTP/2 connection per host, multiplexed on a single event loop thread.
+# The sync methods mirror requests so the existing callers keep working unchanged.
+class AsyncHttp(object):
+    __slots__ = ["user_agent", "pool_size", "timeout", "loop", "thread", "client"]
+
+    def __init__(self, user_agent, pool_size=10, timeout=(5, 20)):
+        self.user_agent = user_agent
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.client = None
+        self.loop = asyncio.new_event_loop()
+        self.thread = Thread(target=self.loop.run_forever)
+        self.thread.daemon = True
+        self.thread.name = "HTTP/2 event loop"
+        self.thread.start()
+        self.submit(self.__create_client()).result()
+
+    @staticmethod
+    def available():
+        return httpx is not None
+
+    async def __create_client(self):
+        connect, read = self.timeout
+        self.client = httpx.AsyncClient(
+            http2=True,
+            headers={"User-Agent": self.user_agent},
+            limits=httpx.Limits(max_connections=self.pool_size),
+            timeout=httpx.Timeout(read, connect=connect),
+        )
+
+    def submit(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    async def arequest(self, method, url, **kwargs):
+        # Translate the requests arguments
+        if "timeout" in kwargs:
+            connect, read = kwargs.pop("timeout")
+            kwargs["timeout"] = httpx.Timeout(read, connect=connect)
+        if "allow_redirects" in kwargs:
+            kwargs["follow_redirects"] = kwargs.pop("allow_redirects")
+        if isinstance(kwargs.get("data"), (bytes, str)):
+            kwargs["content"] = kwargs.pop("data")
+        return await self.client.request(method, url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        try:
+            return self.submit(self.arequest(method, url, **kwargs)).result()
+        # The callers only handle the requests exceptions
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(e)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e)
+        except httpx.ConnectError as e:
+            raise requests.exceptions.ConnectionError(e)
+        except httpx.HTTPError as e:
+            raise requests.exceptions.RequestException(e)
+
+    def close(self):
+        if self.client is not None:
+            self.submit(self.client.aclose()).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
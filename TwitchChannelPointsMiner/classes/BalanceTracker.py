@@ -0,0 +1,94 @@
+import logging
+import time
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+# A watched stream gives +10 points every 5 minutes, two missed WATCH gains are suspicious
+MISSING_WATCH_GAIN = 11 * 60
+# The heartbeats of a watch slot are ~20 seconds apart, a longer pause restarts the count
+WATCH_GAP = 2 * 60
+
+
+class BalanceTracker(object):
+    __slots__ = ["messages", "watched_since", "last_watched_at", "drifted", "mutex"]
+
+    # The community-points-user-v1 messages carry the authoritative balance of every channel.
+    # The context (GQL ChannelPointsContext) is loaded again only for the channels that may have
+    # drifted: a PubSub reconnection gap, a missing WATCH gain or a balance that doesn't match
+    # the points earned.
+    def __init__(self):
+        # channel_id -> number of points messages received
+        self.messages = {}
+        # channel_id -> watched without a WATCH gain since
+        self.watched_since = {}
+        self.last_watched_at = {}
+        # channel_id -> reason
+        self.drifted = {}
+        self.mutex = Lock()
+
+    # Apply the balance of a points-earned / points-spent message
+    def update(self, streamer, balance, earned=None):
+        with self.mutex:
+            channel_id = streamer.channel_id
+            self.messages[channel_id] = self.messages.get(channel_id, 0) + 1
+            # points-spent doesn't carry the amount, the balance is only applied
+            if earned is not None and streamer.channel_points + earned != balance:
+                self.__drift(
+                    streamer,
+                    f"balance mismatch ({streamer.channel_points} + {earned} != {balance})",
+                )
+            streamer.channel_points = balance
+
+    def watch_gain(self, streamer):
+        with self.mutex:
+            self.watched_since[streamer.channel_id] = time.time()
+
+    # A minute watched event was sent successfully
+    def watched(self, streamer):
+        now = time.time()
+        with self.mutex:
+            channel_id = streamer.channel_id
+            if now - self.last_watched_at.get(channel_id, 0) > WATCH_GAP:
+                self.watched_since[channel_id] = now
+            self.last_watched_at[channel_id] = now
+            if now - self.watched_since[channel_id] > MISSING_WATCH_GAIN:
+                self.watched_since[channel_id] = now
+                self.__drift(streamer, "missing WATCH gain")
+
+    # The messages sent while the connection was down are lost
+    def reconnected(self, streamers):
+        with self.mutex:
+            for streamer in streamers:
+                self.__drift(streamer, "PubSub reconnection")
+
+    # The context was loaded, the balance is up to date
+    def synced(self, streamer):
+        with self.mutex:
+            self.drifted.pop(streamer.channel_id, None)
+
+    # Return (and forget) the streamers to refresh
+    def pop_drifted(self, streamers):
+        with self.mutex:
+            drifted = [
+                streamer
+                for streamer in streamers
+                if streamer.channel_id in self.drifted
+            ]
+            for streamer in drifted:
+                logger.debug(
+                    f"Refresh the channel points of {streamer}: {self.drifted.pop(streamer.channel_id)}"
+                )
+            return drifted
+
+    def stats(self):
+        with self.mutex:
+            return {
+                "channels": len(self.messages),
+                "messages": sum(self.messages.values()),
+                "drifted": len(self.drifted),
+            }
+
+    def __drift(self, streamer, reason):
+        if streamer.channel_id not in self.drifted:
+            self.drifted[streamer.channel_id] = reason
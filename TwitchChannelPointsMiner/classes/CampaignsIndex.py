@@ -0,0 +1,75 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CampaignsIndex(object):
+    __slots__ = ["campaigns", "games", "progress"]
+
+    # The active campaigns indexed by id and by game id.
+    # The inventory is applied only to the campaigns whose progress changed since the last sync.
+    def __init__(self):
+        # campaign id -> Campaign
+        self.campaigns = {}
+        # game id -> [Campaign, ...]
+        self.games = {}
+        # campaign id -> progress of the last sync
+        self.progress = {}
+
+    def __len__(self):
+        return len(self.campaigns)
+
+    # New list of the active campaigns (dashboard). The drops already known keep their
+    # Drop object (and progress), the next sync applies the inventory to all the campaigns again
+    # because the claimed drops must be removed from the new ones.
+    def update(self, campaigns):
+        updated = {}
+        for campaign in campaigns:
+            current = self.campaigns.get(campaign.id)
+            if current is not None:
+                drops = {drop.id: drop for drop in current.drops}
+                campaign.drops = [drops.get(drop.id, drop) for drop in campaign.drops]
+                campaign.in_inventory = current.in_inventory
+            updated[campaign.id] = campaign
+
+        self.campaigns = updated
+        self.progress = {}
+        self.games = {}
+        for campaign in updated.values():
+            self.games.setdefault(campaign.game["id"], []).append(campaign)
+
+    # Apply the inventory (dropCampaignsInProgress), return the campaigns that changed
+    def sync(self, inventory_campaigns, claim):
+        changed = []
+        for progress in inventory_campaigns:
+            campaign = self.campaigns.get(progress["id"])
+            if campaign is None:
+                continue
+            signature = tuple(
+                (
+                    drop["id"],
+                    drop["self"]["currentMinutesWatched"],
+                    drop["self"]["isClaimed"],
+                    drop["self"]["dropInstanceID"],
+                    drop["self"]["hasPreconditionsMet"],
+                )
+                for drop in progress["timeBasedDrops"]
+            )
+            if self.progress.get(campaign.id) == signature:
+                continue
+            self.progress[campaign.id] = signature
+
+            campaign.in_inventory = True
+            campaign.sync_drops(progress["timeBasedDrops"], claim)
+            # Remove all the claimed drops
+            campaign.clear_drops()
+            changed.append(campaign)
+        return changed
+
+    # The campaigns with drops left of the game streamed, among the ones of the channel
+    def for_stream(self, stream):
+        return [
+            campaign
+            for campaign in self.games.get(stream.game_id(), [])
+            if campaign.drops != [] and campaign.id in stream.campaigns_ids
+        ]
@@ -0,0 +1,113 @@
+import logging
+import random
+import time
+from enum import Enum, auto
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    CLOSED = auto()
+    OPEN = auto()
+    HALF_OPEN = auto()
+
+    def __str__(self):
+        return self.name
+
+
+class CircuitBreaker(object):
+    __slots__ = [
+        "name",
+        "failure_threshold",
+        "reset_timeout",
+        "max_timeout",
+        "state",
+        "failures",
+        "opened",
+        "open_until",
+        "probing",
+        "total_failures",
+        "total_rejected",
+        "mutex",
+    ]
+
+    # CLOSED: requests go through, `failure_threshold` consecutive failures open the circuit.
+    # OPEN: requests are rejected until the (jittered) timeout expires, then the circuit is HALF_OPEN.
+    # HALF_OPEN: a single probe goes through. Success closes the circuit, failure opens it again
+    # with a doubled timeout (up to max_timeout).
+    def __init__(self, name, failure_threshold=5, reset_timeout=30, max_timeout=600):
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout = reset_timeout
+        self.max_timeout = max(max_timeout, reset_timeout)
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.open_until = 0
+        self.probing = False
+        self.total_failures = 0
+        self.total_rejected = 0
+        self.mutex = Lock()
+
+    def __repr__(self):
+        return f"CircuitBreaker(name={self.name}, state={self.state}, failures={self.failures})"
+
+    def is_open(self):
+        return self.state == CircuitState.OPEN and time.time() < self.open_until
+
+    def allow(self):
+        with self.mutex:
+            if self.state == CircuitState.OPEN and time.time() >= self.open_until:
+                self.state = CircuitState.HALF_OPEN
+                self.probing = False
+
+            if self.state == CircuitState.CLOSED:
+                return True
+            if self.state == CircuitState.HALF_OPEN and self.probing is False:
+                self.probing = True
+                return True
+            self.total_rejected += 1
+            return False
+
+    def on_success(self):
+        with self.mutex:
+            if self.state != CircuitState.CLOSED:
+                logger.info(f"{self.name} is available again, circuit closed")
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+            self.opened = 0
+            self.probing = False
+
+    def on_failure(self):
+        with self.mutex:
+            self.failures += 1
+            self.total_failures += 1
+            if (
+                self.state == CircuitState.HALF_OPEN
+                or self.failures >= self.failure_threshold
+            ):
+                self.__open()
+
+    def __open(self):
+        self.opened += 1
+        timeout = min(
+            self.max_timeout, self.reset_timeout * 2 ** (self.opened - 1)
+        ) * random.uniform(0.8, 1.2)
+        self.state = CircuitState.OPEN
+        self.open_until = time.time() + timeout
+        self.probing = False
+        logger.warning(
+            f"{self.name} is failing ({self.failures} consecutive errors), circuit open for {round(timeout)}s"
+        )
+
+    def stats(self):
+        return {
+            "state": str(self.state),
+            "failures": self.failures,
+            "total_failures": self.total_failures,
+            "total_rejected": self.total_rejected,
+            "retry_in": max(0, round(self.open_until - time.time()))
+            if self.state == CircuitState.OPEN
+            else 0,
+        }
@@ -0,0 +1,85 @@
+import logging
+import re
+import time
+from threading import Lock, Thread
+
+import requests
+
+from TwitchChannelPointsMiner.constants import CLIENT_VERSION, URL
+from TwitchChannelPointsMiner.utils import gql_error_messages, search_stream
+
+logger = logging.getLogger(__name__)
+
+TWILIGHT_BUILD_ID_PATTERN = re.compile(
+    r'window\.__twilightBuildID\s*=\s*"([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})"'
+)
+# Error messages returned by GQL when the Client-Version header is outdated
+VERSION_MISMATCH_PATTERN = re.compile(r"client[\s_-]?version", re.IGNORECASE)
+
+
+class ClientVersion(object):
+    __slots__ = ["http", "ttl", "version", "expire_at", "refreshing", "mutex"]
+
+    def __init__(self, http, ttl=3600, version=CLIENT_VERSION):
+        self.http = http
+        self.ttl = ttl
+        self.version = version
+        self.expire_at = 0
+        self.refreshing = False
+        self.mutex = Lock()
+
+    def __repr__(self):
+        return f"ClientVersion(version={self.version}, expire_at={self.expire_at})"
+
+    # Never blocks: return the cached version and refresh it in background once expired
+    def get(self):
+        if time.time() >= self.expire_at:
+            self.__refresh_in_background()
+        return self.version
+
+    def invalidate(self):
+        self.expire_at = 0
+        self.__refresh_in_background()
+
+    def __refresh_in_background(self):
+        with self.mutex:
+            if self.refreshing is True:
+                return
+            self.refreshing = True
+
+        thread = Thread(target=self.refresh)
+        thread.daemon = True
+        thread.name = "Client version refresh"
+        thread.start()
+
+    def refresh(self):
+        # Until the next successful fetch keep the current version and retry later
+        self.expire_at = time.time() + min(self.ttl, 60)
+        try:
+            response = self.http.get(URL, stream=True)
+            if response.status_code != 200:
+                response.close()
+                logger.debug(f"Error with the client version: {response.status_code}")
+                return self.version
+            # The build ID is in the <head>, don't download the whole page
+            matcher = search_stream(response, TWILIGHT_BUILD_ID_PATTERN)
+            if not matcher:
+                logger.debug("Error with the client version: no match")
+                return self.version
+            self.version = matcher.group(1)
+            self.expire_at = time.time() + self.ttl
+            logger.debug(f"Client version: {self.version}")
+            return self.version
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error with the client version: {e}")
+            return self.version
+        finally:
+            with self.mutex:
+                self.refreshing = False
+
+    @staticmethod
+    def is_mismatch(response):
+        return any(
+            VERSION_MISMATCH_PATTERN.search(message) is not None
+            for message in gql_error_messages(response)
+        )
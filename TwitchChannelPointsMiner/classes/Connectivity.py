@@ -0,0 +1,114 @@
+import logging
+import socket
+import time
+from threading import Condition, Thread
+
+logger = logging.getLogger(__name__)
+
+PROBE_ADDRESS = ("twitch.tv", 443)
+
+
+class Connectivity(object):
+    __slots__ = [
+        "address",
+        "interval",
+        "offline_interval",
+        "timeout",
+        "online",
+        "suspect",
+        "changed_at",
+        "last_probe_at",
+        "last_success_at",
+        "condition",
+        "thread",
+    ]
+
+    # Shared online/offline state of the internet connection.
+    # The requests report their outcome: a response proves the connection works, a connection
+    # error makes the state suspect and asks for a probe. Without traffic the connection is
+    # probed every interval seconds (offline_interval while offline).
+    # The waiters block on the condition instead of probing and sleeping on their own.
+    def __init__(
+        self, address=PROBE_ADDRESS, interval=60, offline_interval=10, timeout=3
+    ):
+        self.address = address
+        self.interval = interval
+        self.offline_interval = offline_interval
+        self.timeout = timeout
+        # None until the first probe
+        self.online = None
+        self.suspect = False
+        self.changed_at = time.time()
+        self.last_probe_at = 0
+        self.last_success_at = 0
+        self.condition = Condition()
+        self.thread = Thread(target=self.__run)
+        self.thread.daemon = True
+        self.thread.name = "Connectivity monitor"
+        self.thread.start()
+
+    def is_online(self):
+        return self.online is True and self.suspect is False
+
+    # Return False if the connection is still down after timeout seconds
+    def wait_online(self, timeout=None):
+        with self.condition:
+            return self.condition.wait_for(self.is_online, timeout)
+
+    def success(self):
+        self.last_success_at = time.time()
+        if self.is_online() is False:
+            with self.condition:
+                self.__set(True)
+
+    def failure(self):
+        with self.condition:
+            if self.suspect is False:
+                self.suspect = True
+                self.condition.notify_all()
+
+    def stats(self):
+        return {
+            "online": self.online,
+            "suspect": self.suspect,
+            "since": round(time.time() - self.changed_at),
+        }
+
+    def __probe(self):
+        try:
+            socket.create_connection(self.address, timeout=self.timeout).close()
+            return True
+        except OSError:
+            return False
+
+    def __next_probe_at(self):
+        if self.suspect is True:
+            # Don't probe more than once every few seconds when many requests fail together
+            return self.last_probe_at + 5
+        if self.online is True:
+            return max(self.last_probe_at, self.last_success_at) + self.interval
+        return self.last_probe_at + self.offline_interval
+
+    def __run(self):
+        while True:
+            with self.condition:
+                while time.time() < self.__next_probe_at():
+                    self.condition.wait(self.__next_probe_at() - time.time())
+            online = self.__probe()
+            with self.condition:
+                self.last_probe_at = time.time()
+                self.__set(online)
+
+    def __set(self, online):
+        self.suspect = False
+        if online != self.online:
+            if online is True and self.online is False:
+                logger.info(
+                    "Internet connection available again",
+                    extra={"emoji": ":globe_with_meridians:"},
+                )
+            elif online is False:
+                logger.warning("No internet connection available!")
+            self.online = online
+            self.changed_at = time.time()
+        self.condition.notify_all()
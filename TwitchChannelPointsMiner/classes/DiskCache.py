@@ -0,0 +1,104 @@
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from threading import Lock, Timer
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache(object):
+    __slots__ = [
+        "fname",
+        "ttl",
+        "negative_ttl",
+        "entries",
+        "mutex",
+        "save_timer",
+    ]
+
+    # Small key -> value cache persisted as a JSON file.
+    # A None value is a negative entry (e.g. the streamer doesn't exist) and expires after negative_ttl.
+    # Expired positive entries are still returned, the caller decides how to revalidate them.
+    def __init__(self, fname, ttl=7 * 24 * 3600, negative_ttl=24 * 3600):
+        self.fname = fname
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.entries = {}
+        self.mutex = Lock()
+        self.save_timer = None
+        self.__load()
+
+    def __load(self):
+        if not os.path.isfile(self.fname):
+            return
+        try:
+            with open(self.fname, "r") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unable to load the cache {self.fname}: {e}")
+            self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        try:
+            self.get(key)
+            return True
+        except KeyError:
+            return False
+
+    # Return (value, expired). Raise KeyError if the key is unknown or the negative entry is expired
+    def get(self, key):
+        entry = self.entries[key]
+        age = time.time() - entry["updated_at"]
+        if entry["value"] is None:
+            if age >= self.negative_ttl:
+                raise KeyError(key)
+            return None, False
+        return entry["value"], age >= self.ttl
+
+    def set(self, key, value):
+        with self.mutex:
+            self.entries[key] = {"value": value, "updated_at": round(time.time())}
+            self.__schedule_save()
+
+    # Remove the positive entries matching condition(value), return how many
+    def evict(self, condition):
+        with self.mutex:
+            keys = [
+                key
+                for key, entry in self.entries.items()
+                if entry["value"] is not None and condition(entry["value"])
+            ]
+            for key in keys:
+                del self.entries[key]
+            if keys != []:
+                self.__schedule_save()
+        return len(keys)
+
+    def __schedule_save(self):
+        # Many entries are usually set together, write the file only once
+        if self.save_timer is None:
+            self.save_timer = Timer(1, self.save)
+            self.save_timer.daemon = True
+            self.save_timer.name = "Cache save"
+            self.save_timer.start()
+
+    def save(self):
+        with self.mutex:
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+                self.save_timer = None
+            entries = dict(self.entries)
+
+        temp_fname = self.fname + ".temp"
+        try:
+            Path(os.path.dirname(self.fname)).mkdir(parents=True, exist_ok=True)
+            with open(temp_fname, "w") as temp_file:
+                json.dump(entries, temp_file, indent=4)
+            os.replace(temp_fname, self.fname)
+        except OSError as e:
+            logger.warning(f"Unable to save the cache {self.fname}: {e}")
@@ -0,0 +1,102 @@
+import logging
+import random
+import time
+from threading import Condition, Thread
+
+logger = logging.getLogger(__name__)
+
+
+# Queue of the drops to claim, served by a dedicated worker.
+# The pending drops are claimed together with a single batched GQL request (up to batch_size),
+# with a random pause between the batches. The claimed status is written back to the Drop objects.
+# A failed claim is retried with an exponential backoff (the inventory sync doesn't submit it
+# again while its progress doesn't change).
+class DropClaimer(object):
+    __slots__ = [
+        "claim",
+        "batch_size",
+        "pause",
+        "max_attempts",
+        "retry_delay",
+        "pending",
+        "retries",
+        "condition",
+        "thread",
+    ]
+
+    def __init__(
+        self, claim, batch_size=10, pause=(5, 10), max_attempts=5, retry_delay=60
+    ):
+        # claim(drops) -> [claimed, ...]
+        self.claim = claim
+        self.batch_size = max(batch_size, 1)
+        self.pause = pause
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        # drop_instance_id -> Drop
+        self.pending = {}
+        # drop_instance_id -> (retry at, failed attempts)
+        self.retries = {}
+        self.condition = Condition()
+        self.thread = None
+
+    def submit(self, drop):
+        with self.condition:
+            # Already waiting (the inventory is synced again before the claim)
+            if drop.drop_instance_id not in self.pending:
+                self.pending[drop.drop_instance_id] = drop
+                self.__start()
+                self.condition.notify()
+
+    def __len__(self):
+        return len(self.pending)
+
+    def __start(self):
+        if self.thread is None:
+            self.thread = Thread(target=self.__run)
+            self.thread.daemon = True
+            self.thread.name = "Drop claimer"
+            self.thread.start()
+
+    # The drops ready to be claimed now, or the seconds to wait for the next one
+    def __ready(self):
+        now = time.time()
+        ready = [
+            drop
+            for instance_id, drop in self.pending.items()
+            if self.retries.get(instance_id, (0, 0))[0] <= now
+        ]
+        if ready != []:
+            return ready[: self.batch_size], None
+        if self.pending == {}:
+            return [], None
+        return [], min(retry_at for retry_at, _ in self.retries.values()) - now
+
+    def __run(self):
+        while True:
+            with self.condition:
+                batch, timeout = self.__ready()
+                while batch == []:
+                    self.condition.wait(timeout)
+                    batch, timeout = self.__ready()
+
+            try:
+                results = self.claim(batch)
+            except Exception:
+                logger.error("Exception raised while claiming the drops", exc_info=True)
+                results = [False] * len(batch)
+
+            with self.condition:
+                for drop, claimed in zip(batch, results):
+                    drop.is_claimed = claimed
+                    _, attempts = self.retries.pop(drop.drop_instance_id, (0, 0))
+                    if claimed is False and attempts + 1 < self.max_attempts:
+                        self.retries[drop.drop_instance_id] = (
+                            time.time() + self.retry_delay * 2**attempts,
+                            attempts + 1,
+                        )
+                    else:
+                        # Claimed, or left to claim_all_drops_from_inventory
+                        self.pending.pop(drop.drop_instance_id, None)
+
+            time.sleep(random.uniform(*self.pause))
@@ -0,0 +1,83 @@
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class DropsScheduler(object):
+    __slots__ = ["infeasible"]
+
+    # Only one channel at a time earns progress for the time-based drops, and all the drops of a
+    # campaign progress together. Every campaign is a job built from its binding drop, the one
+    # with the earliest deadline (duration = remaining minutes, deadline = end_at). A drop that
+    # can't be completed before its deadline is reported once and ignored, so it doesn't waste
+    # the watch slot.
+    def __init__(self):
+        self.infeasible = set()
+
+    def select(self, streamers, streamers_index):
+        now = datetime.utcnow()
+        # campaign id -> [campaign, indexes of the streamers that make progress on it]
+        campaigns = {}
+        for index in streamers_index:
+            if streamers[index].drops_condition() is True:
+                for campaign in streamers[index].stream.campaigns:
+                    if campaign.id not in campaigns:
+                        campaigns[campaign.id] = [campaign, []]
+                    campaigns[campaign.id][1].append(index)
+
+        jobs = []
+        for campaign, indexes in campaigns.values():
+            binding = None
+            for drop in campaign.drops:
+                if drop.is_claimed is True or drop.has_preconditions_met is False:
+                    continue
+                remaining = max(drop.minutes_required - drop.current_minutes_watched, 0)
+                deadline = (
+                    min(drop.end_at, campaign.end_at) - now
+                ).total_seconds() / 60
+                if remaining > deadline:
+                    self.__report(campaign, drop, remaining, deadline)
+                    continue
+                # Earliest deadline first, the longest drop on a tie
+                if (
+                    binding is None
+                    or deadline < binding[0]
+                    or (deadline == binding[0] and remaining > binding[1])
+                ):
+                    binding = (deadline, remaining, drop)
+            if binding is not None:
+                deadline, remaining, drop = binding
+                jobs.append((deadline, remaining, indexes, campaign, drop))
+
+        # Earliest deadline first. When a job would finish late, drop the longest job scheduled
+        # so far (Moore-Hodgson): this maximizes the number of campaigns completed in time.
+        scheduled = []
+        elapsed = 0
+        for job in sorted(jobs, key=lambda job: job[0]):
+            scheduled.append(job)
+            elapsed += job[1]
+            if elapsed > job[0]:
+                longest = max(scheduled, key=lambda job: job[1])
+                scheduled.remove(longest)
+                elapsed -= longest[1]
+                deadline, remaining, _, campaign, drop = longest
+                self.__report(
+                    campaign,
+                    drop,
+                    remaining,
+                    deadline,
+                    reason="together with the other campaigns",
+                )
+
+        # The first job of the schedule is the one to watch now
+        return scheduled[0][2][0] if scheduled != [] else None
+
+    def __report(self, campaign, drop, remaining, deadline, reason=None):
+        if drop.id not in self.infeasible:
+            self.infeasible.add(drop.id)
+            reason = "" if reason is None else f" {reason}"
+            logger.info(
+                f"Drop {drop.name} ({campaign.name}) can't be completed{reason}: {remaining} minutes left to watch, {max(round(deadline), 0)} minutes before the end",
+                extra={"emoji": ":hourglass:"},
+            )
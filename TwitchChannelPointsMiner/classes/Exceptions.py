@@ -1,3 +1,6 @@
+from requests.exceptions import RequestException
+
+
 class StreamerDoesNotExistException(Exception):
     pass
 
@@ -12,3 +15,8 @@ class WrongCookiesException(Exception):
 
 class BadCredentialsException(Exception):
     pass
+
+
+# Raised by HttpPool when the circuit breaker of the host is open
+class CircuitOpenException(RequestException):
+    pass
@@ -0,0 +1,99 @@
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Condition, Thread
+
+logger = logging.getLogger(__name__)
+
+
+# GQL accepts a JSON array of operations and answers with an array of results (same order).
+# Operations submitted from different threads within `window` seconds (or until `max_size`
+# operations are waiting) are sent together with a single POST.
+class GqlBatcher(object):
+    __slots__ = [
+        "send",
+        "window",
+        "max_size",
+        "pending",
+        "urgent",
+        "condition",
+        "thread",
+        "executor",
+    ]
+
+    def __init__(self, send, window=0.05, max_size=20, workers=4):
+        self.send = send
+        self.window = window
+        self.max_size = max(max_size, 1)
+        self.pending = []
+        self.urgent = False
+        self.condition = Condition()
+        self.thread = None
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="GQL batch"
+        )
+
+    def post(self, json_data, urgent=False):
+        return self.submit(json_data, urgent=urgent).result()
+
+    # An urgent operation is sent right away (with the operations already waiting)
+    def submit(self, json_data, urgent=False) -> Future:
+        future = Future()
+        with self.condition:
+            self.pending.append((json_data, future))
+            self.urgent = self.urgent or urgent
+            self.__start()
+            self.condition.notify()
+        return future
+
+    def __start(self):
+        if self.thread is None:
+            self.thread = Thread(target=self.__run)
+            self.thread.daemon = True
+            self.thread.name = "GQL batcher"
+            self.thread.start()
+
+    def __run(self):
+        while True:
+            with self.condition:
+                while self.pending == []:
+                    self.condition.wait()
+
+                # Wait a little bit for other operations, unless the batch is already full
+                flush_at = time.monotonic() + self.window
+                while len(self.pending) < self.max_size and self.urgent is False:
+                    remaining = flush_at - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+
+                batch = self.pending[: self.max_size]
+                self.pending = self.pending[self.max_size :]  # noqa: E203
+                self.urgent = False
+
+            # Don't wait for the response, the next batch could be already waiting
+            self.executor.submit(self.__flush, batch)
+
+    def __flush(self, batch):
+        try:
+            if len(batch) == 1:
+                json_data, future = batch[0]
+                future.set_result(self.send(json_data))
+                return
+
+            response = self.send([json_data for json_data, _ in batch])
+            if isinstance(response, list) and len(response) == len(batch):
+                for (_, future), result in zip(batch, response):
+                    future.set_result(result)
+            else:
+                # Something went wrong with the whole request (error dict or {}), all the callers get it
+                logger.debug(
+                    f"Unexpected response for a batch of {len(batch)} GQL operations: {response}"
+                )
+                for _, future in batch:
+                    future.set_result(response if isinstance(response, dict) else {})
+        except Exception as e:
+            logger.error(f"Error while sending a batch of GQL operations: {e}")
+            for _, future in batch:
+                if future.done() is False:
+                    future.set_result({})
@@ -0,0 +1,225 @@
+import logging
+from threading import Lock, Thread
+from types import MappingProxyType
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from TwitchChannelPointsMiner.classes.AsyncHttp import AsyncHttp
+from TwitchChannelPointsMiner.classes.CircuitBreaker import CircuitBreaker
+from TwitchChannelPointsMiner.classes.Connectivity import Connectivity
+from TwitchChannelPointsMiner.classes.Exceptions import CircuitOpenException
+
+logger = logging.getLogger(__name__)
+
+# Hosts served by the HTTP/2 transport when enabled (HttpSettings.http2)
+HTTP2_HOSTS = ["gql.twitch.tv"]
+
+
+class HttpSettings(object):
+    __slots__ = [
+        "pool_size",
+        "connect_timeout",
+        "read_timeout",
+        "warm_up",
+        "client_version_ttl",
+        "gql_batch_window",
+        "gql_batch_size",
+        "gql_rate_limit",
+        "gql_burst",
+        "http2",
+        "breaker_failures",
+        "breaker_timeout",
+    ]
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        connect_timeout: float = 5,
+        read_timeout: float = 20,
+        warm_up: bool = True,
+        client_version_ttl: int = 3600,
+        gql_batch_window: float = 0.05,
+        gql_batch_size: int = 20,
+        gql_rate_limit: float = 20,
+        gql_burst: int = 40,
+        http2: bool = False,
+        breaker_failures: int = 5,
+        breaker_timeout: float = 30,
+    ):
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.warm_up = warm_up
+        self.client_version_ttl = client_version_ttl
+        self.gql_batch_window = gql_batch_window
+        self.gql_batch_size = gql_batch_size
+        self.gql_rate_limit = gql_rate_limit
+        self.gql_burst = gql_burst
+        self.http2 = http2
+        self.breaker_failures = breaker_failures
+        self.breaker_timeout = breaker_timeout
+
+    def timeout(self):
+        return (self.connect_timeout, self.read_timeout)
+
+    def __repr__(self):
+        return f"HttpSettings(pool_size={self.pool_size}, connect_timeout={self.connect_timeout}, read_timeout={self.read_timeout}, warm_up={self.warm_up}, client_version_ttl={self.client_version_ttl}, gql_batch_window={self.gql_batch_window}, gql_batch_size={self.gql_batch_size}, gql_rate_limit={self.gql_rate_limit}, gql_burst={self.gql_burst}, http2={self.http2}, breaker_failures={self.breaker_failures}, breaker_timeout={self.breaker_timeout})"
+
+
+class HeaderContext(object):
+    __slots__ = ["token", "client_version", "headers"]
+
+    # Immutable snapshot of the headers sent with every request.
+    # A new context is built only when the token or the client version changes.
+    def __init__(self, token, client_version, headers):
+        object.__setattr__(self, "token", token)
+        object.__setattr__(self, "client_version", client_version)
+        object.__setattr__(self, "headers", MappingProxyType(dict(headers)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def matches(self, token, client_version):
+        return self.token == token and self.client_version == client_version
+
+
+class HttpPool(object):
+    __slots__ = [
+        "settings",
+        "user_agent",
+        "sessions",
+        "breakers",
+        "mutex",
+        "async_http",
+        "connectivity",
+    ]
+
+    def __init__(self, user_agent, settings: HttpSettings = None):
+        self.settings = settings if settings is not None else HttpSettings()
+        self.user_agent = user_agent
+        # One keep-alive session for each host (gql.twitch.tv, usher.ttvnw.net, ...)
+        self.sessions = {}
+        # One circuit breaker for each host, a degraded host is not hammered with doomed requests
+        self.breakers = {}
+        self.mutex = Lock()
+        # Online/offline state derived from the outcome of the requests
+        self.connectivity = Connectivity()
+        self.async_http = None
+        if self.settings.http2 is True:
+            if AsyncHttp.available():
+                self.async_http = AsyncHttp(
+                    user_agent,
+                    pool_size=self.settings.pool_size,
+                    timeout=self.settings.timeout(),
+                )
+            else:
+                logger.warning(
+                    "HTTP/2 requires httpx (pip install httpx[http2]), falling back to requests"
+                )
+
+    def session(self, url) -> requests.Session:
+        host = urlparse(url).netloc
+        session = self.sessions.get(host)
+        if session is None:
+            with self.mutex:
+                session = self.sessions.get(host)
+                if session is None:
+                    session = self.__new_session()
+                    self.sessions[host] = session
+        return session
+
+    def breaker(self, url) -> CircuitBreaker:
+        host = urlparse(url).netloc
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            with self.mutex:
+                breaker = self.breakers.setdefault(
+                    host,
+                    CircuitBreaker(
+                        host,
+                        failure_threshold=self.settings.breaker_failures,
+                        reset_timeout=self.settings.breaker_timeout,
+                    ),
+                )
+        return breaker
+
+    def is_open(self, url):
+        return url is not None and self.breaker(url).is_open()
+
+    def health(self):
+        return {host: breaker.stats() for host, breaker in self.breakers.items()}
+
+    def __new_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.settings.pool_size,
+            pool_block=False,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"User-Agent": self.user_agent})
+        return session
+
+    def request(self, method, url, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.settings.timeout())
+        breaker = self.breaker(url)
+        if breaker.allow() is False:
+            raise CircuitOpenException(f"{breaker.name} is unavailable (circuit open)")
+        try:
+            if self.async_http is not None and urlparse(url).netloc in HTTP2_HOSTS:
+                response = self.async_http.request(method, url, **kwargs)
+            else:
+                response = self.session(url).request(method, url, **kwargs)
+        except Exception as e:
+            breaker.on_failure()
+            if isinstance(
+                e,
+                (requests.exceptions.ConnectionError, requests.exceptions.Timeout),
+            ):
+                self.connectivity.failure()
+            raise
+        self.connectivity.success()
+        if response.status_code >= 500:
+            breaker.on_failure()
+        else:
+            breaker.on_success()
+        return response
+
+    def get(self, url, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def head(self, url, **kwargs) -> requests.Response:
+        return self.request("HEAD", url, **kwargs)
+
+    # Open the TCP+TLS connections in background so the first real requests
+    # don't pay the handshake
+    def warm_up(self, urls):
+        if self.settings.warm_up is False:
+            return
+
+        def run():
+            for url in urls:
+                try:
+                    self.head(url, allow_redirects=False).close()
+                except requests.exceptions.RequestException as e:
+                    logger.debug(f"Unable to warm up connection to {url}: {e}")
+
+        thread = Thread(target=run)
+        thread.daemon = True
+        thread.name = "HTTP warm-up"
+        thread.start()
+
+    def close(self):
+        with self.mutex:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions = {}
+        if self.async_http is not None:
+            self.async_http.close()
+            self.async_http = None
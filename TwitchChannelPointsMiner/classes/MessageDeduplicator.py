@@ -0,0 +1,54 @@
+import logging
+import time
+from collections import OrderedDict
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+
+class MessageDeduplicator(object):
+    __slots__ = ["max_size", "window", "seen", "mutex", "checks", "hits"]
+
+    # Messages already received by any connection of the pool, the oldest are forgotten after
+    # window seconds or when more than max_size are remembered (LRU)
+    def __init__(self, max_size=2048, window=300):
+        self.max_size = max_size
+        self.window = window
+        # key -> last received at, oldest first
+        self.seen = OrderedDict()
+        self.mutex = Lock()
+        self.checks = 0
+        self.hits = 0
+
+    # Return True if the message was already received, remember it otherwise
+    def is_duplicate(self, key):
+        now = time.time()
+        with self.mutex:
+            self.checks += 1
+            if key in self.seen and now - self.seen[key] < self.window:
+                self.hits += 1
+                self.seen.move_to_end(key)
+                self.seen[key] = now
+                return True
+
+            # Forget the expired messages and make room for this one
+            while self.seen:
+                oldest_key, received_at = next(iter(self.seen.items()))
+                if now - received_at < self.window and len(self.seen) < self.max_size:
+                    break
+                del self.seen[oldest_key]
+            self.seen.pop(key, None)
+            self.seen[key] = now
+            return False
+
+    def __len__(self):
+        return len(self.seen)
+
+    def stats(self):
+        with self.mutex:
+            return {
+                "checks": self.checks,
+                "duplicates": self.hits,
+                "hit_rate": round(self.hits / max(self.checks, 1), 4),
+                "size": len(self.seen),
+            }
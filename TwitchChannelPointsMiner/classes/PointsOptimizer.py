@@ -0,0 +1,121 @@
+import logging
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Rough channel points yield of a watched stream, per minute
+WATCH_POINTS_PER_MINUTE = 10 / 5  # +10 every 5 minutes
+# The bonus chest isn't scored: it's claimed as soon as it's available (claim-available),
+# there is never a pending claim and its rate is the same for every watched streamer
+# The watch streak (+300 on average) needs ~7 minutes of watching
+WATCH_STREAK_POINTS = 300
+WATCH_STREAK_MINUTES = 7
+# A drop is worth more than points, but only one channel at a time makes progress
+DROPS_POINTS_PER_MINUTE = 20
+
+
+class PointsOptimizer(object):
+    __slots__ = [
+        "usernames",
+        "online",
+        "online_at",
+        "offline_at",
+        "multiplier",
+        "watch_streak",
+        "minute_watched",
+        "drops",
+        "scores",
+    ]
+
+    # Expected channel points per minute of every streamer, as NumPy arrays (one row per streamer).
+    # The rows are updated by the WatchSelector events, a selection is only a few vectorized
+    # operations over all the streamers.
+    def __init__(self, streamers):
+        size = len(streamers)
+        self.usernames = [streamer.username for streamer in streamers]
+        self.online = np.zeros(size, dtype=bool)
+        self.online_at = np.zeros(size)
+        self.offline_at = np.zeros(size)
+        self.multiplier = np.zeros(size)
+        self.watch_streak = np.zeros(size, dtype=bool)
+        self.minute_watched = np.zeros(size)
+        self.drops = np.zeros(size, dtype=bool)
+        self.scores = np.zeros(size)
+        for index, streamer in enumerate(streamers):
+            self.update(index, streamer)
+
+    def update(self, index, streamer):
+        self.online[index] = streamer.is_online
+        self.online_at[index] = streamer.online_at
+        self.offline_at[index] = streamer.offline_at
+        self.multiplier[index] = streamer.total_points_multiplier()
+        self.watch_streak[index] = (
+            streamer.settings is not None
+            and streamer.settings.watch_streak is True
+            and streamer.stream.watch_streak_missing is True
+        )
+        self.minute_watched[index] = streamer.stream.minute_watched
+        self.drops[index] = (
+            streamer.settings is not None and streamer.drops_condition() is True
+        )
+
+    def compute(self, now=None):
+        now = time.time() if now is None else now
+        eligible = self.online & ((self.online_at == 0) | (now - self.online_at > 30))
+
+        points = WATCH_POINTS_PER_MINUTE * (1 + self.multiplier)
+        # Same conditions of Priority.STREAK, the streak points are spread over the minutes left
+        streak = (
+            self.watch_streak
+            & (self.minute_watched < WATCH_STREAK_MINUTES)
+            & ((self.offline_at == 0) | (now - self.offline_at >= 31 * 60))
+        )
+        points = points + np.where(
+            streak,
+            WATCH_STREAK_POINTS
+            / np.maximum(WATCH_STREAK_MINUTES - self.minute_watched, 1),
+            0,
+        )
+        points = points + np.where(self.drops, DROPS_POINTS_PER_MINUTE, 0)
+
+        self.scores = np.where(eligible, points, -np.inf)
+        return self.scores
+
+    def select(self, count=2, exclude=(), now=None):
+        scores = self.compute(now=now).copy()
+        scores[list(exclude)] = -np.inf
+        selection = []
+        for _ in range(count):
+            if len(scores) == 0:
+                break
+            best = int(np.argmax(scores))
+            if not np.isfinite(scores[best]):
+                break
+            selection.append(best)
+            scores[best] = -np.inf
+            if self.drops[best]:
+                # The drops progress is already taken by this streamer
+                scores = scores - np.where(self.drops, DROPS_POINTS_PER_MINUTE, 0)
+        return selection
+
+    # When the watch streak of an online streamer becomes available (offline for 30 minutes)
+    def next_change_at(self, now=None):
+        now = time.time() if now is None else now
+        waiting = (
+            self.online
+            & self.watch_streak
+            & (self.offline_at > 0)
+            & (now - self.offline_at < 31 * 60)
+        )
+        if not waiting.any():
+            return np.inf
+        return float(np.min(self.offline_at[waiting])) + 31 * 60
+
+    # username -> expected points per minute of the last selection (only the eligible streamers)
+    def get_scores(self):
+        return {
+            self.usernames[index]: round(float(self.scores[index]), 2)
+            for index in np.flatnonzero(np.isfinite(self.scores))
+        }
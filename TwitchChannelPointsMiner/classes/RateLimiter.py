@@ -0,0 +1,137 @@
+import heapq
+import itertools
+import logging
+import re
+import time
+from threading import Condition
+
+from TwitchChannelPointsMiner.constants import GQLPriority
+from TwitchChannelPointsMiner.utils import gql_error_messages
+
+logger = logging.getLogger(__name__)
+
+# Error messages returned by GQL when we are sending too many requests
+THROTTLED_PATTERN = re.compile(
+    r"service timeout|rate limit|too many requests", re.IGNORECASE
+)
+
+
+class RateLimiter(object):
+    __slots__ = [
+        "base_rate",
+        "rate",
+        "min_rate",
+        "burst",
+        "tokens",
+        "last_refill",
+        "last_throttled",
+        "waiters",
+        "counter",
+        "condition",
+        "throttled",
+        "waits",
+    ]
+
+    # Token bucket shared by all the GQL requests of an account.
+    # When the bucket is empty the callers are served by priority (GQLPriority), then FIFO.
+    # The rate is halved every time Twitch throttles us and slowly restored on success.
+    def __init__(self, rate=20, burst=40, min_rate=1):
+        self.base_rate = max(rate, min_rate)
+        self.rate = self.base_rate
+        self.min_rate = min_rate
+        self.burst = max(burst, 1)
+        self.tokens = self.burst
+        self.last_refill = time.monotonic()
+        self.last_throttled = 0
+        self.waiters = []
+        self.counter = itertools.count()
+        self.condition = Condition()
+        self.throttled = 0
+        # Per priority: [requests, total wait, max wait]
+        self.waits = {priority: [0, 0.0, 0.0] for priority in GQLPriority}
+
+    def __refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.last_refill) * self.rate
+        )
+        self.last_refill = now
+
+    def acquire(self, priority=GQLPriority.NORMAL, cost=1):
+        cost = min(cost, self.burst)
+        started = time.monotonic()
+        entry = (int(priority), next(self.counter))
+        with self.condition:
+            heapq.heappush(self.waiters, entry)
+            try:
+                while True:
+                    self.__refill()
+                    if self.waiters[0] == entry:
+                        if self.tokens >= cost:
+                            break
+                        # Only the first in line sleeps until enough tokens are available
+                        self.condition.wait((cost - self.tokens) / self.rate)
+                    else:
+                        self.condition.wait()
+            finally:
+                self.waiters.remove(entry)
+                heapq.heapify(self.waiters)
+                self.condition.notify_all()
+            self.tokens -= cost
+
+            waited = time.monotonic() - started
+            stats = self.waits[GQLPriority(priority)]
+            stats[0] += 1
+            stats[1] += waited
+            stats[2] = max(stats[2], waited)
+        return waited
+
+    def on_throttled(self):
+        with self.condition:
+            self.throttled += 1
+            # Many responses of the same burst could be throttled, slow down only once
+            if time.monotonic() - self.last_throttled < 1:
+                return
+            self.last_throttled = time.monotonic()
+            self.rate = max(self.min_rate, self.rate / 2)
+            # Drop the burst, we need to slow down now
+            self.tokens = min(self.tokens, 0)
+        logger.warning(
+            f"GQL requests are being throttled by Twitch, slowing down to {round(self.rate, 2)} requests/s"
+        )
+
+    def on_success(self):
+        if self.rate >= self.base_rate:
+            return
+        with self.condition:
+            # Additive increase, but not right after a throttle
+            if time.monotonic() - self.last_throttled > 10:
+                self.rate = min(self.base_rate, self.rate + self.base_rate / 100)
+
+    def stats(self):
+        with self.condition:
+            queued = {str(priority): 0 for priority in GQLPriority}
+            for priority, _ in self.waiters:
+                queued[str(GQLPriority(priority))] += 1
+            return {
+                "rate": round(self.rate, 2),
+                "tokens": round(self.tokens, 2),
+                "throttled": self.throttled,
+                "queue_depth": len(self.waiters),
+                "queued": queued,
+                "wait": {
+                    str(priority): {
+                        "requests": requests,
+                        "avg": round(total / requests, 3) if requests > 0 else 0,
+                        "max": round(maximum, 3),
+                    }
+                    for priority, (requests, total, maximum) in self.waits.items()
+                },
+            }
+
+    @staticmethod
+    def is_throttled(response):
+        return any(
+            THROTTLED_PATTERN.search(message) is not None
+            for message in gql_error_messages(response)
+        )
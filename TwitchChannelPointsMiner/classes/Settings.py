@@ -8,6 +8,8 @@ class Priority(Enum):
     SUBSCRIBED = auto()
     POINTS_ASCENDING = auto()
     POINTS_DESCENDING = auto()
+    DROPS_DEADLINE = auto()
+    EXPECTED_POINTS = auto()
 
 
 class FollowersOrder(Enum):
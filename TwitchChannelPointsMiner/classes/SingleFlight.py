@@ -0,0 +1,36 @@
+from concurrent.futures import Future
+from threading import Lock
+
+
+class SingleFlight(object):
+    __slots__ = ["calls", "mutex", "shared"]
+
+    # Concurrent calls with the same key share the execution (and the result) of the first one
+    def __init__(self):
+        self.calls = {}
+        self.mutex = Lock()
+        self.shared = 0
+
+    def do(self, key, function, *args):
+        with self.mutex:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader is True:
+                future = Future()
+                self.calls[key] = future
+            else:
+                self.shared += 1
+
+        if leader is False:
+            return future.result()
+
+        try:
+            result = function(*args)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.mutex:
+                del self.calls[key]
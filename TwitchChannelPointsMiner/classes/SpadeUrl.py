@@ -0,0 +1,70 @@
+import logging
+import re
+import time
+from threading import Lock
+
+from TwitchChannelPointsMiner.constants import USER_AGENTS
+from TwitchChannelPointsMiner.utils import search_stream
+
+logger = logging.getLogger(__name__)
+
+SETTINGS_URL_PATTERN = re.compile(
+    r"(https://static.twitchcdn.net/config/settings.*?js|https://assets.twitch.tv/config/settings.*?.js)"
+)
+SPADE_URL_PATTERN = re.compile(r'"spade_url":"(.*?)"')
+
+
+class SpadeUrl(object):
+    __slots__ = ["http", "ttl", "url", "expire_at", "mutex"]
+
+    # The spade URL is the same for every streamer, resolve it once and share it.
+    # Concurrent callers wait for the running extraction instead of starting their own.
+    def __init__(self, http, ttl=3600):
+        self.http = http
+        self.ttl = ttl
+        self.url = None
+        self.expire_at = 0
+        self.mutex = Lock()
+
+    def __repr__(self):
+        return f"SpadeUrl(url={self.url}, expire_at={self.expire_at})"
+
+    def get(self, streamer_url):
+        if time.time() < self.expire_at:
+            return self.url
+        with self.mutex:
+            # Already resolved by another thread
+            if time.time() < self.expire_at:
+                return self.url
+            # Until the next successful extraction keep the current URL and retry later
+            self.expire_at = time.time() + min(self.ttl, 60)
+            url = self.__extract(streamer_url)
+            if url is not None:
+                self.url = url
+                self.expire_at = time.time() + self.ttl
+                logger.debug(f"Spade URL: {self.url}")
+        return self.url
+
+    # The URL has been rejected, extract it again on the next get()
+    def invalidate(self):
+        self.expire_at = 0
+
+    def __extract(self, streamer_url):
+        # fixes AttributeError: 'NoneType' object has no attribute 'group'
+        headers = {"User-Agent": USER_AGENTS["Linux"]["FIREFOX"]}
+        matcher = search_stream(
+            self.http.get(streamer_url, headers=headers, stream=True),
+            SETTINGS_URL_PATTERN,
+        )
+        if matcher is None:
+            logger.error("Unable to find the settings URL in the channel page")
+            return None
+
+        matcher = search_stream(
+            self.http.get(matcher.group(1), headers=headers, stream=True),
+            SPADE_URL_PATTERN,
+        )
+        if matcher is None:
+            logger.error("Unable to find 'spade_url' in the settings")
+            return None
+        return matcher.group(1)
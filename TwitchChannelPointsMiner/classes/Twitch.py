@@ -4,50 +4,62 @@
 # Full list of available methods: https://azr.ivr.fi/schema/query.doc.html (a bit outdated)
 
 
-import copy
 import logging
 import os
-import random
-import re
 import string
 import time
-import requests
-import validators
-# import json
-
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 from secrets import choice, token_hex
-from typing import Dict, Any
-# from urllib.parse import quote
-# from base64 import urlsafe_b64decode
-# from datetime import datetime
+from threading import Lock, Thread, Timer
+from typing import Any, Dict
 
-from TwitchChannelPointsMiner.classes.entities.Campaign import Campaign
+import requests
+import validators
+
+from TwitchChannelPointsMiner.classes.BalanceTracker import BalanceTracker
+from TwitchChannelPointsMiner.classes.CampaignsIndex import CampaignsIndex
+from TwitchChannelPointsMiner.classes.ClientVersion import ClientVersion
+from TwitchChannelPointsMiner.classes.DiskCache import DiskCache
+from TwitchChannelPointsMiner.classes.DropClaimer import DropClaimer
+from TwitchChannelPointsMiner.classes.entities.Campaign import Campaign, parse_datetime
 from TwitchChannelPointsMiner.classes.entities.CommunityGoal import CommunityGoal
 from TwitchChannelPointsMiner.classes.entities.Drop import Drop
 from TwitchChannelPointsMiner.classes.Exceptions import (
+    CircuitOpenException,
     StreamerDoesNotExistException,
     StreamerIsOfflineException,
 )
-from TwitchChannelPointsMiner.classes.Settings import (
-    Events,
-    FollowersOrder,
-    Priority,
-    Settings,
+from TwitchChannelPointsMiner.classes.GqlBatcher import GqlBatcher
+from TwitchChannelPointsMiner.classes.HttpPool import (
+    HeaderContext,
+    HttpPool,
+    HttpSettings,
 )
+from TwitchChannelPointsMiner.classes.RateLimiter import RateLimiter
+from TwitchChannelPointsMiner.classes.Settings import Events, FollowersOrder, Settings
+from TwitchChannelPointsMiner.classes.SingleFlight import SingleFlight
+from TwitchChannelPointsMiner.classes.SpadeUrl import SpadeUrl
 from TwitchChannelPointsMiner.classes.TwitchLogin import TwitchLogin
+from TwitchChannelPointsMiner.classes.WatchSelector import WatchSelector
 from TwitchChannelPointsMiner.constants import (
     CLIENT_ID,
-    CLIENT_VERSION,
     URL,
     GQLOperations,
+    GQLPriority,
 )
 from TwitchChannelPointsMiner.utils import (
     _millify,
     create_chunks,
-    internet_connection_available,
+    last_url_line,
+    playback_token_expires,
 )
 
+# import json
+# from urllib.parse import quote
+# from base64 import urlsafe_b64decode
+
 logger = logging.getLogger(__name__)
 JsonType = Dict[str, Any]
 
@@ -63,13 +75,43 @@ class Twitch(object):
         # "integrity_expire",
         "client_session",
         "client_version",
-        "twilight_build_id_pattern",
+        "http",
+        "header_context",
+        "gql_batcher",
+        "gql_limiter",
+        "gql_single_flight",
+        "spade_url",
+        "channel_ids",
+        "channel_ids_revalidating",
+        "channel_ids_mutex",
+        "campaigns_details",
+        "watch_selector",
+        "balance_tracker",
+        "drop_claimer",
     ]
 
-    def __init__(self, username, user_agent, password=None):
+    def __init__(
+        self,
+        username,
+        user_agent,
+        password=None,
+        http_settings: HttpSettings = None,
+    ):
         cookies_path = os.path.join(Path().absolute(), "cookies")
         Path(cookies_path).mkdir(parents=True, exist_ok=True)
         self.cookies_file = os.path.join(cookies_path, f"{username}.pkl")
+        # login -> channel_id, IDs practically never change
+        self.channel_ids = DiskCache(
+            os.path.join(Path().absolute(), "cache", username, "channel_ids.json")
+        )
+        # Expired logins already being revalidated in background
+        self.channel_ids_revalidating = set()
+        self.channel_ids_mutex = Lock()
+        # campaign id -> DropCampaignDetails, a campaign doesn't change until its end
+        self.campaigns_details = DiskCache(
+            os.path.join(Path().absolute(), "cache", username, "campaigns.json"),
+            ttl=24 * 3600,
+        )
         self.user_agent = user_agent
         self.device_id = "".join(
             choice(string.ascii_letters + string.digits) for _ in range(32)
@@ -81,10 +123,29 @@ class Twitch(object):
         # self.integrity = None
         # self.integrity_expire = 0
         self.client_session = token_hex(16)
-        self.client_version = CLIENT_VERSION
-        self.twilight_build_id_pattern = re.compile(
-            r'window\.__twilightBuildID\s*=\s*"([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})"'
+        # Keep-alive connections shared by all the requests of this account
+        self.http = HttpPool(self.user_agent, http_settings)
+        self.header_context = None
+        self.client_version = ClientVersion(
+            self.http, ttl=self.http.settings.client_version_ttl
+        )
+        self.gql_batcher = GqlBatcher(
+            self.__send_gql_request,
+            window=self.http.settings.gql_batch_window,
+            max_size=self.http.settings.gql_batch_size,
+            workers=self.http.settings.pool_size,
         )
+        self.gql_limiter = RateLimiter(
+            rate=self.http.settings.gql_rate_limit,
+            burst=self.http.settings.gql_burst,
+        )
+        # Identical read-only operations in flight at the same time share one request
+        self.gql_single_flight = SingleFlight()
+        self.spade_url = SpadeUrl(self.http)
+        self.watch_selector = WatchSelector()
+        self.balance_tracker = BalanceTracker()
+        # The drops are claimed in background, the inventory sync doesn't wait for them
+        self.drop_claimer = DropClaimer(self.claim_drops)
 
     def login(self):
         if not os.path.isfile(self.cookies_file):
@@ -94,10 +155,20 @@ class Twitch(object):
             self.twitch_login.load_cookies(self.cookies_file)
             self.twitch_login.set_token(self.twitch_login.get_auth_token())
 
+        self.http.warm_up([GQLOperations.url, URL, "https://usher.ttvnw.net"])
+        # Fetch the current client version in background, GQL requests don't wait for it
+        self.client_version.get()
+
     # === STREAMER / STREAM / INFO === #
-    def update_stream(self, streamer):
+    # response: VideoPlayerStreamInfoOverlayChannel already requested (e.g. by the batched poller)
+    # campaigns_response: DropsHighlightService_AvailableDrops already requested
+    def update_stream(self, streamer, response=None, campaigns_response=None):
         if streamer.stream.update_required() is True:
-            stream_info = self.get_stream_info(streamer)
+            stream_info = (
+                self.get_stream_info(streamer)
+                if response is None
+                else self.__parse_stream_info(response)
+            )
             if stream_info is not None:
                 streamer.stream.update(
                     broadcast_id=stream_info["stream"]["id"],
@@ -126,6 +197,8 @@ class Twitch(object):
                     # Update also the campaigns_ids so we are sure to tracking the correct campaign
                     streamer.stream.campaigns_ids = (
                         self.__get_campaign_ids_from_streamer(streamer)
+                        if campaigns_response is None
+                        else self.__parse_campaign_ids(campaigns_response)
                     )
 
                 streamer.stream.payload = [
@@ -134,31 +207,15 @@ class Twitch(object):
 
     def get_spade_url(self, streamer):
         try:
-            # fixes AttributeError: 'NoneType' object has no attribute 'group'
-            # headers = {"User-Agent": self.user_agent}
-            from TwitchChannelPointsMiner.constants import USER_AGENTS
-
-            headers = {"User-Agent": USER_AGENTS["Linux"]["FIREFOX"]}
-
-            main_page_request = requests.get(
-                streamer.streamer_url, headers=headers)
-            response = main_page_request.text
-            # logger.info(response)
-            regex_settings = "(https://static.twitchcdn.net/config/settings.*?js|https://assets.twitch.tv/config/settings.*?.js)"
-            settings_url = re.search(regex_settings, response).group(1)
-
-            settings_request = requests.get(settings_url, headers=headers)
-            response = settings_request.text
-            regex_spade = '"spade_url":"(.*?)"'
-            streamer.stream.spade_url = re.search(
-                regex_spade, response).group(1)
+            streamer.stream.spade_url = self.spade_url.get(streamer.streamer_url)
         except requests.exceptions.RequestException as e:
             logger.error(
                 f"Something went wrong during extraction of 'spade_url': {e}")
 
     def get_broadcast_id(self, streamer):
-        json_data = copy.deepcopy(GQLOperations.WithIsStreamLiveQuery)
-        json_data["variables"] = {"id": streamer.channel_id}
+        json_data = GQLOperations.WithIsStreamLiveQuery.request(
+            {"id": streamer.channel_id}
+        )
         response = self.post_gql_request(json_data)
         if response != {}:
             stream = response["data"]["user"]["stream"]
@@ -168,57 +225,236 @@ class Twitch(object):
                 raise StreamerIsOfflineException
 
     def get_stream_info(self, streamer):
-        json_data = copy.deepcopy(
-            GQLOperations.VideoPlayerStreamInfoOverlayChannel)
-        json_data["variables"] = {"channel": streamer.username}
+        json_data = GQLOperations.VideoPlayerStreamInfoOverlayChannel.request(
+            {"channel": streamer.username}
+        )
         response = self.post_gql_request(json_data)
+        return self.__parse_stream_info(response)
+
+    def __parse_stream_info(self, response):
         if response != {}:
             if response["data"]["user"]["stream"] is None:
                 raise StreamerIsOfflineException
             else:
                 return response["data"]["user"]
 
-    def check_streamer_online(self, streamer):
+    def check_streamer_online(self, streamer, response=None, campaigns_response=None):
         if time.time() < streamer.offline_at + 60:
             return
 
         if streamer.is_online is False:
             try:
+                if response is not None:
+                    # Don't extract the spade URL if the streamer is still offline
+                    self.__parse_stream_info(response)
                 self.get_spade_url(streamer)
-                self.update_stream(streamer)
+                self.update_stream(
+                    streamer, response=response, campaigns_response=campaigns_response
+                )
             except StreamerIsOfflineException:
                 streamer.set_offline()
             else:
                 streamer.set_online()
         else:
             try:
-                self.update_stream(streamer)
+                self.update_stream(
+                    streamer, response=response, campaigns_response=campaigns_response
+                )
             except StreamerIsOfflineException:
                 streamer.set_offline()
+        self.watch_selector.notify(streamer)
+
+    # Check many streamers with a few batched requests.
+    # The drops campaigns of the online streamers to update are requested in the same batch,
+    # a streamer costs up to two operations.
+    def check_streamers_online(self, streamers):
+        chunk_size = max(self.http.settings.gql_batch_size // 2, 1)
+        for chunk in create_chunks(streamers, chunk_size):
+            drops = [
+                streamer
+                for streamer in chunk
+                if streamer.is_online is True
+                and streamer.settings.claim_drops is True
+                and streamer.stream.update_required() is True
+            ]
+            json_data = [
+                GQLOperations.VideoPlayerStreamInfoOverlayChannel.request(
+                    {"channel": streamer.username}
+                )
+                for streamer in chunk
+            ] + [
+                GQLOperations.DropsHighlightService_AvailableDrops.request(
+                    {"channelID": streamer.channel_id}
+                )
+                for streamer in drops
+            ]
+            responses = self.post_gql_request(json_data)
+            if not isinstance(responses, list) or len(responses) != len(json_data):
+                logger.debug(f"Invalid response for the stream status: {responses}")
+                continue
+
+            # The campaigns responses follow the stream info ones
+            campaigns_responses = {
+                streamer.username: responses[len(chunk) + index]
+                for index, streamer in enumerate(drops)
+            }
+            for streamer, response in zip(chunk, responses):
+                try:
+                    self.check_streamer_online(
+                        streamer,
+                        response=response,
+                        campaigns_response=campaigns_responses.get(streamer.username),
+                    )
+                except (KeyError, TypeError) as e:
+                    logger.debug(f"Invalid stream info for {streamer}: {e}")
+
+    # Seconds before checking again the status of a streamer.
+    # PubSub stream-up/stream-down is the fast path, this poll is the safety net.
+    def __poll_interval(self, streamer):
+        if streamer.is_online is True:
+            return 120  # Stream.update_required()
+        last_change = max(streamer.online_at, streamer.offline_at)
+        if last_change != 0 and time.time() - last_change < 10 * 60:
+            return 60  # Just went offline, it could be back soon
+        if streamer.offline_at != 0 and time.time() - streamer.offline_at < 60 * 60:
+            return 5 * 60
+        return 15 * 60
+
+    def poll_streams_status(self, streamers, chunk_size=3):
+        # All the streamers have been checked at startup
+        next_check = {
+            streamer.username: time.time() + self.__poll_interval(streamer)
+            for streamer in streamers
+        }
+        while self.running:
+            try:
+                now = time.time()
+                due = [
+                    streamer
+                    for streamer in streamers
+                    if next_check.get(streamer.username, 0) <= now
+                ]
+                if due != []:
+                    logger.debug(f"Checking the status of {len(due)} streamers")
+                    self.check_streamers_online(due)
+                for streamer in due:
+                    next_check[streamer.username] = (
+                        time.time() + self.__poll_interval(streamer)
+                    )
+            except Exception:
+                logger.error("Exception raised in stream status poller", exc_info=True)
+
+            # Wait at least a few seconds, so the streamers due together share the requests
+            next_at = min(next_check.values(), default=time.time() + 60)
+            self.__chuncked_sleep(
+                min(max(next_at - time.time(), 5), 30), chunk_size=chunk_size
+            )
+
+    # PubSub sends stream-up before the API is updated, confirm it a little bit later
+    def confirm_stream_up(self, streamer, delay=120):
+        timer = Timer(delay, self.check_streamer_online, (streamer,))
+        timer.daemon = True
+        timer.name = f"Stream-up confirmation {streamer.username}"
+        timer.start()
 
     def get_channel_id(self, streamer_username):
-        json_data = copy.deepcopy(GQLOperations.ReportMenuItem)
-        json_data["variables"] = {"channelLogin": streamer_username}
-        json_response = self.post_gql_request(json_data)
+        try:
+            channel_id, expired = self.channel_ids.get(streamer_username)
+            if expired is True:
+                self.__revalidate_channel_ids([streamer_username])
+        except KeyError:
+            json_data = GQLOperations.ReportMenuItem.request(
+                {"channelLogin": streamer_username}
+            )
+            json_response = self.post_gql_request(json_data)
+            channel_id = self.__cache_channel_id(streamer_username, json_response)
+
+        if channel_id is None:
+            raise StreamerDoesNotExistException
+        return channel_id
+
+    # Resolve the unknown channel_ids with batched requests, so the following
+    # get_channel_id are served by the cache. Expired ones are revalidated in background.
+    def resolve_channel_ids(self, streamers_username):
+        missing = []
+        expired = []
+        for username in streamers_username:
+            try:
+                if self.channel_ids.get(username)[1] is True:
+                    expired.append(username)
+            except KeyError:
+                missing.append(username)
+
+        if missing != []:
+            logger.debug(f"Resolving the channel_id of {len(missing)} streamers")
+            self.__fetch_channel_ids(missing)
+        if expired != []:
+            self.__revalidate_channel_ids(expired)
+        self.channel_ids.save()
+
+    def __revalidate_channel_ids(self, streamers_username):
+        # Skip the logins already covered by a running revalidation (e.g. resolve_channel_ids)
+        with self.channel_ids_mutex:
+            streamers_username = [
+                username
+                for username in streamers_username
+                if username not in self.channel_ids_revalidating
+            ]
+            self.channel_ids_revalidating.update(streamers_username)
+        if streamers_username == []:
+            return
+
+        def run():
+            try:
+                self.__fetch_channel_ids(streamers_username)
+            finally:
+                with self.channel_ids_mutex:
+                    self.channel_ids_revalidating.difference_update(
+                        streamers_username
+                    )
+
+        thread = Thread(target=run)
+        thread.daemon = True
+        thread.name = "Channel ID revalidation"
+        thread.start()
+
+    def __fetch_channel_ids(self, streamers_username):
+        for chunk in create_chunks(
+            streamers_username, self.http.settings.gql_batch_size
+        ):
+            json_response = self.post_gql_request(
+                [
+                    GQLOperations.ReportMenuItem.request({"channelLogin": username})
+                    for username in chunk
+                ]
+            )
+            if isinstance(json_response, list):
+                for username, response in zip(chunk, json_response):
+                    self.__cache_channel_id(username, response)
+
+    def __cache_channel_id(self, streamer_username, json_response):
         if (
-            "data" not in json_response
+            not isinstance(json_response, dict)
+            or "data" not in json_response
             or "user" not in json_response["data"]
-            or json_response["data"]["user"] is None
         ):
-            raise StreamerDoesNotExistException
-        else:
-            return json_response["data"]["user"]["id"]
+            # Request failed, don't cache anything
+            return None
+        user = json_response["data"]["user"]
+        channel_id = user["id"] if user is not None else None
+        self.channel_ids.set(streamer_username, channel_id)
+        return channel_id
 
     def get_followers(
         self, limit: int = 100, order: FollowersOrder = FollowersOrder.ASC
     ):
-        json_data = copy.deepcopy(GQLOperations.ChannelFollows)
-        json_data["variables"] = {"limit": limit, "order": str(order)}
         has_next = True
         last_cursor = ""
         follows = []
         while has_next is True:
-            json_data["variables"]["cursor"] = last_cursor
+            json_data = GQLOperations.ChannelFollows.request(
+                {"limit": limit, "order": str(order), "cursor": last_cursor}
+            )
             json_response = self.post_gql_request(json_data)
             try:
                 follows_response = json_response["data"]["user"]["follows"]
@@ -235,8 +471,9 @@ class Twitch(object):
     def update_raid(self, streamer, raid):
         if streamer.raid != raid:
             streamer.raid = raid
-            json_data = copy.deepcopy(GQLOperations.JoinRaid)
-            json_data["variables"] = {"input": {"raidID": raid.raid_id}}
+            json_data = GQLOperations.JoinRaid.request(
+                {"input": {"raidID": raid.raid_id}}
+            )
             self.post_gql_request(json_data)
 
             logger.info(
@@ -246,8 +483,9 @@ class Twitch(object):
             )
 
     def viewer_is_mod(self, streamer):
-        json_data = copy.deepcopy(GQLOperations.ModViewChannelQuery)
-        json_data["variables"] = {"channelLogin": streamer.username}
+        json_data = GQLOperations.ModViewChannelQuery.request(
+            {"channelLogin": streamer.username}
+        )
         response = self.post_gql_request(json_data)
         try:
             streamer.viewer_is_mod = response["data"]["user"]["self"]["isModerator"]
@@ -265,37 +503,96 @@ class Twitch(object):
 
     def __check_connection_handler(self, chunk_size):
         # The success rate It's very hight usually. Why we have failed?
-        # Check internet connection ...
-        while internet_connection_available() is False:
-            random_sleep = random.randint(1, 3)
-            logger.warning(
-                f"No internet connection available! Retry after {random_sleep}m"
-            )
-            self.__chuncked_sleep(random_sleep * 60, chunk_size=chunk_size)
-
-    def post_gql_request(self, json_data):
-        try:
-            response = requests.post(
-                GQLOperations.url,
-                json=json_data,
-                headers={
-                    "Authorization": f"OAuth {self.twitch_login.get_auth_token()}",
+        # Wait for the connectivity monitor, it checks the internet connection in background
+        while (
+            self.running is True
+            and self.http.connectivity.wait_online(timeout=60 / chunk_size) is False
+        ):
+            pass
+
+    def gql_headers(self):
+        # The token is read from TwitchLogin (set at login) instead of scanning the cookies every time
+        token = self.twitch_login.token
+        client_version = self.client_version.get()
+        context = self.header_context
+        if context is None or context.matches(token, client_version) is False:
+            context = self.header_context = HeaderContext(
+                token,
+                client_version,
+                {
+                    "Authorization": f"OAuth {token}",
                     "Client-Id": CLIENT_ID,
                     # "Client-Integrity": self.post_integrity(),
                     "Client-Session-Id": self.client_session,
-                    "Client-Version": self.update_client_version(),
+                    "Client-Version": client_version,
+                    "Content-Type": "application/json",
                     "User-Agent": self.user_agent,
                     "X-Device-Id": self.device_id,
                 },
             )
+        return context.headers
+
+    def post_gql_request(self, json_data):
+        # A list is already a batch of operations (e.g. DropCampaignDetails), send it as is.
+        # Single operations are grouped with the ones submitted by the other threads.
+        # Every operation costs a token, time-critical ones are served first (GQLPriority).
+        if isinstance(json_data, list):
+            if json_data == []:
+                return []
+            self.gql_limiter.acquire(
+                min(item.priority for item in json_data), cost=len(json_data)
+            )
+            return self.__send_gql_request(json_data)
+        if json_data.mutation is False:
+            return self.gql_single_flight.do(
+                json_data.body, self.__post_single_gql_request, json_data
+            )
+        return self.__post_single_gql_request(json_data)
+
+    def __post_single_gql_request(self, json_data):
+        self.gql_limiter.acquire(json_data.priority)
+        return self.gql_batcher.post(
+            json_data, urgent=json_data.priority == GQLPriority.CRITICAL
+        )
+
+    def __send_gql_request(self, json_data):
+        # The requests are already serialized, a batch is just the join of the bodies
+        body = (
+            "[" + ",".join(item.body for item in json_data) + "]"
+            if isinstance(json_data, list)
+            else json_data.body
+        )
+        try:
+            response = self.http.post(
+                GQLOperations.url,
+                data=body.encode("utf-8"),
+                headers=self.gql_headers(),
+            )
             logger.debug(
-                f"Data: {json_data}, Status code: {response.status_code}, Content: {response.text}"
+                f"Data: {body}, Status code: {response.status_code}, Content: {response.text}"
             )
-            return response.json()
+            if response.status_code == 429:
+                self.gql_limiter.on_throttled()
+                return {}
+            json_response = response.json()
+            if RateLimiter.is_throttled(json_response):
+                self.gql_limiter.on_throttled()
+            else:
+                self.gql_limiter.on_success()
+            if ClientVersion.is_mismatch(json_response):
+                logger.debug("Client version rejected by GQL, refreshing it")
+                self.client_version.invalidate()
+            return json_response
+        except CircuitOpenException as e:
+            logger.debug(f"Skip GQL request: {e}")
+            return {}
         except requests.exceptions.RequestException as e:
-            logger.error(
-                f"Error with GQLOperations ({json_data['operationName']}): {e}"
+            operations = (
+                ", ".join(item.operation_name for item in json_data)
+                if isinstance(json_data, list)
+                else json_data.operation_name
             )
+            logger.error(f"Error with GQLOperations ({operations}): {e}")
             return {}
 
     # Request for Integrity Token
@@ -315,7 +612,7 @@ class Twitch(object):
                     "Authorization": f"OAuth {self.twitch_login.get_auth_token()}",
                     "Client-Id": CLIENT_ID,
                     "Client-Session-Id": self.client_session,
-                    "Client-Version": self.update_client_version(),
+                    "Client-Version": self.client_version.get(),
                     "User-Agent": self.user_agent,
                     "X-Device-Id": self.device_id,
                 },
@@ -354,317 +651,263 @@ class Twitch(object):
         else:
             return False"""
 
-    def update_client_version(self):
-        try:
-            response = requests.get(URL)
-            if response.status_code != 200:
-                logger.debug(
-                    f"Error with update_client_version: {response.status_code}"
-                )
-                return self.client_version
-            matcher = re.search(self.twilight_build_id_pattern, response.text)
-            if not matcher:
-                logger.debug("Error with update_client_version: no match")
-                return self.client_version
-            self.client_version = matcher.group(1)
-            logger.debug(f"Client version: {self.client_version}")
-            return self.client_version
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error with update_client_version: {e}")
-            return self.client_version
-
     def send_minute_watched_events(self, streamers, priority, chunk_size=3):
+        interval = 20
+        # One thread for each watch slot, a slow chain doesn't delay the other slot
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="Watch slot")
+        next_heartbeat = {}
+        running_slots = {}
+        self.watch_selector.attach(streamers, priority)
         while self.running:
             try:
-                streamers_index = [
-                    i
-                    for i in range(0, len(streamers))
-                    if streamers[i].is_online is True
-                    and (
-                        streamers[i].online_at == 0
-                        or (time.time() - streamers[i].online_at) > 30
+                # The online streamers are kept up to date by poll_streams_status
+                # Up to date with the events, see WatchSelector
+                streamers_watching = self.watch_selector.select()
+
+                # Every slot has its own cadence, computed from the previous deadline (not from the end
+                # of the chain) so it doesn't drift. The chains of the slots run concurrently.
+                now = time.monotonic()
+                for index in streamers_watching:
+                    streamer = streamers[index]
+                    deadline = next_heartbeat.get(streamer.username, now)
+                    if deadline > now:
+                        continue
+                    next_heartbeat[streamer.username] = (
+                        deadline + interval
+                        if now - deadline < interval
+                        else now + interval
+                    )
+                    running = running_slots.get(streamer.username)
+                    if running is not None and running.done() is False:
+                        # Still busy with the previous heartbeat, skip this one
+                        continue
+                    running_slots[streamer.username] = executor.submit(
+                        self.__send_minute_watched, streamer, chunk_size
                     )
-                ]
 
-                for index in streamers_index:
-                    if (streamers[index].stream.update_elapsed() / 60) > 10:
-                        # Why this user It's currently online but the last updated was more than 10minutes ago?
-                        # Please perform a manually update and check if the user it's online
-                        self.check_streamer_online(streamers[index])
-
-                streamers_watching = []
-                for prior in priority:
-                    if prior == Priority.ORDER and len(streamers_watching) < 2:
-                        # Get the first 2 items, they are already in order
-                        streamers_watching += streamers_index[:2]
-
-                    elif (
-                        prior in [Priority.POINTS_ASCENDING,
-                                  Priority.POINTS_DESCENDING]
-                        and len(streamers_watching) < 2
-                    ):
-                        items = [
-                            {"points": streamers[index].channel_points,
-                                "index": index}
-                            for index in streamers_index
-                        ]
-                        items = sorted(
-                            items,
-                            key=lambda x: x["points"],
-                            reverse=(
-                                True if prior == Priority.POINTS_DESCENDING else False
-                            ),
-                        )
-                        streamers_watching += [item["index"]
-                                               for item in items][:2]
-
-                    elif prior == Priority.STREAK and len(streamers_watching) < 2:
-                        """
-                        Check if we need need to change priority based on watch streak
-                        Viewers receive points for returning for x consecutive streams.
-                        Each stream must be at least 10 minutes long and it must have been at least 30 minutes since the last stream ended.
-                        Watch at least 6m for get the +10
-                        """
-                        for index in streamers_index:
-                            if (
-                                streamers[index].settings.watch_streak is True
-                                and streamers[index].stream.watch_streak_missing is True
-                                and (
-                                    streamers[index].offline_at == 0
-                                    or (
-                                        (time.time() -
-                                         streamers[index].offline_at)
-                                        // 60
-                                    )
-                                    > 30
-                                )
-                                # fix #425
-                                and streamers[index].stream.minute_watched < 7
-                            ):
-                                streamers_watching.append(index)
-                                if len(streamers_watching) == 2:
-                                    break
-
-                    elif prior == Priority.DROPS and len(streamers_watching) < 2:
-                        for index in streamers_index:
-                            if streamers[index].drops_condition() is True:
-                                streamers_watching.append(index)
-                                if len(streamers_watching) == 2:
-                                    break
-
-                    elif prior == Priority.SUBSCRIBED and len(streamers_watching) < 2:
-                        streamers_with_multiplier = [
-                            index
-                            for index in streamers_index
-                            if streamers[index].viewer_has_points_multiplier()
-                        ]
-                        streamers_with_multiplier = sorted(
-                            streamers_with_multiplier,
-                            key=lambda x: streamers[x].total_points_multiplier(
-                            ),
-                            reverse=True,
-                        )
-                        streamers_watching += streamers_with_multiplier[:2]
+                watching = [streamers[index].username for index in streamers_watching]
+                for username in list(next_heartbeat.keys()):
+                    if username not in watching:
+                        del next_heartbeat[username]
+                        running_slots.pop(username, None)
+
+                # Sleep until the next heartbeat or until the selection changes
+                next_deadline = min(next_heartbeat.values(), default=now + interval)
+                self.watch_selector.wait(next_deadline - time.monotonic())
+            except Exception:
+                logger.error(
+                    "Exception raised in send minute watched", exc_info=True)
+
+    # Heartbeat of a single watch slot: playlist, segment HEAD and minute watched event
+    def __send_minute_watched(self, streamer, chunk_size):
+        try:
+            if streamer.stream.spade_url is None:
+                self.get_spade_url(streamer)
+
+            # Don't start the chain if spade is known to be down
+            if self.http.is_open(streamer.stream.spade_url):
+                raise CircuitOpenException("spade is unavailable")
+
+            ####################################
+            # Start of fix for 2024/5 API Change
+            # PlaybackAccessToken + usher are requested only when the cached URL expires
+            StreamLowestQualityPlaylistURL = self.__get_playlist_url(streamer)
+            if StreamLowestQualityPlaylistURL is None:
+                return
+
+            # Get list of video URLs
+            responseStreamURLList = self.http.get(
+                StreamLowestQualityPlaylistURL, stream=True
+            )
+            logger.debug(
+                f"Send BroadcastLowestQualityURL request for {streamer} - Status code: {responseStreamURLList.status_code}"
+            )
+            if responseStreamURLList.status_code != 200:
+                responseStreamURLList.close()
+                if 400 <= responseStreamURLList.status_code < 500:
+                    # Token expired or revoked, request a new one next time
+                    streamer.stream.reset_playlist_url()
+                return
+
+            # Just takes the last segment, the most recent one
+            StreamLowestQualityURL = last_url_line(responseStreamURLList)
+            if not validators.url(StreamLowestQualityURL):
+                return
+
+            # Perform a HEAD request to simulate watching the stream
+            responseStreamLowestQualityURL = self.http.head(StreamLowestQualityURL)
+            logger.debug(
+                f"Send StreamLowestQualityURL request for {streamer} - Status code: {responseStreamLowestQualityURL.status_code}"
+            )
+            if responseStreamLowestQualityURL.status_code != 200:
+                return
+            # End of fix for 2024/5 API Change
+            ##################################
+            response = self.http.post(
+                streamer.stream.spade_url,
+                data=streamer.stream.encode_payload(),
+            )
+            logger.debug(
+                f"Send minute watched request for {streamer} - Status code: {response.status_code}"
+            )
+            if response.status_code != 204:
+                # Maybe the spade URL has changed, extract it again
+                self.spade_url.invalidate()
+                self.get_spade_url(streamer)
+            else:
+                streamer.stream.update_minute_watched()
+                self.balance_tracker.watched(streamer)
+                # The watch streak selection depends on the minutes watched
+                self.watch_selector.notify(streamer)
 
                 """
-                Twitch has a limit - you can't watch more than 2 channels at one time.
-                We take the first two streamers from the list as they have the highest priority (based on order or WatchStreak).
+                Remember, you can only earn progress towards a time-based Drop on one participating channel at a time.  [ ! ! ! ]
+                You can also check your progress towards Drops within a campaign anytime by viewing the Drops Inventory.
+                For time-based Drops, if you are unable to claim the Drop in time, you will be able to claim it from the inventory page until the Drops campaign ends.
                 """
-                streamers_watching = streamers_watching[:2]
 
-                for index in streamers_watching:
-                    # next_iteration = time.time() + 60 / len(streamers_watching)
-                    next_iteration = time.time() + 20 / len(streamers_watching)
-
-                    try:
-                        ####################################
-                        # Start of fix for 2024/5 API Change
-                        # Create the JSON data for the GraphQL request
-                        json_data = copy.deepcopy(
-                            GQLOperations.PlaybackAccessToken)
-                        json_data["variables"] = {
-                            "login": streamers[index].username,
-                            "isLive": True,
-                            "isVod": False,
-                            "vodID": "",
-                            "playerType": "site"
-                            # "playerType": "picture-by-picture",
-                        }
+                for campaign in streamer.stream.campaigns:
+                    for drop in campaign.drops:
+                        # We could add .has_preconditions_met condition inside is_printable
+                        if (
+                            drop.has_preconditions_met is not False
+                            and drop.is_printable is True
+                        ):
+                            # Printed once for every progress update of the inventory
+                            drop.is_printable = False
+                            drop_messages = [
+                                f"{streamer} is streaming {streamer.stream}",
+                                f"Campaign: {campaign}",
+                                f"Drop: {drop}",
+                                f"{drop.progress_bar()}",
+                            ]
+                            for single_line in drop_messages:
+                                logger.info(
+                                    single_line,
+                                    extra={
+                                        "event": Events.DROP_STATUS,
+                                        "skip_telegram": True,
+                                        "skip_discord": True,
+                                        "skip_webhook": True,
+                                        "skip_matrix": True,
+                                        "skip_gotify": True
+                                    },
+                                )
 
-                        # Get signature and value using the post_gql_request method
-                        try:
-                            responsePlaybackAccessToken = self.post_gql_request(
-                                json_data)
-                            logger.debug(
-                                f"Sent PlaybackAccessToken request for {streamers[index]}")
-
-                            if 'data' not in responsePlaybackAccessToken:
-                                logger.error(
-                                    f"Invalid response from Twitch: {responsePlaybackAccessToken}")
-                                continue
-
-                            streamPlaybackAccessToken = responsePlaybackAccessToken["data"].get(
-                                'streamPlaybackAccessToken', {})
-                            signature = streamPlaybackAccessToken.get(
-                                "signature")
-                            value = streamPlaybackAccessToken.get("value")
-
-                            if not signature or not value:
-                                logger.error(
-                                    f"Missing signature or value in Twitch response: {responsePlaybackAccessToken}")
-                                continue
-
-                        except Exception as e:
-                            logger.error(
-                                f"Error fetching PlaybackAccessToken for {streamers[index]}: {str(e)}")
-                            continue
+                            if Settings.logger.telegram is not None:
+                                Settings.logger.telegram.send(
+                                    "\n".join(drop_messages),
+                                    Events.DROP_STATUS,
+                                )
 
-                        # encoded_value = quote(json.dumps(value))
+                            if Settings.logger.discord is not None:
+                                Settings.logger.discord.send(
+                                    "\n".join(drop_messages),
+                                    Events.DROP_STATUS,
+                                )
+                            if Settings.logger.webhook is not None:
+                                Settings.logger.webhook.send(
+                                    "\n".join(drop_messages),
+                                    Events.DROP_STATUS,
+                                )
+                            if Settings.logger.gotify is not None:
+                                Settings.logger.gotify.send(
+                                    "\n".join(drop_messages),
+                                    Events.DROP_STATUS,
+                                )
 
-                        # Construct the URL for the broadcast qualities
-                        RequestBroadcastQualitiesURL = f"https://usher.ttvnw.net/api/channel/hls/{streamers[index].username}.m3u8?sig={signature}&token={value}"
+        except CircuitOpenException as e:
+            logger.debug(f"Skip minute watched for {streamer}: {e}")
+        except requests.exceptions.ConnectionError as e:
+            logger.error(f"Error while trying to send minute watched: {e}")
+            self.__check_connection_handler(chunk_size)
+        except requests.exceptions.Timeout as e:
+            logger.error(f"Error while trying to send minute watched: {e}")
+        except Exception:
+            logger.error(
+                f"Exception raised in send minute watched for {streamer}", exc_info=True
+            )
 
-                        # Get list of video qualities
-                        responseBroadcastQualities = requests.get(
-                            RequestBroadcastQualitiesURL,
-                            headers={"User-Agent": self.user_agent},
-                            timeout=20,
-                        )  # timeout=60
-                        logger.debug(
-                            f"Send RequestBroadcastQualitiesURL request for {streamers[index]} - Status code: {responseBroadcastQualities.status_code}"
-                        )
-                        if responseBroadcastQualities.status_code != 200:
-                            continue
-                        BroadcastQualities = responseBroadcastQualities.text
+    # URL of the lowest quality playlist, cached until the playback access token expires
+    def __get_playlist_url(self, streamer):
+        if streamer.stream.playlist_url_expired() is False:
+            return streamer.stream.playlist_url
+
+        # The cached URL doesn't need usher, a new one does
+        if self.http.is_open("https://usher.ttvnw.net"):
+            raise CircuitOpenException("usher.ttvnw.net is unavailable")
+
+        # Create the JSON data for the GraphQL request
+        json_data = GQLOperations.PlaybackAccessToken.request(
+            {
+                "login": streamer.username,
+                "isLive": True,
+                "isVod": False,
+                "vodID": "",
+                "playerType": "site"
+                # "playerType": "picture-by-picture",
+            }
+        )
 
-                        # Just takes the last line, which should be the URL for the lowest quality
-                        BroadcastLowestQualityURL = BroadcastQualities.split(
-                            "\n")[-1]
-                        if not validators.url(BroadcastLowestQualityURL):
-                            continue
+        # Get signature and value using the post_gql_request method
+        try:
+            responsePlaybackAccessToken = self.post_gql_request(json_data)
+            logger.debug(f"Sent PlaybackAccessToken request for {streamer}")
 
-                        # Get list of video URLs
-                        responseStreamURLList = requests.get(
-                            BroadcastLowestQualityURL,
-                            headers={"User-Agent": self.user_agent},
-                            timeout=20,
-                        )  # timeout=60
-                        logger.debug(
-                            f"Send BroadcastLowestQualityURL request for {streamers[index]} - Status code: {responseStreamURLList.status_code}"
-                        )
-                        if responseStreamURLList.status_code != 200:
-                            continue
-                        StreamURLList = responseStreamURLList.text
+            if "data" not in responsePlaybackAccessToken:
+                logger.error(
+                    f"Invalid response from Twitch: {responsePlaybackAccessToken}"
+                )
+                return None
 
-                        # Just takes the last line, which should be the URL for the lowest quality
-                        StreamLowestQualityURL = StreamURLList.split("\n")[-2]
-                        if not validators.url(StreamLowestQualityURL):
-                            continue
+            streamPlaybackAccessToken = responsePlaybackAccessToken["data"].get(
+                "streamPlaybackAccessToken", {}
+            )
+            signature = streamPlaybackAccessToken.get("signature")
+            value = streamPlaybackAccessToken.get("value")
 
-                        # Perform a HEAD request to simulate watching the stream
-                        responseStreamLowestQualityURL = requests.head(
-                            StreamLowestQualityURL,
-                            headers={"User-Agent": self.user_agent},
-                            timeout=20,
-                        )  # timeout=60
-                        logger.debug(
-                            f"Send StreamLowestQualityURL request for {streamers[index]} - Status code: {responseStreamLowestQualityURL.status_code}"
-                        )
-                        if responseStreamLowestQualityURL.status_code != 200:
-                            continue
-                        # End of fix for 2024/5 API Change
-                        ##################################
-                        response = requests.post(
-                            streamers[index].stream.spade_url,
-                            data=streamers[index].stream.encode_payload(),
-                            headers={"User-Agent": self.user_agent},
-                            # timeout=60,
-                            timeout=20,
-                        )
-                        logger.debug(
-                            f"Send minute watched request for {streamers[index]} - Status code: {response.status_code}"
-                        )
-                        if response.status_code == 204:
-                            streamers[index].stream.update_minute_watched()
-
-                            """
-                            Remember, you can only earn progress towards a time-based Drop on one participating channel at a time.  [ ! ! ! ]
-                            You can also check your progress towards Drops within a campaign anytime by viewing the Drops Inventory.
-                            For time-based Drops, if you are unable to claim the Drop in time, you will be able to claim it from the inventory page until the Drops campaign ends.
-                            """
-
-                            for campaign in streamers[index].stream.campaigns:
-                                for drop in campaign.drops:
-                                    # We could add .has_preconditions_met condition inside is_printable
-                                    if (
-                                        drop.has_preconditions_met is not False
-                                        and drop.is_printable is True
-                                    ):
-                                        drop_messages = [
-                                            f"{streamers[index]} is streaming {streamers[index].stream}",
-                                            f"Campaign: {campaign}",
-                                            f"Drop: {drop}",
-                                            f"{drop.progress_bar()}",
-                                        ]
-                                        for single_line in drop_messages:
-                                            logger.info(
-                                                single_line,
-                                                extra={
-                                                    "event": Events.DROP_STATUS,
-                                                    "skip_telegram": True,
-                                                    "skip_discord": True,
-                                                    "skip_webhook": True,
-                                                    "skip_matrix": True,
-                                                    "skip_gotify": True
-                                                },
-                                            )
-
-                                        if Settings.logger.telegram is not None:
-                                            Settings.logger.telegram.send(
-                                                "\n".join(drop_messages),
-                                                Events.DROP_STATUS,
-                                            )
-
-                                        if Settings.logger.discord is not None:
-                                            Settings.logger.discord.send(
-                                                "\n".join(drop_messages),
-                                                Events.DROP_STATUS,
-                                            )
-                                        if Settings.logger.webhook is not None:
-                                            Settings.logger.webhook.send(
-                                                "\n".join(drop_messages),
-                                                Events.DROP_STATUS,
-                                            )
-                                        if Settings.logger.gotify is not None:
-                                            Settings.logger.gotify.send(
-                                                "\n".join(drop_messages),
-                                                Events.DROP_STATUS,
-                                            )
-
-                    except requests.exceptions.ConnectionError as e:
-                        logger.error(
-                            f"Error while trying to send minute watched: {e}")
-                        self.__check_connection_handler(chunk_size)
-                    except requests.exceptions.Timeout as e:
-                        logger.error(
-                            f"Error while trying to send minute watched: {e}")
+            if not signature or not value:
+                logger.error(
+                    f"Missing signature or value in Twitch response: {responsePlaybackAccessToken}"
+                )
+                return None
 
-                    self.__chuncked_sleep(
-                        next_iteration - time.time(), chunk_size=chunk_size
-                    )
+        except Exception as e:
+            logger.error(f"Error fetching PlaybackAccessToken for {streamer}: {str(e)}")
+            return None
 
-                if streamers_watching == []:
-                    # self.__chuncked_sleep(60, chunk_size=chunk_size)
-                    self.__chuncked_sleep(20, chunk_size=chunk_size)
-            except Exception:
-                logger.error(
-                    "Exception raised in send minute watched", exc_info=True)
+        # encoded_value = quote(json.dumps(value))
+
+        # Construct the URL for the broadcast qualities
+        RequestBroadcastQualitiesURL = f"https://usher.ttvnw.net/api/channel/hls/{streamer.username}.m3u8?sig={signature}&token={value}"
+
+        # Get list of video qualities
+        responseBroadcastQualities = self.http.get(
+            RequestBroadcastQualitiesURL, stream=True
+        )
+        logger.debug(
+            f"Send RequestBroadcastQualitiesURL request for {streamer} - Status code: {responseBroadcastQualities.status_code}"
+        )
+        if responseBroadcastQualities.status_code != 200:
+            responseBroadcastQualities.close()
+            return None
+
+        # Just takes the last URL, which should be the URL for the lowest quality
+        BroadcastLowestQualityURL = last_url_line(responseBroadcastQualities)
+        if not validators.url(BroadcastLowestQualityURL):
+            return None
+
+        streamer.stream.set_playlist_url(
+            BroadcastLowestQualityURL, playback_token_expires(value)
+        )
+        return BroadcastLowestQualityURL
 
     # === CHANNEL POINTS / PREDICTION === #
     # Load the amount of current points for a channel, check if a bonus is available
     def load_channel_points_context(self, streamer):
-        json_data = copy.deepcopy(GQLOperations.ChannelPointsContext)
-        json_data["variables"] = {"channelLogin": streamer.username}
+        json_data = GQLOperations.ChannelPointsContext.request(
+            {"channelLogin": streamer.username}
+        )
 
         response = self.post_gql_request(json_data)
         if response != {}:
@@ -673,7 +916,9 @@ class Twitch(object):
             channel = response["data"]["community"]["channel"]
             community_points = channel["self"]["communityPoints"]
             streamer.channel_points = community_points["balance"]
+            self.balance_tracker.synced(streamer)
             streamer.activeMultipliers = community_points["activeMultipliers"]
+            self.watch_selector.notify_points(streamer)
 
             if streamer.settings.community_goals is True:
                 streamer.community_goals = {
@@ -730,15 +975,16 @@ class Twitch(object):
                         },
                     )
 
-                    json_data = copy.deepcopy(GQLOperations.MakePrediction)
-                    json_data["variables"] = {
-                        "input": {
-                            "eventID": event.event_id,
-                            "outcomeID": decision["id"],
-                            "points": decision["amount"],
-                            "transactionID": token_hex(16),
+                    json_data = GQLOperations.MakePrediction.request(
+                        {
+                            "input": {
+                                "eventID": event.event_id,
+                                "outcomeID": decision["id"],
+                                "points": decision["amount"],
+                                "transactionID": token_hex(16),
+                            }
                         }
-                    }
+                    )
                     response = self.post_gql_request(json_data)
                     if (
                         "data" in response
@@ -778,10 +1024,11 @@ class Twitch(object):
                 extra={"emoji": ":gift:", "event": Events.BONUS_CLAIM},
             )
 
-        json_data = copy.deepcopy(GQLOperations.ClaimCommunityPoints)
-        json_data["variables"] = {
-            "input": {"channelID": streamer.channel_id, "claimID": claim_id}
-        }
+        json_data = GQLOperations.ClaimCommunityPoints.request(
+            {
+                "input": {"channelID": streamer.channel_id, "claimID": claim_id}
+            }
+        )
         self.post_gql_request(json_data)
 
     # === MOMENTS === #
@@ -793,16 +1040,19 @@ class Twitch(object):
                        "event": Events.MOMENT_CLAIM},
             )
 
-        json_data = copy.deepcopy(GQLOperations.CommunityMomentCallout_Claim)
-        json_data["variables"] = {"input": {"momentID": moment_id}}
+        json_data = GQLOperations.CommunityMomentCallout_Claim.request(
+            {"input": {"momentID": moment_id}}
+        )
         self.post_gql_request(json_data)
 
     # === CAMPAIGNS / DROPS / INVENTORY === #
     def __get_campaign_ids_from_streamer(self, streamer):
-        json_data = copy.deepcopy(
-            GQLOperations.DropsHighlightService_AvailableDrops)
-        json_data["variables"] = {"channelID": streamer.channel_id}
-        response = self.post_gql_request(json_data)
+        json_data = GQLOperations.DropsHighlightService_AvailableDrops.request(
+            {"channelID": streamer.channel_id}
+        )
+        return self.__parse_campaign_ids(self.post_gql_request(json_data))
+
+    def __parse_campaign_ids(self, response):
         try:
             return (
                 []
@@ -812,11 +1062,11 @@ class Twitch(object):
                     for item in response["data"]["channel"]["viewerDropCampaigns"]
                 ]
             )
-        except (ValueError, KeyError):
+        except (ValueError, KeyError, TypeError):
             return []
 
     def __get_inventory(self):
-        response = self.post_gql_request(GQLOperations.Inventory)
+        response = self.post_gql_request(GQLOperations.Inventory.request())
         try:
             return (
                 response["data"]["currentUser"]["inventory"] if response != {} else {}
@@ -825,7 +1075,9 @@ class Twitch(object):
             return {}
 
     def __get_drops_dashboard(self, status=None):
-        response = self.post_gql_request(GQLOperations.ViewerDropsDashboard)
+        response = self.post_gql_request(
+            GQLOperations.ViewerDropsDashboard.request()
+        )
         campaigns = response["data"]["currentUser"]["dropCampaigns"] or []
 
         if status is not None:
@@ -837,57 +1089,92 @@ class Twitch(object):
         return campaigns
 
     def __get_campaigns_details(self, campaigns):
+        # Request only the details of the new campaigns, or changed (endAt) or expired
         result = []
-        chunks = create_chunks(campaigns, 20)
+        missing = []
+        for campaign in campaigns:
+            try:
+                details, expired = self.campaigns_details.get(campaign["id"])
+            except KeyError:
+                details, expired = None, True
+            if (
+                details is None
+                or expired is True
+                or details["endAt"] != campaign["endAt"]
+            ):
+                missing.append(campaign)
+            else:
+                details["status"] = campaign["status"]
+                result.append(details)
+
+        chunks = create_chunks(missing, 20)
         for chunk in chunks:
-            json_data = []
-            for campaign in chunk:
-                json_data.append(copy.deepcopy(
-                    GQLOperations.DropCampaignDetails))
-                json_data[-1]["variables"] = {
-                    "dropID": campaign["id"],
-                    "channelLogin": f"{self.twitch_login.get_user_id()}",
-                }
+            json_data = [
+                GQLOperations.DropCampaignDetails.request(
+                    {
+                        "dropID": campaign["id"],
+                        "channelLogin": f"{self.twitch_login.get_user_id()}",
+                    }
+                )
+                for campaign in chunk
+            ]
 
             response = self.post_gql_request(json_data)
             for r in response:
                 if r["data"]["user"] is not None:
-                    result.append(r["data"]["user"]["dropCampaign"])
+                    details = r["data"]["user"]["dropCampaign"]
+                    result.append(details)
+                    if details is not None:
+                        self.campaigns_details.set(details["id"], details)
+
+        if missing != []:
+            logger.debug(
+                f"Campaigns details: {len(missing)} requested, {len(campaigns) - len(missing)} cached"
+            )
+        # The ended campaigns are never requested again
+        now = datetime.utcnow()
+        self.campaigns_details.evict(
+            lambda details: parse_datetime(details["endAt"]) < now
+        )
         return result
 
     def __sync_campaigns(self, campaigns):
         # We need the inventory only for get the real updated value/progress
         # Get data from inventory and sync current status with streamers.campaigns
+        # Only the campaigns with a different progress are updated (see CampaignsIndex)
         inventory = self.__get_inventory()
         if inventory not in [None, {}] and inventory["dropCampaignsInProgress"] not in [
             None,
             {},
         ]:
-            # Iterate all campaigns from dashboard (only active, with working drops)
-            # In this array we have also the campaigns never started from us (not in nventory)
-            for i in range(len(campaigns)):
-                campaigns[i].clear_drops()  # Remove all the claimed drops
-                # Iterate all campaigns currently in progress from out inventory
-                for progress in inventory["dropCampaignsInProgress"]:
-                    if progress["id"] == campaigns[i].id:
-                        campaigns[i].in_inventory = True
-                        campaigns[i].sync_drops(
-                            progress["timeBasedDrops"], self.claim_drop
-                        )
-                        # Remove all the claimed drops
-                        campaigns[i].clear_drops()
-                        break
-        return campaigns
+            return campaigns.sync(
+                inventory["dropCampaignsInProgress"], self.drop_claimer.submit
+            )
+        return []
 
     def claim_drop(self, drop):
-        logger.info(
-            f"Claim {drop}", extra={"emoji": ":package:", "event": Events.DROP_CLAIM}
-        )
+        return self.claim_drops([drop])[0]
 
-        json_data = copy.deepcopy(GQLOperations.DropsPage_ClaimDropRewards)
-        json_data["variables"] = {
-            "input": {"dropInstanceID": drop.drop_instance_id}}
+    # Claim many drops with a single batched request, return the claimed status of every drop
+    def claim_drops(self, drops):
+        for drop in drops:
+            logger.info(
+                f"Claim {drop}", extra={"emoji": ":package:", "event": Events.DROP_CLAIM}
+            )
+
+        json_data = [
+            GQLOperations.DropsPage_ClaimDropRewards.request(
+                {"input": {"dropInstanceID": drop.drop_instance_id}}
+            )
+            for drop in drops
+        ]
         response = self.post_gql_request(json_data)
+        if not isinstance(response, list) or len(response) != len(drops):
+            return [False] * len(drops)
+        return [self.__is_drop_claimed(item) for item in response]
+
+    @staticmethod
+    def __is_drop_claimed(response):
         try:
             # response["data"]["claimDropRewards"] can be null and respose["data"]["errors"] != []
             # or response["data"]["claimDropRewards"]["status"] === DROP_INSTANCE_ALREADY_CLAIMED
@@ -904,7 +1191,7 @@ class Twitch(object):
                 return True
             else:
                 return False
-        except (ValueError, KeyError):
+        except (ValueError, KeyError, TypeError):
             return False
 
     def claim_all_drops_from_inventory(self):
@@ -916,11 +1203,11 @@ class Twitch(object):
                         drop = Drop(drop_dict)
                         drop.update(drop_dict["self"])
                         if drop.is_claimable is True:
-                            drop.is_claimed = self.claim_drop(drop)
-                            time.sleep(random.uniform(5, 10))
+                            self.drop_claimer.submit(drop)
 
     def sync_campaigns(self, streamers, chunk_size=3):
         campaigns_update = 0
+        campaigns = CampaignsIndex()
         while self.running:
             try:
                 # Get update from dashboard each 60minutes
@@ -943,7 +1230,7 @@ class Twitch(object):
                     campaigns_details = self.__get_campaigns_details(
                         self.__get_drops_dashboard(status="ACTIVE")
                     )
-                    campaigns = []
+                    active_campaigns = []
 
                     # Going to clear array and structure. Remove all the timeBasedDrops expired or not started yet
                     for index in range(0, len(campaigns_details)):
@@ -953,27 +1240,25 @@ class Twitch(object):
                                 # Remove all the drops already claimed or with dt not matching
                                 campaign.clear_drops()
                                 if campaign.drops != []:
-                                    campaigns.append(campaign)
+                                    active_campaigns.append(campaign)
                         else:
                             continue
+                    campaigns.update(active_campaigns)
 
                 # Divide et impera :)
-                campaigns = self.__sync_campaigns(campaigns)
+                changed = self.__sync_campaigns(campaigns) != []
 
                 # Check if user It's currently streaming the same game present in campaigns_details
                 for i in range(0, len(streamers)):
                     if streamers[i].drops_condition() is True:
                         # yes! The streamer[i] have the drops_tags enabled and we It's currently stream a game with campaign active!
                         # With 'campaigns_ids' we are also sure that this streamer have the campaign active.
-                        # yes! The streamer[index] have the drops_tags enabled and we It's currently stream a game with campaign active!
-                        streamers[i].stream.campaigns = list(
-                            filter(
-                                lambda x: x.drops != []
-                                and x.game == streamers[i].stream.game
-                                and x.id in streamers[i].stream.campaigns_ids,
-                                campaigns,
-                            )
-                        )
+                        streamer_campaigns = campaigns.for_stream(streamers[i].stream)
+                        if streamer_campaigns != streamers[i].stream.campaigns:
+                            streamers[i].stream.campaigns = streamer_campaigns
+                            changed = True
+                if changed is True:
+                    self.watch_selector.notify()
 
             except (ValueError, KeyError, requests.exceptions.ConnectionError) as e:
                 logger.error(f"Error while syncing inventory: {e}")
@@ -987,8 +1272,9 @@ class Twitch(object):
             goal.status == "STARTED" and goal.is_in_stock
             for goal in streamer.community_goals.values()
         ):
-            json_data = copy.deepcopy(GQLOperations.UserPointsContribution)
-            json_data["variables"] = {"channelLogin": streamer.username}
+            json_data = GQLOperations.UserPointsContribution.request(
+                {"channelLogin": streamer.username}
+            )
             response = self.post_gql_request(json_data)
             user_goal_contributions = response["data"]["user"]["channel"]["self"][
                 "communityPoints"
@@ -1029,16 +1315,16 @@ class Twitch(object):
                         )
 
     def contribute_to_community_goal(self, streamer, goal_id, title, amount):
-        json_data = copy.deepcopy(
-            GQLOperations.ContributeCommunityPointsCommunityGoal)
-        json_data["variables"] = {
-            "input": {
-                "amount": amount,
-                "channelID": streamer.channel_id,
-                "goalID": goal_id,
-                "transactionID": token_hex(16),
+        json_data = GQLOperations.ContributeCommunityPointsCommunityGoal.request(
+            {
+                "input": {
+                    "amount": amount,
+                    "channelID": streamer.channel_id,
+                    "goalID": goal_id,
+                    "transactionID": token_hex(16),
+                }
             }
-        }
+        )
 
         response = self.post_gql_request(json_data)
 
@@ -0,0 +1,222 @@
+import logging
+import math
+import time
+from threading import Condition
+
+from TwitchChannelPointsMiner.classes.DropsScheduler import DropsScheduler
+from TwitchChannelPointsMiner.classes.PointsOptimizer import PointsOptimizer
+from TwitchChannelPointsMiner.classes.Settings import Priority
+
+logger = logging.getLogger(__name__)
+
+
+class WatchSelector(object):
+    __slots__ = [
+        "streamers",
+        "priority",
+        "indexes",
+        "online",
+        "selection",
+        "next_change_at",
+        "changed",
+        "condition",
+        "drops_scheduler",
+        "optimizer",
+    ]
+
+    # Keep the (max 2) streamers to watch up to date from the events that change them
+    # (online/offline, points, watch streak, drops campaigns) instead of rebuilding the
+    # selection on every iteration. The watcher is woken up as soon as the selection changes.
+    def __init__(self):
+        self.streamers = []
+        self.priority = []
+        self.indexes = {}
+        self.online = set()
+        self.selection = []
+        # The selection also depends on time (online for 30s, offline for 30m), recompute it then
+        self.next_change_at = math.inf
+        self.changed = False
+        self.condition = Condition()
+        self.drops_scheduler = DropsScheduler()
+        self.optimizer = None
+
+    def attach(self, streamers, priority):
+        with self.condition:
+            self.streamers = streamers
+            self.priority = priority
+            self.indexes = {
+                streamer.username: index for index, streamer in enumerate(streamers)
+            }
+            self.online = {
+                index
+                for index, streamer in enumerate(streamers)
+                if streamer.is_online is True
+            }
+            self.optimizer = (
+                PointsOptimizer(streamers)
+                if Priority.EXPECTED_POINTS in priority
+                else None
+            )
+            self.__update()
+
+    def notify(self, streamer=None):
+        with self.condition:
+            if streamer is not None and streamer.username in self.indexes:
+                index = self.indexes[streamer.username]
+                if streamer.is_online is True:
+                    self.online.add(index)
+                else:
+                    self.online.discard(index)
+                if self.optimizer is not None:
+                    self.optimizer.update(index, streamer)
+            elif streamer is None and self.optimizer is not None:
+                for index, item in enumerate(self.streamers):
+                    self.optimizer.update(index, item)
+            self.__update()
+
+    # Only the points change, skip the update if the points don't matter for the selection
+    def notify_points(self, streamer):
+        if (
+            Priority.POINTS_ASCENDING in self.priority
+            or Priority.POINTS_DESCENDING in self.priority
+            or Priority.SUBSCRIBED in self.priority
+            or Priority.EXPECTED_POINTS in self.priority
+        ):
+            self.notify(streamer)
+
+    # username -> expected points per minute (Priority.EXPECTED_POINTS only)
+    def scores(self):
+        with self.condition:
+            return {} if self.optimizer is None else self.optimizer.get_scores()
+
+    def wake(self):
+        with self.condition:
+            self.changed = True
+            self.condition.notify_all()
+
+    def select(self):
+        with self.condition:
+            if time.time() >= self.next_change_at:
+                self.__update()
+            self.changed = False
+            return list(self.selection)
+
+    # Sleep up to timeout seconds, return earlier if the selection changes
+    def wait(self, timeout):
+        with self.condition:
+            timeout = min(timeout, self.next_change_at - time.time())
+            if self.changed is False and timeout > 0:
+                self.condition.wait(timeout)
+
+    def __update(self):
+        selection = self.__compute()
+        if selection != self.selection:
+            logger.debug(
+                f"Watching: {', '.join(self.streamers[index].username for index in selection)}"
+            )
+            if self.optimizer is not None:
+                logger.debug(f"Expected points per minute: {self.scores()}")
+            self.selection = selection
+            self.changed = True
+            self.condition.notify_all()
+
+    def __compute(self):
+        now = time.time()
+        self.next_change_at = math.inf
+        streamers = self.streamers
+
+        streamers_index = []
+        for index in sorted(self.online):
+            online_at = streamers[index].online_at
+            if online_at == 0 or (now - online_at) > 30:
+                streamers_index.append(index)
+            else:
+                self.next_change_at = min(self.next_change_at, online_at + 30)
+
+        streamers_watching = []
+        for prior in self.priority:
+            if prior == Priority.ORDER and len(streamers_watching) < 2:
+                # Get the first 2 items, they are already in order
+                streamers_watching += streamers_index[:2]
+
+            elif (
+                prior in [Priority.POINTS_ASCENDING, Priority.POINTS_DESCENDING]
+                and len(streamers_watching) < 2
+            ):
+                items = sorted(
+                    streamers_index,
+                    key=lambda index: streamers[index].channel_points,
+                    reverse=(True if prior == Priority.POINTS_DESCENDING else False),
+                )
+                streamers_watching += items[:2]
+
+            elif prior == Priority.STREAK and len(streamers_watching) < 2:
+                """
+                Check if we need need to change priority based on watch streak
+                Viewers receive points for returning for x consecutive streams.
+                Each stream must be at least 10 minutes long and it must have been at least 30 minutes since the last stream ended.
+                Watch at least 6m for get the +10
+                """
+                for index in streamers_index:
+                    if (
+                        streamers[index].settings.watch_streak is True
+                        and streamers[index].stream.watch_streak_missing is True
+                        # fix #425
+                        and streamers[index].stream.minute_watched < 7
+                    ):
+                        if (
+                            streamers[index].offline_at == 0
+                            or ((now - streamers[index].offline_at) // 60) > 30
+                        ):
+                            streamers_watching.append(index)
+                            if len(streamers_watching) == 2:
+                                break
+                        else:
+                            self.next_change_at = min(
+                                self.next_change_at,
+                                streamers[index].offline_at + 31 * 60,
+                            )
+
+            elif prior == Priority.DROPS and len(streamers_watching) < 2:
+                for index in streamers_index:
+                    if streamers[index].drops_condition() is True:
+                        streamers_watching.append(index)
+                        if len(streamers_watching) == 2:
+                            break
+
+            elif prior == Priority.DROPS_DEADLINE and len(streamers_watching) < 2:
+                # Only one channel at a time earns drops progress
+                index = self.drops_scheduler.select(streamers, streamers_index)
+                if index is not None:
+                    streamers_watching.append(index)
+
+            elif (
+                prior == Priority.EXPECTED_POINTS
+                and len(streamers_watching) < 2
+                and self.optimizer is not None
+            ):
+                streamers_watching += self.optimizer.select(
+                    2 - len(streamers_watching), exclude=streamers_watching, now=now
+                )
+                self.next_change_at = min(
+                    self.next_change_at, self.optimizer.next_change_at(now=now)
+                )
+
+            elif prior == Priority.SUBSCRIBED and len(streamers_watching) < 2:
+                streamers_with_multiplier = [
+                    index
+                    for index in streamers_index
+                    if streamers[index].viewer_has_points_multiplier()
+                ]
+                streamers_with_multiplier = sorted(
+                    streamers_with_multiplier,
+                    key=lambda x: streamers[x].total_points_multiplier(),
+                    reverse=True,
+                )
+                streamers_watching += streamers_with_multiplier[:2]
+
+        """
+        Twitch has a limit - you can't watch more than 2 channels at one time.
+        We take the first two streamers from the list as they have the highest priority (based on order or WatchStreak).
+        """
+        return streamers_watching[:2]
@@ -1,4 +1,3 @@
-import json
 import logging
 import random
 import time
@@ -6,31 +5,45 @@ import time
 from threading import Thread, Timer
 # from pathlib import Path
 
-from dateutil import parser
-
+from TwitchChannelPointsMiner.classes.ActionQueue import ActionPriority, ActionQueue
 from TwitchChannelPointsMiner.classes.entities.CommunityGoal import CommunityGoal
 from TwitchChannelPointsMiner.classes.entities.EventPrediction import EventPrediction
 from TwitchChannelPointsMiner.classes.entities.Message import Message
 from TwitchChannelPointsMiner.classes.entities.Raid import Raid
+from TwitchChannelPointsMiner.classes.MessageDeduplicator import MessageDeduplicator
 from TwitchChannelPointsMiner.classes.Settings import Events, Settings
 from TwitchChannelPointsMiner.classes.TwitchWebSocket import TwitchWebSocket
 from TwitchChannelPointsMiner.constants import WEBSOCKET
-from TwitchChannelPointsMiner.utils import (
-    get_streamer_index,
-    internet_connection_available,
-)
+from TwitchChannelPointsMiner.utils import json_loads, parse_iso_datetime
 
 logger = logging.getLogger(__name__)
 
 
 class WebSocketsPool:
-    __slots__ = ["ws", "twitch", "streamers", "events_predictions"]
+    __slots__ = [
+        "ws",
+        "twitch",
+        "streamers",
+        "streamers_by_channel_id",
+        "events_predictions",
+        "actions",
+        "deduplicator",
+    ]
 
     def __init__(self, twitch, streamers, events_predictions):
         self.ws = []
         self.twitch = twitch
         self.streamers = streamers
+        # channel_id -> Streamer, the messages are routed without scanning the streamers
+        self.streamers_by_channel_id = {
+            str(streamer.channel_id): streamer for streamer in streamers
+        }
         self.events_predictions = events_predictions
+        # The messages are only decoded on the WebSocket threads, the requests and the
+        # analytics writes are executed by the workers of the queue
+        self.actions = ActionQueue()
+        # Shared by all the connections, the same message may be received more than once
+        self.deduplicator = MessageDeduplicator()
 
     """
     API Limits
@@ -40,6 +53,9 @@ class WebSocketsPool:
     """
 
     def submit(self, topic):
+        if topic.streamer is not None:
+            self.add_streamer(topic.streamer)
+
         # Check if we need to create a new WebSocket instance
         if self.ws == [] or len(self.ws[-1].topics) >= 50:
             self.ws.append(self.__new(len(self.ws)))
@@ -47,6 +63,9 @@ class WebSocketsPool:
 
         self.__submit(-1, topic)
 
+    def add_streamer(self, streamer):
+        self.streamers_by_channel_id[str(streamer.channel_id)] = streamer
+
     def __submit(self, index, topic):
         # Topic in topics should never happen. Anyway prevent any types of duplicates
         if topic not in self.ws[index].topics:
@@ -147,12 +166,8 @@ class WebSocketsPool:
                 )
                 time.sleep(30)
 
-                while internet_connection_available() is False:
-                    random_sleep = random.randint(1, 3)
-                    logger.warning(
-                        f"#{ws.index} - No internet connection available! Retry after {random_sleep}m"
-                    )
-                    time.sleep(random_sleep * 60)
+                # Wait for the connectivity monitor instead of probing
+                ws.twitch.http.connectivity.wait_online()
 
                 # Why not create a new ws on the same array index? Let's try.
                 self = ws.parent_pool
@@ -165,260 +180,45 @@ class WebSocketsPool:
                 for topic in ws.topics:
                     self.__submit(ws.index, topic)
 
+                # The points messages of the reconnection gap are lost
+                if any(
+                    topic.topic == "community-points-user-v1" for topic in ws.topics
+                ):
+                    ws.twitch.balance_tracker.reconnected(ws.streamers)
+
     @staticmethod
     def on_message(ws, message):
-        logger.debug(f"#{ws.index} - Received: {message.strip()}")
-        response = json.loads(message)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"#{ws.index} - Received: {message.strip()}")
+        response = json_loads(message)
 
         if response["type"] == "MESSAGE":
             # We should create a Message class ...
             message = Message(response["data"])
 
+            handler = MESSAGE_HANDLERS.get((message.topic, message.type))
+            if handler is None:
+                # Not interesting, the payload is not even decoded
+                return
+            function, deduplicate = handler
+
             # If we have more than one PubSub connection, messages may be duplicated
-            # Check the concatenation between message_type.top.channel_id
+            # Check the concatenation between message_type.top.channel_id and the timestamp
             if (
-                ws.last_message_type_channel is not None
-                and ws.last_message_timestamp is not None
-                and ws.last_message_timestamp == message.timestamp
-                and ws.last_message_type_channel == message.identifier
+                deduplicate is True
+                and ws.parent_pool.deduplicator.is_duplicate(
+                    f"{message.identifier}.{message.timestamp}"
+                )
+                is True
             ):
                 return
 
-            ws.last_message_timestamp = message.timestamp
-            ws.last_message_type_channel = message.identifier
-
-            streamer_index = get_streamer_index(ws.streamers, message.channel_id)
-            if streamer_index != -1:
+            streamer = ws.parent_pool.streamers_by_channel_id.get(
+                str(message.channel_id)
+            )
+            if streamer is not None:
                 try:
-                    if message.topic == "community-points-user-v1":
-                        if message.type in ["points-earned", "points-spent"]:
-                            balance = message.data["balance"]["balance"]
-                            ws.streamers[streamer_index].channel_points = balance
-                            # Analytics switch
-                            if Settings.enable_analytics is True:
-                                ws.streamers[streamer_index].persistent_series(
-                                    event_type=message.data["point_gain"]["reason_code"]
-                                    if message.type == "points-earned"
-                                    else "Spent"
-                                )
-
-                        if message.type == "points-earned":
-                            earned = message.data["point_gain"]["total_points"]
-                            reason_code = message.data["point_gain"]["reason_code"]
-
-                            logger.info(
-                                f"+{earned} → {ws.streamers[streamer_index]} - Reason: {reason_code}.",
-                                extra={
-                                    "emoji": ":rocket:",
-                                    "event": Events.get(f"GAIN_FOR_{reason_code}"),
-                                },
-                            )
-                            ws.streamers[streamer_index].update_history(
-                                reason_code, earned
-                            )
-                            # Analytics switch
-                            if Settings.enable_analytics is True:
-                                ws.streamers[streamer_index].persistent_annotations(
-                                    reason_code, f"+{earned} - {reason_code}"
-                                )
-                        elif message.type == "claim-available":
-                            ws.twitch.claim_bonus(
-                                ws.streamers[streamer_index],
-                                message.data["claim"]["id"],
-                            )
-
-                    elif message.topic == "video-playback-by-id":
-                        # There is stream-up message type, but it's sent earlier than the API updates
-                        if message.type == "stream-up":
-                            ws.streamers[streamer_index].stream_up = time.time()
-                        elif message.type == "stream-down":
-                            if ws.streamers[streamer_index].is_online is True:
-                                ws.streamers[streamer_index].set_offline()
-                        elif message.type == "viewcount":
-                            if ws.streamers[streamer_index].stream_up_elapsed():
-                                ws.twitch.check_streamer_online(
-                                    ws.streamers[streamer_index]
-                                )
-
-                    elif message.topic == "raid":
-                        if message.type == "raid_update_v2":
-                            raid = Raid(
-                                message.message["raid"]["id"],
-                                message.message["raid"]["target_login"],
-                            )
-                            ws.twitch.update_raid(ws.streamers[streamer_index], raid)
-
-                    elif message.topic == "community-moments-channel-v1":
-                        if message.type == "active":
-                            ws.twitch.claim_moment(
-                                ws.streamers[streamer_index], message.data["moment_id"]
-                            )
-
-                    elif message.topic == "predictions-channel-v1":
-
-                        event_dict = message.data["event"]
-                        event_id = event_dict["id"]
-                        event_status = event_dict["status"]
-
-                        current_tmsp = parser.parse(message.timestamp)
-
-                        if (
-                            message.type == "event-created"
-                            and event_id not in ws.events_predictions
-                        ):
-                            if event_status == "ACTIVE":
-                                prediction_window_seconds = float(
-                                    event_dict["prediction_window_seconds"]
-                                )
-                                # Reduce prediction window by 3/6s - Collect more accurate data for decision
-                                prediction_window_seconds = ws.streamers[
-                                    streamer_index
-                                ].get_prediction_window(prediction_window_seconds)
-                                event = EventPrediction(
-                                    ws.streamers[streamer_index],
-                                    event_id,
-                                    event_dict["title"],
-                                    parser.parse(event_dict["created_at"]),
-                                    prediction_window_seconds,
-                                    event_status,
-                                    event_dict["outcomes"],
-                                )
-                                if (
-                                    ws.streamers[streamer_index].is_online
-                                    and event.closing_bet_after(current_tmsp) > 0
-                                ):
-                                    streamer = ws.streamers[streamer_index]
-                                    bet_settings = streamer.settings.bet
-                                    if (
-                                        bet_settings.minimum_points is None
-                                        or streamer.channel_points
-                                        > bet_settings.minimum_points
-                                    ):
-                                        ws.events_predictions[event_id] = event
-                                        start_after = event.closing_bet_after(
-                                            current_tmsp
-                                        )
-
-                                        place_bet_thread = Timer(
-                                            start_after,
-                                            ws.twitch.make_predictions,
-                                            (ws.events_predictions[event_id],),
-                                        )
-                                        place_bet_thread.daemon = True
-                                        place_bet_thread.start()
-
-                                        logger.info(
-                                            f"Place the bet after: {start_after}s for: {ws.events_predictions[event_id]}",
-                                            extra={
-                                                "emoji": ":alarm_clock:",
-                                                "event": Events.BET_START,
-                                            },
-                                        )
-                                    else:
-                                        logger.info(
-                                            f"{streamer} have only {streamer.channel_points} channel points and the minimum for bet is: {bet_settings.minimum_points}",
-                                            extra={
-                                                "emoji": ":pushpin:",
-                                                "event": Events.BET_FILTERS,
-                                            },
-                                        )
-
-                        elif (
-                            message.type == "event-updated"
-                            and event_id in ws.events_predictions
-                        ):
-                            ws.events_predictions[event_id].status = event_status
-                            # Game over we can't update anymore the values... The bet was placed!
-                            if (
-                                ws.events_predictions[event_id].bet_placed is False
-                                and ws.events_predictions[event_id].bet.decision == {}
-                            ):
-                                ws.events_predictions[event_id].bet.update_outcomes(
-                                    event_dict["outcomes"]
-                                )
-
-                    elif message.topic == "predictions-user-v1":
-                        event_id = message.data["prediction"]["event_id"]
-                        if event_id in ws.events_predictions:
-                            event_prediction = ws.events_predictions[event_id]
-                            if (
-                                message.type == "prediction-result"
-                                and event_prediction.bet_confirmed
-                            ):
-                                points = event_prediction.parse_result(
-                                    message.data["prediction"]["result"]
-                                )
-
-                                decision = event_prediction.bet.get_decision()
-                                choice = event_prediction.bet.decision["choice"]
-
-                                logger.info(
-                                    (
-                                        f"{event_prediction} - Decision: {choice}: {decision['title']} "
-                                        f"({decision['color']}) - Result: {event_prediction.result['string']}"
-                                    ),
-                                    extra={
-                                        "emoji": ":bar_chart:",
-                                        "event": Events.get(
-                                            f"BET_{event_prediction.result['type']}"
-                                        ),
-                                    },
-                                )
-
-                                ws.streamers[streamer_index].update_history(
-                                    "PREDICTION", points["gained"]
-                                )
-
-                                # Remove duplicate history records from previous message sent in community-points-user-v1
-                                if event_prediction.result["type"] == "REFUND":
-                                    ws.streamers[streamer_index].update_history(
-                                        "REFUND",
-                                        -points["placed"],
-                                        counter=-1,
-                                    )
-                                elif event_prediction.result["type"] == "WIN":
-                                    ws.streamers[streamer_index].update_history(
-                                        "PREDICTION",
-                                        -points["won"],
-                                        counter=-1,
-                                    )
-
-                                if event_prediction.result["type"]:
-                                    # Analytics switch
-                                    if Settings.enable_analytics is True:
-                                        ws.streamers[
-                                            streamer_index
-                                        ].persistent_annotations(
-                                            event_prediction.result["type"],
-                                            f"{ws.events_predictions[event_id].title}",
-                                        )
-                            elif message.type == "prediction-made":
-                                event_prediction.bet_confirmed = True
-                                # Analytics switch
-                                if Settings.enable_analytics is True:
-                                    ws.streamers[streamer_index].persistent_annotations(
-                                        "PREDICTION_MADE",
-                                        f"Decision: {event_prediction.bet.decision['choice']} - {event_prediction.title}",
-                                    )
-                    elif message.topic == "community-points-channel-v1":
-                        if message.type == "community-goal-created":
-                            # TODO Untested, hard to find this happening live
-                            ws.streamers[streamer_index].add_community_goal(
-                                CommunityGoal.from_pubsub(message.data["community_goal"])
-                            )
-                        elif message.type == "community-goal-updated":
-                            ws.streamers[streamer_index].update_community_goal(
-                                CommunityGoal.from_pubsub(message.data["community_goal"])
-                            )
-                        elif message.type == "community-goal-deleted":
-                            # TODO Untested, not sure what the message format for this is,
-                            #      https://github.com/sammwyy/twitch-ps/blob/master/main.js#L417
-                            #      suggests that it should be just the entire, now deleted, goal model
-                            ws.streamers[streamer_index].delete_community_goal(message.data["community_goal"]["id"])
-
-                        if message.type in ["community-goal-updated", "community-goal-created"]:
-                            ws.twitch.contribute_to_community_goals(ws.streamers[streamer_index])
-
+                    function(ws, message, streamer)
                 except Exception:
                     logger.error(
                         f"Exception raised for topic: {message.topic} and message: {message}",
@@ -452,3 +252,324 @@ class WebSocketsPool:
 
         elif response["type"] == "PONG":
             ws.last_pong = time.time()
+
+    # === MESSAGE HANDLERS === #
+    # The points-earned/points-spent balance is authoritative, the tracker checks it against the points earned
+    @staticmethod
+    def __update_balance(ws, message, streamer, earned=None, reason_code="Spent"):
+        ws.twitch.balance_tracker.update(
+            streamer, message.data["balance"]["balance"], earned
+        )
+        ws.twitch.watch_selector.notify_points(streamer)
+        # Analytics switch
+        if Settings.enable_analytics is True:
+            ws.parent_pool.actions.submit(
+                streamer.persistent_series,
+                reason_code,
+                priority=ActionPriority.BACKGROUND,
+            )
+
+    @staticmethod
+    def on_points_earned(ws, message, streamer):
+        earned = message.data["point_gain"]["total_points"]
+        reason_code = message.data["point_gain"]["reason_code"]
+        WebSocketsPool.__update_balance(ws, message, streamer, earned, reason_code)
+
+        logger.info(
+            f"+{earned} → {streamer} - Reason: {reason_code}.",
+            extra={
+                "emoji": ":rocket:",
+                "event": Events.get(f"GAIN_FOR_{reason_code}"),
+            },
+        )
+        streamer.update_history(reason_code, earned)
+        if reason_code == "WATCH":
+            ws.twitch.balance_tracker.watch_gain(streamer)
+        elif reason_code == "WATCH_STREAK":
+            ws.twitch.watch_selector.notify(streamer)
+        # Analytics switch
+        if Settings.enable_analytics is True:
+            ws.parent_pool.actions.submit(
+                streamer.persistent_annotations,
+                reason_code,
+                f"+{earned} - {reason_code}",
+                priority=ActionPriority.BACKGROUND,
+            )
+
+    @staticmethod
+    def on_points_spent(ws, message, streamer):
+        WebSocketsPool.__update_balance(ws, message, streamer)
+
+    @staticmethod
+    def on_claim_available(ws, message, streamer):
+        ws.parent_pool.actions.submit(
+            ws.twitch.claim_bonus,
+            streamer,
+            message.data["claim"]["id"],
+            priority=ActionPriority.URGENT,
+            key=("claim_bonus", message.data["claim"]["id"]),
+        )
+
+    # There is stream-up message type, but it's sent earlier than the API updates
+    @staticmethod
+    def on_stream_up(ws, message, streamer):
+        streamer.stream_up = time.time()
+        # Don't wait for a viewcount message to check it
+        ws.twitch.confirm_stream_up(streamer)
+
+    @staticmethod
+    def on_stream_down(ws, message, streamer):
+        if streamer.is_online is True:
+            streamer.set_offline()
+            ws.twitch.watch_selector.notify(streamer)
+
+    # The online streamers are kept up to date by the stream status poller,
+    # a viewcount is interesting only if we think the streamer is offline
+    @staticmethod
+    def on_viewcount(ws, message, streamer):
+        if streamer.is_online is False and streamer.stream_up_elapsed():
+            ws.parent_pool.actions.submit(
+                ws.twitch.check_streamer_online,
+                streamer,
+                key=("check_streamer_online", streamer.username),
+            )
+
+    @staticmethod
+    def on_raid_update(ws, message, streamer):
+        raid = Raid(
+            message.message["raid"]["id"],
+            message.message["raid"]["target_login"],
+        )
+        ws.parent_pool.actions.submit(
+            ws.twitch.update_raid,
+            streamer,
+            raid,
+            key=("update_raid", raid.raid_id),
+        )
+
+    @staticmethod
+    def on_moment_active(ws, message, streamer):
+        ws.parent_pool.actions.submit(
+            ws.twitch.claim_moment,
+            streamer,
+            message.data["moment_id"],
+            priority=ActionPriority.URGENT,
+            key=("claim_moment", message.data["moment_id"]),
+        )
+
+    @staticmethod
+    def on_prediction_created(ws, message, streamer):
+        event_dict = message.data["event"]
+        event_id = event_dict["id"]
+        event_status = event_dict["status"]
+
+        current_tmsp = parse_iso_datetime(message.timestamp)
+
+        if event_id not in ws.events_predictions and event_status == "ACTIVE":
+            prediction_window_seconds = float(event_dict["prediction_window_seconds"])
+            # Reduce prediction window by 3/6s - Collect more accurate data for decision
+            prediction_window_seconds = streamer.get_prediction_window(
+                prediction_window_seconds
+            )
+            event = EventPrediction(
+                streamer,
+                event_id,
+                event_dict["title"],
+                parse_iso_datetime(event_dict["created_at"]),
+                prediction_window_seconds,
+                event_status,
+                event_dict["outcomes"],
+            )
+            if streamer.is_online and event.closing_bet_after(current_tmsp) > 0:
+                bet_settings = streamer.settings.bet
+                if (
+                    bet_settings.minimum_points is None
+                    or streamer.channel_points > bet_settings.minimum_points
+                ):
+                    ws.events_predictions[event_id] = event
+                    start_after = event.closing_bet_after(current_tmsp)
+
+                    place_bet_thread = Timer(
+                        start_after,
+                        ws.twitch.make_predictions,
+                        (ws.events_predictions[event_id],),
+                    )
+                    place_bet_thread.daemon = True
+                    place_bet_thread.start()
+
+                    logger.info(
+                        f"Place the bet after: {start_after}s for: {ws.events_predictions[event_id]}",
+                        extra={
+                            "emoji": ":alarm_clock:",
+                            "event": Events.BET_START,
+                        },
+                    )
+                else:
+                    logger.info(
+                        f"{streamer} have only {streamer.channel_points} channel points and the minimum for bet is: {bet_settings.minimum_points}",
+                        extra={
+                            "emoji": ":pushpin:",
+                            "event": Events.BET_FILTERS,
+                        },
+                    )
+
+    @staticmethod
+    def on_prediction_updated(ws, message, streamer):
+        event_dict = message.data["event"]
+        event_id = event_dict["id"]
+        if event_id in ws.events_predictions:
+            ws.events_predictions[event_id].status = event_dict["status"]
+            # Game over we can't update anymore the values... The bet was placed!
+            if (
+                ws.events_predictions[event_id].bet_placed is False
+                and ws.events_predictions[event_id].bet.decision == {}
+            ):
+                ws.events_predictions[event_id].bet.update_outcomes(
+                    event_dict["outcomes"]
+                )
+
+    @staticmethod
+    def on_prediction_result(ws, message, streamer):
+        event_id = message.data["prediction"]["event_id"]
+        if event_id not in ws.events_predictions:
+            return
+        event_prediction = ws.events_predictions[event_id]
+        if event_prediction.bet_confirmed is False:
+            return
+
+        points = event_prediction.parse_result(message.data["prediction"]["result"])
+
+        decision = event_prediction.bet.get_decision()
+        choice = event_prediction.bet.decision["choice"]
+
+        logger.info(
+            (
+                f"{event_prediction} - Decision: {choice}: {decision['title']} "
+                f"({decision['color']}) - Result: {event_prediction.result['string']}"
+            ),
+            extra={
+                "emoji": ":bar_chart:",
+                "event": Events.get(f"BET_{event_prediction.result['type']}"),
+            },
+        )
+
+        streamer.update_history("PREDICTION", points["gained"])
+
+        # Remove duplicate history records from previous message sent in community-points-user-v1
+        if event_prediction.result["type"] == "REFUND":
+            streamer.update_history(
+                "REFUND",
+                -points["placed"],
+                counter=-1,
+            )
+        elif event_prediction.result["type"] == "WIN":
+            streamer.update_history(
+                "PREDICTION",
+                -points["won"],
+                counter=-1,
+            )
+
+        if event_prediction.result["type"]:
+            # Analytics switch
+            if Settings.enable_analytics is True:
+                ws.parent_pool.actions.submit(
+                    streamer.persistent_annotations,
+                    event_prediction.result["type"],
+                    f"{ws.events_predictions[event_id].title}",
+                    priority=ActionPriority.BACKGROUND,
+                )
+
+    @staticmethod
+    def on_prediction_made(ws, message, streamer):
+        event_id = message.data["prediction"]["event_id"]
+        if event_id not in ws.events_predictions:
+            return
+        event_prediction = ws.events_predictions[event_id]
+        event_prediction.bet_confirmed = True
+        # Analytics switch
+        if Settings.enable_analytics is True:
+            ws.parent_pool.actions.submit(
+                streamer.persistent_annotations,
+                "PREDICTION_MADE",
+                f"Decision: {event_prediction.bet.decision['choice']} - {event_prediction.title}",
+                priority=ActionPriority.BACKGROUND,
+            )
+
+    @staticmethod
+    def on_community_goal(ws, message, streamer):
+        if message.type == "community-goal-created":
+            # TODO Untested, hard to find this happening live
+            streamer.add_community_goal(
+                CommunityGoal.from_pubsub(message.data["community_goal"])
+            )
+        elif message.type == "community-goal-updated":
+            streamer.update_community_goal(
+                CommunityGoal.from_pubsub(message.data["community_goal"])
+            )
+        elif message.type == "community-goal-deleted":
+            # TODO Untested, not sure what the message format for this is,
+            #      https://github.com/sammwyy/twitch-ps/blob/master/main.js#L417
+            #      suggests that it should be just the entire, now deleted, goal model
+            streamer.delete_community_goal(message.data["community_goal"]["id"])
+
+        if message.type in ["community-goal-updated", "community-goal-created"]:
+            ws.parent_pool.actions.submit(
+                ws.twitch.contribute_to_community_goals,
+                streamer,
+                priority=ActionPriority.BACKGROUND,
+                key=("contribute_to_community_goals", streamer.username),
+            )
+
+
+# (topic, message type) -> (handler, deduplicate)
+# The messages not listed here are ignored. A viewcount only triggers an idempotent check.
+MESSAGE_HANDLERS = {
+    ("community-points-user-v1", "points-earned"): (
+        WebSocketsPool.on_points_earned,
+        True,
+    ),
+    ("community-points-user-v1", "points-spent"): (
+        WebSocketsPool.on_points_spent,
+        True,
+    ),
+    ("community-points-user-v1", "claim-available"): (
+        WebSocketsPool.on_claim_available,
+        True,
+    ),
+    ("video-playback-by-id", "stream-up"): (WebSocketsPool.on_stream_up, True),
+    ("video-playback-by-id", "stream-down"): (WebSocketsPool.on_stream_down, True),
+    ("video-playback-by-id", "viewcount"): (WebSocketsPool.on_viewcount, False),
+    ("raid", "raid_update_v2"): (WebSocketsPool.on_raid_update, True),
+    ("community-moments-channel-v1", "active"): (
+        WebSocketsPool.on_moment_active,
+        True,
+    ),
+    ("predictions-channel-v1", "event-created"): (
+        WebSocketsPool.on_prediction_created,
+        True,
+    ),
+    ("predictions-channel-v1", "event-updated"): (
+        WebSocketsPool.on_prediction_updated,
+        True,
+    ),
+    ("predictions-user-v1", "prediction-result"): (
+        WebSocketsPool.on_prediction_result,
+        True,
+    ),
+    ("predictions-user-v1", "prediction-made"): (
+        WebSocketsPool.on_prediction_made,
+        True,
+    ),
+    ("community-points-channel-v1", "community-goal-created"): (
+        WebSocketsPool.on_community_goal,
+        True,
+    ),
+    ("community-points-channel-v1", "community-goal-updated"): (
+        WebSocketsPool.on_community_goal,
+        True,
+    ),
+    ("community-points-channel-v1", "community-goal-deleted"): (
+        WebSocketsPool.on_community_goal,
+        True,
+    ),
+}
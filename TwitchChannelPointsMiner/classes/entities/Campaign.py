@@ -65,17 +65,15 @@ class Campaign(object):
             return False
 
     def sync_drops(self, drops, callback):
+        drops_by_id = {drop.id: drop for drop in self.drops}
         # Iterate all the drops from inventory
         for drop in drops:
-            # Iterate all the drops from out campaigns array
             # After id match update with:
             # [currentMinutesWatched, hasPreconditionsMet, dropInstanceID, isClaimed]
-            for i in range(len(self.drops)):
-                current_id = self.drops[i].id
-                if drop["id"] == current_id:
-                    self.drops[i].update(drop["self"])
-                    # If after update we all conditions are meet we can claim the drop
-                    if self.drops[i].is_claimable is True:
-                        claimed = callback(self.drops[i])
-                        self.drops[i].is_claimed = claimed
-                    break
+            current = drops_by_id.get(drop["id"])
+            if current is not None:
+                current.update(drop["self"])
+                # If after update we all conditions are meet we can claim the drop
+                # The callback sets is_claimed when the drop is claimed
+                if current.is_claimable is True:
+                    callback(current)
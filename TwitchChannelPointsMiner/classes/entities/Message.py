@@ -1,32 +1,65 @@
-import json
+import re
 
-from TwitchChannelPointsMiner.utils import server_time
+from TwitchChannelPointsMiner.utils import json_loads, server_time
+
+# The type is usually the first key of the payload, read it without decoding the whole message
+TYPE_PREFIX = re.compile(r'\s*\{\s*"type"\s*:\s*"([^"\\]*)"')
+# The other topics are suffixed by the channel_id
+USER_TOPICS = ["community-points-user-v1", "predictions-user-v1"]
 
 
 class Message(object):
     __slots__ = [
         "topic",
         "topic_user",
-        "message",
+        "raw_message",
         "type",
-        "data",
-        "timestamp",
-        "channel_id",
-        "identifier",
+        "__message",
+        "__timestamp",
+        "__channel_id",
     ]
 
+    # The payload is decoded only when needed, the ignored messages (and the viewcount of the
+    # online streamers) never pay for it
     def __init__(self, data):
         self.topic, self.topic_user = data["topic"].split(".")
+        self.raw_message = data["message"]
+        self.__message = None
+        self.__timestamp = None
+        self.__channel_id = None
+
+        match = TYPE_PREFIX.match(self.raw_message)
+        self.type = match.group(1) if match is not None else self.message["type"]
 
-        self.message = json.loads(data["message"])
-        self.type = self.message["type"]
+    @property
+    def message(self):
+        if self.__message is None:
+            self.__message = json_loads(self.raw_message)
+        return self.__message
 
-        self.data = self.message["data"] if "data" in self.message else None
+    @property
+    def data(self):
+        return self.message["data"] if "data" in self.message else None
 
-        self.timestamp = self.__get_timestamp()
-        self.channel_id = self.__get_channel_id()
+    @property
+    def timestamp(self):
+        if self.__timestamp is None:
+            self.__timestamp = self.__get_timestamp()
+        return self.__timestamp
+
+    @property
+    def channel_id(self):
+        if self.__channel_id is None:
+            self.__channel_id = (
+                self.__get_channel_id()
+                if self.topic in USER_TOPICS
+                else self.topic_user
+            )
+        return self.__channel_id
 
-        self.identifier = f"{self.type}.{self.topic}.{self.channel_id}"
+    @property
+    def identifier(self):
+        return f"{self.type}.{self.topic}.{self.channel_id}"
 
     def __repr__(self):
         return f"{self.message}"
@@ -20,7 +20,10 @@ class Stream(object):
         "campaigns_ids",
         "viewers_count",
         "spade_url",
-        "payload",
+        "__payload",
+        "__encoded_payload",
+        "playlist_url",
+        "playlist_expire_at",
         "watch_streak_missing",
         "minute_watched",
         "__last_update",
@@ -43,14 +46,31 @@ class Stream(object):
 
         self.spade_url = None
         self.payload = None
+        self.reset_playlist_url()
 
         self.init_watch_streak()
 
+    @property
+    def payload(self):
+        return self.__payload
+
+    @payload.setter
+    def payload(self, value):
+        self.__payload = value
+        self.__encoded_payload = None
+
+    # Encoded once and reused for every minute watched event, until the payload changes
     def encode_payload(self) -> dict:
-        json_event = json.dumps(self.payload, separators=(",", ":"))
-        return {"data": (b64encode(json_event.encode("utf-8"))).decode("utf-8")}
+        if self.__encoded_payload is None:
+            json_event = json.dumps(self.payload, separators=(",", ":"))
+            self.__encoded_payload = {
+                "data": (b64encode(json_event.encode("utf-8"))).decode("utf-8")
+            }
+        return self.__encoded_payload
 
     def update(self, broadcast_id, title, game, tags, viewers_count):
+        if broadcast_id != self.broadcast_id:
+            self.reset_playlist_url()
         self.broadcast_id = broadcast_id
         self.title = title.strip()
         self.game = game
@@ -94,6 +114,19 @@ class Stream(object):
     def update_elapsed(self):
         return 0 if self.__last_update == 0 else (time.time() - self.__last_update)
 
+    # The playlist URL is signed with the playback access token, valid for the whole broadcast
+    def set_playlist_url(self, playlist_url, expire_at):
+        self.playlist_url = playlist_url
+        # Don't use a token that is about to expire
+        self.playlist_expire_at = expire_at - 60
+
+    def reset_playlist_url(self):
+        self.playlist_url = None
+        self.playlist_expire_at = 0
+
+    def playlist_url_expired(self):
+        return self.playlist_url is None or time.time() >= self.playlist_expire_at
+
     def init_watch_streak(self):
         self.watch_streak_missing = True
         self.minute_watched = 0
@@ -124,36 +124,42 @@ class Streamer(object):
             else self.__repr__()
         )
 
+    # The side effects (chat, notifications) only when the status changes,
+    # the status of an offline streamer is checked again and again
     def set_offline(self):
         if self.is_online is True:
             self.offline_at = time.time()
             self.is_online = False
-
-        self.toggle_chat()
-
-        logger.info(
-            f"{self} is Offline!",
-            extra={
-                "emoji": ":sleeping:",
-                "event": Events.STREAMER_OFFLINE,
-            },
-        )
+            self.notify_status()
 
     def set_online(self):
         if self.is_online is False:
             self.online_at = time.time()
             self.is_online = True
             self.stream.init_watch_streak()
+            self.stream.reset_playlist_url()
+            self.notify_status()
 
+    # Apply the chat presence and log the current status
+    def notify_status(self):
         self.toggle_chat()
 
-        logger.info(
-            f"{self} is Online!",
-            extra={
-                "emoji": ":partying_face:",
-                "event": Events.STREAMER_ONLINE,
-            },
-        )
+        if self.is_online is True:
+            logger.info(
+                f"{self} is Online!",
+                extra={
+                    "emoji": ":partying_face:",
+                    "event": Events.STREAMER_ONLINE,
+                },
+            )
+        else:
+            logger.info(
+                f"{self} is Offline!",
+                extra={
+                    "emoji": ":sleeping:",
+                    "event": Events.STREAMER_OFFLINE,
+                },
+            )
 
     def print_history(self):
         return "; ".join(
@@ -236,7 +242,9 @@ class Streamer(object):
     def persistent_series(self, event_type="Watch"):
         self.__save_json("series", event_type=event_type)
 
-    def __save_json(self, key, data={}, event_type="Watch"):
+    def __save_json(self, key, data=None, event_type="Watch"):
+        # A new dict for every call, the action workers save concurrently
+        data = {} if data is None else data
         # https://stackoverflow.com/questions/4676195/why-do-i-need-to-multiply-unix-timestamps-by-1000-in-javascript
         now = datetime.now().replace(microsecond=0)
         data.update({"x": round(datetime.timestamp(now) * 1000)})
@@ -1,3 +1,7 @@
+import copy
+import json
+from enum import IntEnum
+
 # Twitch endpoints
 URL = "https://www.twitch.tv"               # Browser, Apps
 # URL = "https://m.twitch.tv"               # Mobile Browser
@@ -37,193 +41,226 @@ GITHUB_url = (
 )
 
 
+# Lower value = served first by the GQL rate limiter
+class GQLPriority(IntEnum):
+    CRITICAL = 0  # Time-critical actions (bets, bonus and moments claims)
+    NORMAL = 1
+    BULK = 2  # Polling (stream info, inventory, dashboard, channel points context)
+
+    def __str__(self):
+        return self.name
+
+
+class GQLRequest(object):
+    __slots__ = ["operation", "variables", "body"]
+
+    def __init__(self, operation, variables, body):
+        self.operation = operation
+        self.variables = variables
+        # Serialized JSON, ready to be sent (or joined with other requests in a batch)
+        self.body = body
+
+    def __repr__(self):
+        return self.body
+
+    @property
+    def operation_name(self):
+        return self.operation.name
+
+    @property
+    def priority(self):
+        return self.operation.priority
+
+    @property
+    def mutation(self):
+        return self.operation.mutation
+
+
+class GQLOperation(object):
+    __slots__ = [
+        "name",
+        "sha256_hash",
+        "variables",
+        "priority",
+        "mutation",
+        "static_json",
+        "default_body",
+    ]
+
+    # Immutable descriptor of a persisted query, safe to share between threads.
+    # The static part (operationName + extensions) is serialized once, a request
+    # is built by appending only the serialized variables.
+    # The default variables are copied, every request gets its own copy.
+    # A mutation changes something on Twitch (claim, bet, ...), identical ones are never merged.
+    def __init__(
+        self,
+        name,
+        sha256_hash,
+        variables=None,
+        priority=GQLPriority.NORMAL,
+        mutation=False,
+    ):
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "sha256_hash", sha256_hash)
+        object.__setattr__(self, "variables", copy.deepcopy(variables))
+        object.__setattr__(self, "priority", priority)
+        object.__setattr__(self, "mutation", mutation)
+        static_json = json.dumps(
+            {
+                "operationName": name,
+                "extensions": {
+                    "persistedQuery": {"version": 1, "sha256Hash": sha256_hash}
+                },
+            },
+            separators=(",", ":"),
+        )
+        # Without the closing brace
+        object.__setattr__(self, "static_json", static_json[:-1])
+        object.__setattr__(
+            self,
+            "default_body",
+            None if variables is None else self.__build_body(variables),
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __repr__(self):
+        return f"GQLOperation(name={self.name})"
+
+    def __build_body(self, variables):
+        if variables is None:
+            return self.static_json + "}"
+        return (
+            self.static_json
+            + ',"variables":'
+            + json.dumps(variables, separators=(",", ":"))
+            + "}"
+        )
+
+    def request(self, variables=None) -> GQLRequest:
+        if variables is None:
+            variables = copy.deepcopy(self.variables)
+            body = (
+                self.default_body
+                if self.default_body is not None
+                else self.__build_body(None)
+            )
+        else:
+            body = self.__build_body(variables)
+        return GQLRequest(self, variables, body)
+
+
 class GQLOperations:
     url = "https://gql.twitch.tv/gql"
     integrity_url = "https://gql.twitch.tv/integrity"
-    WithIsStreamLiveQuery = {
-        "operationName": "WithIsStreamLiveQuery",
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "04e46329a6786ff3a81c01c50bfa5d725902507a0deb83b0edbf7abe7a3716ea",
-            }
-        },
-    }
-    PlaybackAccessToken = {
-        "operationName": "PlaybackAccessToken",
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "3093517e37e4f4cb48906155bcd894150aef92617939236d2508f3375ab732ce",
-            }
-        },
-    }
-    VideoPlayerStreamInfoOverlayChannel = {
-        "operationName": "VideoPlayerStreamInfoOverlayChannel",
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "a5f2e34d626a9f4f5c0204f910bab2194948a9502089be558bb6e779a9e1b3d2",
-            }
-        },
-    }
-    ClaimCommunityPoints = {
-        "operationName": "ClaimCommunityPoints",
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "46aaeebe02c99afdf4fc97c7c0cba964124bf6b0af229395f1f6d1feed05b3d0",
-            }
-        },
-    }
-    CommunityMomentCallout_Claim = {
-        "operationName": "CommunityMomentCallout_Claim",
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "e2d67415aead910f7f9ceb45a77b750a1e1d9622c936d832328a0689e054db62",
-            }
-        },
-    }
-    DropsPage_ClaimDropRewards = {
-        "operationName": "DropsPage_ClaimDropRewards",
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "a455deea71bdc9015b78eb49f4acfbce8baa7ccbedd28e549bb025bd0f751930",
-            }
-        },
-    }
-    ChannelPointsContext = {
-        "operationName": "ChannelPointsContext",
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "1530a003a7d374b0380b79db0be0534f30ff46e61cffa2bc0e2468a909fbc024",
-            }
-        },
-    }
-    JoinRaid = {
-        "operationName": "JoinRaid",
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "c6a332a86d1087fbbb1a8623aa01bd1313d2386e7c63be60fdb2d1901f01a4ae",
-            }
-        },
-    }
-    ModViewChannelQuery = {
-        "operationName": "ModViewChannelQuery",
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "df5d55b6401389afb12d3017c9b2cf1237164220c8ef4ed754eae8188068a807",
-            }
-        },
-    }
-    Inventory = {
-        "operationName": "Inventory",
-        "variables": {"fetchRewardCampaigns": True},
-        # "variables": {},
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "37fea486d6179047c41d0f549088a4c3a7dd60c05c70956a1490262f532dccd9",
-            }
-        },
-    }
-    MakePrediction = {
-        "operationName": "MakePrediction",
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "b44682ecc88358817009f20e69d75081b1e58825bb40aa53d5dbadcc17c881d8",
-            }
-        },
-    }
-    ViewerDropsDashboard = {
-        "operationName": "ViewerDropsDashboard",
-        # "variables": {},
-        "variables": {"fetchRewardCampaigns": True},
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "8d5d9b5e3f088f9d1ff39eb2caab11f7a4cf7a3353da9ce82b5778226ff37268",
-            }
-        },
-    }
-    DropCampaignDetails = {
-        "operationName": "DropCampaignDetails",
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "f6396f5ffdde867a8f6f6da18286e4baf02e5b98d14689a69b5af320a4c7b7b8",
-            }
-        },
-    }
-    DropsHighlightService_AvailableDrops = {
-        "operationName": "DropsHighlightService_AvailableDrops",
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "9a62a09bce5b53e26e64a671e530bc599cb6aab1e5ba3cbd5d85966d3940716f",
-            }
-        },
-    }
-    ReportMenuItem = {  # Use for replace https://api.twitch.tv/helix/users?login={self.username}
-        "operationName": "ReportMenuItem",
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "8f3628981255345ca5e5453dfd844efffb01d6413a9931498836e6268692a30c",
-            }
-        },
-    }
-    PersonalSections = (
-        {
-            "operationName": "PersonalSections",
-            "variables": {
-                "input": {
-                    "sectionInputs": ["FOLLOWED_SECTION"],
-                    "recommendationContext": {"platform": "web"},
-                },
-                "channelLogin": None,
-                "withChannelUser": False,
-                "creatorAnniversariesExperimentEnabled": False,
-            },
-            "extensions": {
-                "persistedQuery": {
-                    "version": 1,
-                    "sha256Hash": "9fbdfb00156f754c26bde81eb47436dee146655c92682328457037da1a48ed39",
-                }
+    WithIsStreamLiveQuery = GQLOperation(
+        "WithIsStreamLiveQuery",
+        "04e46329a6786ff3a81c01c50bfa5d725902507a0deb83b0edbf7abe7a3716ea",
+        priority=GQLPriority.BULK,
+    )
+    PlaybackAccessToken = GQLOperation(
+        "PlaybackAccessToken",
+        "3093517e37e4f4cb48906155bcd894150aef92617939236d2508f3375ab732ce",
+    )
+    VideoPlayerStreamInfoOverlayChannel = GQLOperation(
+        "VideoPlayerStreamInfoOverlayChannel",
+        "a5f2e34d626a9f4f5c0204f910bab2194948a9502089be558bb6e779a9e1b3d2",
+        priority=GQLPriority.BULK,
+    )
+    ClaimCommunityPoints = GQLOperation(
+        "ClaimCommunityPoints",
+        "46aaeebe02c99afdf4fc97c7c0cba964124bf6b0af229395f1f6d1feed05b3d0",
+        priority=GQLPriority.CRITICAL,
+        mutation=True,
+    )
+    CommunityMomentCallout_Claim = GQLOperation(
+        "CommunityMomentCallout_Claim",
+        "e2d67415aead910f7f9ceb45a77b750a1e1d9622c936d832328a0689e054db62",
+        priority=GQLPriority.CRITICAL,
+        mutation=True,
+    )
+    DropsPage_ClaimDropRewards = GQLOperation(
+        "DropsPage_ClaimDropRewards",
+        "a455deea71bdc9015b78eb49f4acfbce8baa7ccbedd28e549bb025bd0f751930",
+        mutation=True,
+    )
+    ChannelPointsContext = GQLOperation(
+        "ChannelPointsContext",
+        "1530a003a7d374b0380b79db0be0534f30ff46e61cffa2bc0e2468a909fbc024",
+        priority=GQLPriority.BULK,
+    )
+    JoinRaid = GQLOperation(
+        "JoinRaid",
+        "c6a332a86d1087fbbb1a8623aa01bd1313d2386e7c63be60fdb2d1901f01a4ae",
+        mutation=True,
+    )
+    ModViewChannelQuery = GQLOperation(
+        "ModViewChannelQuery",
+        "df5d55b6401389afb12d3017c9b2cf1237164220c8ef4ed754eae8188068a807",
+        priority=GQLPriority.BULK,
+    )
+    Inventory = GQLOperation(
+        "Inventory",
+        "37fea486d6179047c41d0f549088a4c3a7dd60c05c70956a1490262f532dccd9",
+        variables={"fetchRewardCampaigns": True},
+        # variables={},
+        priority=GQLPriority.BULK,
+    )
+    MakePrediction = GQLOperation(
+        "MakePrediction",
+        "b44682ecc88358817009f20e69d75081b1e58825bb40aa53d5dbadcc17c881d8",
+        priority=GQLPriority.CRITICAL,
+        mutation=True,
+    )
+    ViewerDropsDashboard = GQLOperation(
+        "ViewerDropsDashboard",
+        "8d5d9b5e3f088f9d1ff39eb2caab11f7a4cf7a3353da9ce82b5778226ff37268",
+        # variables={},
+        variables={"fetchRewardCampaigns": True},
+        priority=GQLPriority.BULK,
+    )
+    DropCampaignDetails = GQLOperation(
+        "DropCampaignDetails",
+        "f6396f5ffdde867a8f6f6da18286e4baf02e5b98d14689a69b5af320a4c7b7b8",
+        priority=GQLPriority.BULK,
+    )
+    DropsHighlightService_AvailableDrops = GQLOperation(
+        "DropsHighlightService_AvailableDrops",
+        "9a62a09bce5b53e26e64a671e530bc599cb6aab1e5ba3cbd5d85966d3940716f",
+        priority=GQLPriority.BULK,
+    )
+    ReportMenuItem = GQLOperation(  # Use for replace https://api.twitch.tv/helix/users?login={self.username}
+        "ReportMenuItem",
+        "8f3628981255345ca5e5453dfd844efffb01d6413a9931498836e6268692a30c",
+        priority=GQLPriority.BULK,
+    )
+    PersonalSections = GQLOperation(
+        "PersonalSections",
+        "9fbdfb00156f754c26bde81eb47436dee146655c92682328457037da1a48ed39",
+        variables={
+            "input": {
+                "sectionInputs": ["FOLLOWED_SECTION"],
+                "recommendationContext": {"platform": "web"},
             },
+            "channelLogin": None,
+            "withChannelUser": False,
+            "creatorAnniversariesExperimentEnabled": False,
         },
+        priority=GQLPriority.BULK,
+    )
+    ChannelFollows = GQLOperation(
+        "ChannelFollows",
+        "eecf815273d3d949e5cf0085cc5084cd8a1b5b7b6f7990cf43cb0beadf546907",
+        variables={"limit": 100, "order": "ASC"},
+        priority=GQLPriority.BULK,
+    )
+    UserPointsContribution = GQLOperation(
+        "UserPointsContribution",
+        "23ff2c2d60708379131178742327ead913b93b1bd6f665517a6d9085b73f661f",
+    )
+    ContributeCommunityPointsCommunityGoal = GQLOperation(
+        "ContributeCommunityPointsCommunityGoal",
+        "5774f0ea5d89587d73021a2e03c3c44777d903840c608754a1be519f51e37bb6",
+        mutation=True,
     )
-    ChannelFollows = {
-        "operationName": "ChannelFollows",
-        "variables": {"limit": 100, "order": "ASC"},
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "eecf815273d3d949e5cf0085cc5084cd8a1b5b7b6f7990cf43cb0beadf546907",
-            }
-        },
-    }
-    UserPointsContribution = {
-        "operationName": "UserPointsContribution",
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "23ff2c2d60708379131178742327ead913b93b1bd6f665517a6d9085b73f661f"
-            }
-        }
-    }
-    ContributeCommunityPointsCommunityGoal = {
-        "operationName": "ContributeCommunityPointsCommunityGoal",
-        "extensions": {
-            "persistedQuery": {
-                "version": 1,
-                "sha256Hash": "5774f0ea5d89587d73021a2e03c3c44777d903840c608754a1be519f51e37bb6"
-            }
-        }
-    }
@@ -1,42 +1,79 @@
+import codecs
+import json
 import platform
 import re
-import socket
 import time
 from copy import deepcopy
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from os import path
 from random import randrange
 
 import requests
+from dateutil import parser
 from millify import millify
 
 from TwitchChannelPointsMiner.constants import USER_AGENTS, GITHUB_url
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def _millify(input, precision=2):
-    return millify(input, precision)
+# Optional faster JSON decoder (pip install orjson)
+json_loads = orjson.loads if orjson is not None else json.loads
 
+ISO_DATETIME = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?(Z|[+-]\d{2}:?\d{2})?$"
+)
 
-def get_streamer_index(streamers: list, channel_id) -> int:
-    try:
-        return next(
-            i for i, x in enumerate(streamers) if str(x.channel_id) == str(channel_id)
-        )
-    except StopIteration:
-        return -1
+
+def _millify(input, precision=2):
+    return millify(input, precision)
 
 
 def float_round(number, ndigits=2):
     return round(float(number), ndigits)
 
 
+# Same format of the Twitch timestamps (e.g. 2021-04-12T18:12:31.460786Z)
 def server_time(message_data):
-    return (
-        datetime.fromtimestamp(
-            message_data["server_time"], timezone.utc).isoformat()
-        + "Z"
+    timestamp = (
+        message_data["server_time"]
         if message_data is not None and "server_time" in message_data
-        else datetime.fromtimestamp(time.time(), timezone.utc).isoformat() + "Z"
+        else time.time()
+    )
+    return (
+        datetime.fromtimestamp(timestamp, timezone.utc)
+        .isoformat()
+        .replace("+00:00", "Z")
+    )
+
+
+# Parse the ISO 8601 timestamps of Twitch (e.g. 2021-04-12T18:12:31.460786473Z) without dateutil.
+# The fractional part is truncated to microseconds, other formats fall back to dateutil.
+def parse_iso_datetime(value):
+    match = ISO_DATETIME.match(value)
+    if match is None:
+        return parser.parse(value)
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+    tzinfo = None
+    if offset == "Z":
+        tzinfo = timezone.utc
+    elif offset is not None:
+        sign = -1 if offset[0] == "-" else 1
+        offset = offset[1:].replace(":", "")
+        tzinfo = timezone(
+            sign * timedelta(hours=int(offset[:2]), minutes=int(offset[2:]))
+        )
+    return datetime(
+        int(year),
+        int(month),
+        int(day),
+        int(hour),
+        int(minute),
+        int(second),
+        int((fraction or "0")[:6].ljust(6, "0")),
+        tzinfo=tzinfo,
     )
 
 
@@ -147,13 +184,63 @@ def set_default_settings(settings, defaults):
     return 0 if char == "A" else 1'''
 
 
-def internet_connection_available(host="8.8.8.8", port=53, timeout=3):
+def gql_error_messages(response):
+    # GQL answers with a dict for a single operation and with a list for a batch
+    messages = []
+    for item in response if isinstance(response, list) else [response]:
+        if isinstance(item, dict):
+            messages.append(str(item.get("message") or item.get("error") or ""))
+            messages += [
+                str(error.get("message", ""))
+                for error in item.get("errors") or []
+                if isinstance(error, dict)
+            ]
+    return messages
+
+
+def search_stream(response, pattern, chunk_size=16384, overlap=4096):
+    # Search a regex in a streamed response (stream=True), stop downloading as soon as it matches.
+    # Only the last `overlap` characters are kept between the chunks.
+    try:
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(
+            errors="replace"
+        )
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer = ""
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            buffer += decoder.decode(chunk)
+            matcher = pattern.search(buffer)
+            if matcher is not None:
+                return matcher
+            buffer = buffer[-overlap:]
+        return pattern.search(buffer + decoder.decode(b"", final=True))
+    finally:
+        response.close()
+
+
+def last_url_line(response):
+    # Read a streamed m3u8 playlist line by line, keep only the last URI (not a #tag)
+    last_line = None
+    try:
+        for line in response.iter_lines(decode_unicode=True):
+            if isinstance(line, bytes):
+                line = line.decode("utf-8", errors="replace")
+            line = line.strip()
+            if line != "" and not line.startswith("#"):
+                last_line = line
+    finally:
+        response.close()
+    return last_line
+
+
+def playback_token_expires(value, default_ttl=300):
+    # The value of a PlaybackAccessToken is a JSON with its own expiration (unix timestamp)
     try:
-        socket.setdefaulttimeout(timeout)
-        socket.socket(socket.AF_INET, socket.SOCK_STREAM).connect((host, port))
-        return True
-    except socket.error:
-        return False
+        return float(json.loads(value)["expires"])
+    except (ValueError, KeyError, TypeError):
+        return time.time() + default_ttl
 
 
 def percentage(a, b):
@@ -14,6 +14,7 @@ from TwitchChannelPointsMiner.classes.Gotify import Gotify
 from TwitchChannelPointsMiner.classes.Settings import Priority, Events, FollowersOrder
 from TwitchChannelPointsMiner.classes.entities.Bet import Strategy, BetSettings, Condition, OutcomeKeys, FilterCondition, DelayMode
 from TwitchChannelPointsMiner.classes.entities.Streamer import Streamer, StreamerSettings
+from TwitchChannelPointsMiner.classes.HttpPool import HttpSettings
 
 twitch_miner = TwitchChannelPointsMiner(
     username="your-twitch-username",
@@ -104,6 +105,20 @@ twitch_miner = TwitchChannelPointsMiner(
                 value=800
             )
         )
+    ),
+    http_settings=HttpSettings(
+        pool_size=10,                           # Keep-alive connections for each Twitch host. Increase it if you mine a lot of streamers
+        connect_timeout=5,                      # Seconds to wait for the connection
+        read_timeout=20,                        # Seconds to wait for the response
+        warm_up=True,                           # Open the connections in background at startup
+        client_version_ttl=3600,                # Seconds before the Twitch client version is fetched again
+        gql_batch_window=0.05,                  # Seconds to wait for other GQL operations before sending them together
+        gql_batch_size=20,                      # Max number of GQL operations in a single request (1 = no batching)
+        gql_rate_limit=20,                      # Max GQL operations per second (reduced automatically if Twitch throttles us)
+        gql_burst=40,                           # Max GQL operations sent at once before the rate limit applies
+        http2=False,                            # Multiplex GQL requests over HTTP/2 (requires pip install httpx[http2])
+        breaker_failures=5,                     # Consecutive errors before the requests to a host are suspended
+        breaker_timeout=30                      # Seconds before retrying a failing host (doubled after every failed retry)
     )
 )
 
@@ -37,6 +37,7 @@ setuptools.setup(
         "flask",
         "irc",
         "pandas",
+        "numpy",
         "pytz"
     ],
     long_description=read("README.md"),
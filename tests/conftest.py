@@ -0,0 +1,15 @@
+import time
+
+import pytest
+
+
+@pytest.fixture
+def wait_until():
+    # Poll condition() until it is True (or timeout seconds), return its last value
+    def wait(condition, timeout=2):
+        deadline = time.time() + timeout
+        while condition() is False and time.time() < deadline:
+            time.sleep(0.01)
+        return condition()
+
+    return wait
@@ -0,0 +1,62 @@
+from threading import Event
+
+from TwitchChannelPointsMiner.classes.ActionQueue import ActionPriority, ActionQueue
+
+
+def test_same_key_is_coalesced():
+    queue = ActionQueue(workers=0)
+    queue.submit(print, "a", key=("claim", 1))
+    queue.submit(print, "a", key=("claim", 1))
+    queue.submit(print, "b", key=("claim", 2))
+    assert len(queue) == 2
+    assert queue.stats()["coalesced"] == 1
+
+
+def test_full_queue_drops_the_least_important():
+    queue = ActionQueue(workers=0, max_size=2)
+    queue.submit(print, "background", priority=ActionPriority.BACKGROUND)
+    queue.submit(print, "normal")
+    # Replaces the background action
+    queue.submit(print, "urgent", priority=ActionPriority.URGENT)
+    # Less important than everything waiting, dropped
+    queue.submit(print, "background", priority=ActionPriority.BACKGROUND)
+    assert sorted(action[0] for action in queue.heap) == [
+        ActionPriority.URGENT,
+        ActionPriority.NORMAL,
+    ]
+    assert queue.stats()["dropped"] == 2
+
+
+def test_urgent_actions_are_executed_first(wait_until):
+    executed = []
+    started = Event()
+    release = Event()
+
+    def block():
+        started.set()
+        release.wait(2)
+
+    queue = ActionQueue(workers=1)
+    queue.submit(block)
+    assert started.wait(2)
+    # Queued while the worker is busy
+    queue.submit(executed.append, "background", priority=ActionPriority.BACKGROUND)
+    queue.submit(executed.append, "normal")
+    queue.submit(executed.append, "urgent", priority=ActionPriority.URGENT)
+    release.set()
+
+    assert wait_until(lambda: len(executed) == 3)
+    assert executed == ["urgent", "normal", "background"]
+    assert queue.stats()["executed"] == 4
+
+
+def test_failed_action_doesnt_stop_the_worker(wait_until):
+    executed = []
+
+    def fail():
+        raise ValueError("failed")
+
+    queue = ActionQueue(workers=1)
+    queue.submit(fail)
+    queue.submit(executed.append, "next")
+    assert wait_until(lambda: executed == ["next"])
@@ -0,0 +1,35 @@
+import pytest
+import requests
+
+from TwitchChannelPointsMiner.classes.AsyncHttp import AsyncHttp
+
+httpx = pytest.importorskip("httpx")
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (httpx.ConnectTimeout("timeout"), requests.exceptions.ConnectTimeout),
+        (httpx.ReadTimeout("timeout"), requests.exceptions.Timeout),
+        (httpx.ConnectError("refused"), requests.exceptions.ConnectionError),
+        (httpx.RemoteProtocolError("protocol"), requests.exceptions.RequestException),
+    ],
+)
+def test_httpx_errors_are_mapped(error, expected):
+    def transport(request):
+        raise error
+
+    http = AsyncHttp("agent")
+    http.client = httpx.AsyncClient(transport=httpx.MockTransport(transport))
+    try:
+        with pytest.raises(expected) as raised:
+            http.request("GET", "https://gql.twitch.tv/gql")
+        if expected is requests.exceptions.Timeout:
+            assert not isinstance(raised.value, requests.exceptions.ConnectionError)
+        if expected is requests.exceptions.RequestException:
+            assert not isinstance(
+                raised.value,
+                (requests.exceptions.ConnectionError, requests.exceptions.Timeout),
+            )
+    finally:
+        http.close()
@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+from TwitchChannelPointsMiner.classes import WebSocketsPool as websockets_pool
+from TwitchChannelPointsMiner.classes.BalanceTracker import (
+    MISSING_WATCH_GAIN,
+    BalanceTracker,
+)
+from TwitchChannelPointsMiner.classes.WebSocketsPool import WebSocketsPool
+
+
+def make_streamer(channel_id, channel_points=100):
+    return SimpleNamespace(channel_id=channel_id, channel_points=channel_points)
+
+
+def test_matching_balance_doesnt_drift():
+    tracker = BalanceTracker()
+    streamer = make_streamer("1")
+    tracker.update(streamer, 110, earned=10)
+    # points-spent doesn't carry the amount
+    tracker.update(streamer, 50)
+    assert streamer.channel_points == 50
+    assert tracker.pop_drifted([streamer]) == []
+    assert tracker.stats() == {"channels": 1, "messages": 2, "drifted": 0}
+
+
+def test_balance_mismatch_drifts():
+    tracker = BalanceTracker()
+    streamer = make_streamer("1")
+    tracker.update(streamer, 200, earned=10)
+    assert streamer.channel_points == 200
+    assert tracker.pop_drifted([streamer]) == [streamer]
+    # Forgotten once returned
+    assert tracker.pop_drifted([streamer]) == []
+
+
+def test_missing_watch_gain_drifts():
+    tracker = BalanceTracker()
+    streamer = make_streamer("1")
+    tracker.watched(streamer)
+    assert tracker.pop_drifted([streamer]) == []
+    tracker.watched_since["1"] -= MISSING_WATCH_GAIN + 1
+    tracker.watched(streamer)
+    assert tracker.pop_drifted([streamer]) == [streamer]
+
+
+def test_reconnection_drifts_until_synced():
+    tracker = BalanceTracker()
+    first, second, other = make_streamer("1"), make_streamer("2"), make_streamer("3")
+    tracker.reconnected([first, second])
+    tracker.synced(second)
+    assert tracker.pop_drifted([first, second, other]) == [first]
+
+
+def test_pubsub_reconnection_refreshes_the_balances(monkeypatch):
+    # Don't wait for the server
+    monkeypatch.setattr(
+        websockets_pool, "time", SimpleNamespace(sleep=lambda seconds: None)
+    )
+    monkeypatch.setattr(
+        websockets_pool, "internet_connection_available", lambda: True, raising=False
+    )
+    tracker = BalanceTracker()
+    streamers = [make_streamer("1"), make_streamer("2")]
+    pool = SimpleNamespace(
+        ws=[None],
+        _WebSocketsPool__new=lambda index: "new",
+        _WebSocketsPool__start=lambda index: None,
+        _WebSocketsPool__submit=lambda index, topic: None,
+    )
+    ws = SimpleNamespace(
+        index=0,
+        is_reconnecting=False,
+        forced_close=False,
+        parent_pool=pool,
+        streamers=streamers,
+        topics=[SimpleNamespace(topic="community-points-user-v1")],
+        twitch=SimpleNamespace(
+            balance_tracker=tracker,
+            http=SimpleNamespace(
+                connectivity=SimpleNamespace(wait_online=lambda: True)
+            ),
+        ),
+    )
+    WebSocketsPool.handle_reconnection(ws)
+    assert pool.ws == ["new"]
+    assert tracker.pop_drifted(streamers) == streamers
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from TwitchChannelPointsMiner.classes.DiskCache import DiskCache
+from TwitchChannelPointsMiner.classes.Twitch import Twitch
+
+FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+END_AT = (datetime.utcnow() + timedelta(days=1)).strftime(FORMAT)
+ENDED_AT = (datetime.utcnow() - timedelta(days=1)).strftime(FORMAT)
+
+
+def make_twitch(tmp_path):
+    requested = []
+
+    def post_gql_request(json_data):
+        requested.extend(request.variables["dropID"] for request in json_data)
+        return [
+            {
+                "data": {
+                    "user": {
+                        "dropCampaign": {
+                            "id": request.variables["dropID"],
+                            "endAt": END_AT,
+                            "status": "ACTIVE",
+                        }
+                    }
+                }
+            }
+            for request in json_data
+        ]
+
+    return SimpleNamespace(
+        campaigns_details=DiskCache(str(tmp_path / "campaigns.json"), ttl=3600),
+        twitch_login=SimpleNamespace(get_user_id=lambda: "1"),
+        post_gql_request=post_gql_request,
+        requested=requested,
+    )
+
+
+def get_details(twitch, campaigns):
+    return Twitch._Twitch__get_campaigns_details(twitch, campaigns)
+
+
+def test_only_the_missing_details_are_requested(tmp_path):
+    twitch = make_twitch(tmp_path)
+    campaigns = [{"id": "a", "endAt": END_AT, "status": "ACTIVE"}]
+    assert [details["id"] for details in get_details(twitch, campaigns)] == ["a"]
+
+    campaigns.append({"id": "b", "endAt": END_AT, "status": "ACTIVE"})
+    assert [details["id"] for details in get_details(twitch, campaigns)] == ["a", "b"]
+    assert twitch.requested == ["a", "b"]
+
+
+def test_cached_details_keep_the_dashboard_status(tmp_path):
+    twitch = make_twitch(tmp_path)
+    get_details(twitch, [{"id": "a", "endAt": END_AT, "status": "ACTIVE"}])
+    details = get_details(twitch, [{"id": "a", "endAt": END_AT, "status": "EXPIRED"}])
+    assert details[0]["status"] == "EXPIRED"
+    assert twitch.requested == ["a"]
+
+
+def test_changed_or_expired_details_are_requested_again(tmp_path):
+    twitch = make_twitch(tmp_path)
+    get_details(twitch, [{"id": "a", "endAt": END_AT, "status": "ACTIVE"}])
+    # The end date changed
+    get_details(
+        twitch, [{"id": "a", "endAt": "2000-01-01T00:00:00Z", "status": "ACTIVE"}]
+    )
+    # Older than the TTL
+    twitch.campaigns_details.entries["a"]["updated_at"] -= 3601
+    get_details(twitch, [{"id": "a", "endAt": END_AT, "status": "ACTIVE"}])
+    assert twitch.requested == ["a", "a", "a"]
+
+
+def test_ended_campaigns_are_evicted(tmp_path):
+    twitch = make_twitch(tmp_path)
+    twitch.campaigns_details.set("ended", {"id": "ended", "endAt": ENDED_AT})
+    get_details(twitch, [{"id": "a", "endAt": END_AT, "status": "ACTIVE"}])
+    assert list(twitch.campaigns_details.entries) == ["a"]
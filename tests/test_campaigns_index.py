@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from TwitchChannelPointsMiner.classes.CampaignsIndex import CampaignsIndex
+from TwitchChannelPointsMiner.classes.entities.Campaign import Campaign
+
+FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+START_AT = (datetime.now() - timedelta(days=1)).strftime(FORMAT)
+END_AT = (datetime.now() + timedelta(days=1)).strftime(FORMAT)
+
+
+def make_campaign(campaign_id, game_id, drop_ids):
+    return Campaign(
+        {
+            "id": campaign_id,
+            "game": {"id": game_id, "displayName": game_id},
+            "name": campaign_id,
+            "status": "ACTIVE",
+            "allow": {"channels": None},
+            "startAt": START_AT,
+            "endAt": END_AT,
+            "timeBasedDrops": [
+                {
+                    "id": drop_id,
+                    "name": drop_id,
+                    "benefitEdges": [{"benefit": {"name": drop_id}}],
+                    "requiredMinutesWatched": 60,
+                    "startAt": START_AT,
+                    "endAt": END_AT,
+                }
+                for drop_id in drop_ids
+            ],
+        }
+    )
+
+
+def make_progress(campaign_id, drops):
+    return {
+        "id": campaign_id,
+        "timeBasedDrops": [
+            {
+                "id": drop_id,
+                "self": {
+                    "currentMinutesWatched": minutes,
+                    "isClaimed": False,
+                    "dropInstanceID": "instance" if minutes >= 60 else None,
+                    "hasPreconditionsMet": True,
+                },
+            }
+            for drop_id, minutes in drops
+        ],
+    }
+
+
+def test_update_indexes_by_game():
+    index = CampaignsIndex()
+    index.update(
+        [
+            make_campaign("a", "game1", ["d1"]),
+            make_campaign("b", "game1", ["d2"]),
+            make_campaign("c", "game2", ["d3"]),
+        ]
+    )
+    assert len(index) == 3
+    assert [campaign.id for campaign in index.games["game1"]] == ["a", "b"]
+
+    stream = SimpleNamespace(game_id=lambda: "game1", campaigns_ids=["b", "c"])
+    assert [campaign.id for campaign in index.for_stream(stream)] == ["b"]
+
+
+def test_sync_skips_the_unchanged_campaigns():
+    index = CampaignsIndex()
+    index.update([make_campaign("a", "game", ["d1"])])
+    inventory = [make_progress("a", [("d1", 10)]), make_progress("unknown", [])]
+
+    changed = index.sync(inventory, lambda drop: None)
+    assert [campaign.id for campaign in changed] == ["a"]
+    assert index.campaigns["a"].in_inventory is True
+    assert index.campaigns["a"].drops[0].current_minutes_watched == 10
+
+    assert index.sync(inventory, lambda drop: None) == []
+    assert index.sync([make_progress("a", [("d1", 11)])], lambda drop: None) != []
+
+
+def test_sync_submits_the_claimable_drops():
+    index = CampaignsIndex()
+    index.update([make_campaign("a", "game", ["d1", "d2"])])
+    claimed = []
+
+    def claim(drop):
+        claimed.append(drop.id)
+        drop.is_claimed = True
+
+    index.sync([make_progress("a", [("d1", 60), ("d2", 30)])], claim)
+    assert claimed == ["d1"]
+    # The claimed drop is removed
+    assert [drop.id for drop in index.campaigns["a"].drops] == ["d2"]
+
+
+def test_update_keeps_the_known_drops():
+    index = CampaignsIndex()
+    index.update([make_campaign("a", "game", ["d1"])])
+    inventory = [make_progress("a", [("d1", 10)])]
+    index.sync(inventory, lambda drop: None)
+    known = index.campaigns["a"].drops[0]
+
+    # A new drop started in the same campaign
+    index.update([make_campaign("a", "game", ["d1", "d2"])])
+    campaign = index.campaigns["a"]
+    assert campaign.drops[0] is known
+    assert [drop.id for drop in campaign.drops] == ["d1", "d2"]
+    assert campaign.in_inventory is True
+    # The inventory is applied again after an update
+    assert index.sync(inventory, lambda drop: None) == [campaign]
@@ -0,0 +1,61 @@
+import time
+
+from TwitchChannelPointsMiner.classes.CircuitBreaker import CircuitBreaker, CircuitState
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.on_failure()
+    assert breaker.allow() is True
+    breaker.on_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.is_open() is True
+    assert breaker.allow() is False
+    assert breaker.stats()["total_rejected"] == 1
+
+
+def test_success_resets_the_failures():
+    breaker = CircuitBreaker("test", failure_threshold=2)
+    breaker.on_failure()
+    breaker.on_success()
+    breaker.on_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_allows_a_single_probe():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=30)
+    breaker.on_failure()
+    breaker.open_until = time.time() - 1
+    assert breaker.is_open() is False
+    assert breaker.allow() is True
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow() is False
+
+    breaker.on_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow() is True
+
+
+def test_failed_probe_doubles_the_timeout():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10)
+    breaker.on_failure()
+    first = breaker.open_until - time.time()
+    breaker.open_until = time.time() - 1
+    assert breaker.allow() is True
+
+    breaker.on_failure()
+    second = breaker.open_until - time.time()
+    assert breaker.state == CircuitState.OPEN
+    # Jittered by +-20%
+    assert 8 <= first <= 12.1
+    assert 16 <= second <= 24.1
+
+
+def test_timeout_is_capped():
+    breaker = CircuitBreaker(
+        "test", failure_threshold=1, reset_timeout=10, max_timeout=15
+    )
+    for _ in range(5):
+        breaker.on_failure()
+    assert breaker.open_until - time.time() <= 15 * 1.2 + 0.1
@@ -0,0 +1,98 @@
+import time
+from types import SimpleNamespace
+
+import requests
+
+from TwitchChannelPointsMiner.classes import ClientVersion as client_version_module
+from TwitchChannelPointsMiner.classes.ClientVersion import ClientVersion
+
+BUILD_ID = "01234567-89ab-cdef-0123-456789abcdef"
+PAGE = f'<html><head><script>window.__twilightBuildID = "{BUILD_ID}";</script>'
+
+
+def make_response(status_code=200, text=PAGE):
+    return SimpleNamespace(
+        status_code=status_code,
+        encoding="utf-8",
+        iter_content=lambda chunk_size: iter([text.encode()]),
+        close=lambda: None,
+    )
+
+
+class FakeHttp(object):
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = 0
+
+    def get(self, url, stream=False):
+        self.requests += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def test_refresh_and_ttl(monkeypatch):
+    now = [1000]
+    monkeypatch.setattr(
+        client_version_module, "time", SimpleNamespace(time=lambda: now[0])
+    )
+    http = FakeHttp(make_response())
+    client_version = ClientVersion(http, ttl=3600, version="old")
+    assert client_version.refresh() == BUILD_ID
+    assert client_version.expire_at == 1000 + 3600
+    # Cached until it expires
+    assert client_version.get() == BUILD_ID
+    assert http.requests == 1
+
+
+def test_get_refreshes_in_background(wait_until):
+    http = FakeHttp(make_response())
+    client_version = ClientVersion(http, version="old")
+    # Never blocks, the current version is returned
+    assert client_version.get() in ["old", BUILD_ID]
+    assert wait_until(lambda: client_version.version == BUILD_ID) is True
+    assert wait_until(lambda: client_version.refreshing is False) is True
+    assert client_version.get() == BUILD_ID
+    assert http.requests == 1
+
+
+def test_refresh_failure_keeps_the_version():
+    http = FakeHttp(
+        make_response(status_code=500),
+        make_response(text="<html></html>"),
+        requests.exceptions.ConnectionError("offline"),
+    )
+    client_version = ClientVersion(http, ttl=3600, version="old")
+    for _ in range(3):
+        started = time.time()
+        assert client_version.refresh() == "old"
+        # Retried sooner than the ttl
+        assert client_version.expire_at <= started + 60 + 1
+        assert client_version.refreshing is False
+    assert http.requests == 3
+
+
+def test_invalidate_on_mismatch(wait_until):
+    http = FakeHttp(make_response(), make_response())
+    client_version = ClientVersion(http, ttl=3600, version="old")
+    client_version.refresh()
+    assert client_version.get() == BUILD_ID
+
+    response = {"errors": [{"message": "Invalid Client-Version"}]}
+    assert ClientVersion.is_mismatch(response) is True
+    client_version.invalidate()
+    assert wait_until(lambda: http.requests == 2) is True
+    assert wait_until(lambda: client_version.refreshing is False) is True
+
+
+def test_is_mismatch():
+    assert ClientVersion.is_mismatch({"data": {}}) is False
+    assert ClientVersion.is_mismatch({"error": "client_version is outdated"}) is True
+    assert (
+        ClientVersion.is_mismatch(
+            [{"data": {}}, {"errors": [{"message": "Bad client version"}]}]
+        )
+        is True
+    )
+    assert ClientVersion.is_mismatch([{"errors": [{"message": "timeout"}]}]) is False
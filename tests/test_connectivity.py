@@ -0,0 +1,56 @@
+import pytest
+
+from TwitchChannelPointsMiner.classes.Connectivity import Connectivity
+
+
+@pytest.fixture
+def probe(monkeypatch):
+    # The result of the next probes, instead of opening a real connection
+    results = {"online": True, "count": 0}
+
+    def fake_probe(self):
+        results["count"] += 1
+        return results["online"]
+
+    monkeypatch.setattr(Connectivity, "_Connectivity__probe", fake_probe)
+    return results
+
+
+def test_first_probe_sets_the_state(probe):
+    connectivity = Connectivity(interval=60)
+    assert connectivity.wait_online(2) is True
+    assert connectivity.stats()["online"] is True
+    assert probe["count"] == 1
+
+
+def test_offline_until_a_request_succeeds(probe):
+    probe["online"] = False
+    connectivity = Connectivity(offline_interval=60)
+    assert connectivity.wait_online(0.2) is False
+    assert connectivity.online is False
+
+    connectivity.success()
+    assert connectivity.wait_online(0) is True
+    # No probe needed
+    assert probe["count"] == 1
+
+
+def test_failure_is_suspect_until_the_probe(probe):
+    connectivity = Connectivity(interval=60)
+    assert connectivity.wait_online(2) is True
+    connectivity.last_probe_at -= 5
+
+    connectivity.failure()
+    assert connectivity.is_online() is False
+    # The suspect state asks for a probe right away (at most one every 5 seconds)
+    assert connectivity.wait_online(2) is True
+    assert probe["count"] == 2
+
+
+def test_offline_probed_every_offline_interval(probe):
+    probe["online"] = False
+    connectivity = Connectivity(interval=60, offline_interval=0.1)
+    assert connectivity.wait_online(0.05) is False
+    probe["online"] = True
+    assert connectivity.wait_online(2) is True
+    assert probe["count"] >= 2
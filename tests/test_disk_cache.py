@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from TwitchChannelPointsMiner.classes.DiskCache import DiskCache
+
+
+def test_positive_entry_expires_but_is_returned(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.json"), ttl=60)
+    cache.set("streamer", "123")
+    assert cache.get("streamer") == ("123", False)
+
+    cache.entries["streamer"]["updated_at"] -= 61
+    assert cache.get("streamer") == ("123", True)
+    assert "streamer" in cache
+
+
+def test_negative_entry_is_forgotten(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.json"), negative_ttl=60)
+    cache.set("missing", None)
+    assert cache.get("missing") == (None, False)
+
+    cache.entries["missing"]["updated_at"] -= 61
+    with pytest.raises(KeyError):
+        cache.get("missing")
+    assert "missing" not in cache
+    assert "unknown" not in cache
+
+
+def test_evict_only_the_positive_entries(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.json"))
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.set("c", None)
+    assert cache.evict(lambda value: True) == 2
+    assert list(cache.entries) == ["c"]
+
+
+def test_saved_and_loaded(tmp_path):
+    fname = str(tmp_path / "sub" / "cache.json")
+    cache = DiskCache(fname)
+    cache.set("streamer", "123")
+    cache.save()
+    assert cache.save_timer is None
+
+    loaded = DiskCache(fname)
+    assert loaded.get("streamer") == ("123", False)
+
+
+def test_save_is_scheduled_once(tmp_path):
+    fname = tmp_path / "cache.json"
+    cache = DiskCache(str(fname))
+    cache.set("a", "1")
+    timer = cache.save_timer
+    cache.set("b", "2")
+    assert cache.save_timer is timer
+    timer.join(3)
+    assert sorted(json.loads(fname.read_text())) == ["a", "b"]
+
+
+def test_corrupted_file_is_ignored(tmp_path):
+    fname = tmp_path / "cache.json"
+    fname.write_text("{not json")
+    cache = DiskCache(str(fname))
+    assert len(cache) == 0
+    cache.set("a", "1")
+    assert cache.get("a")[0] == "1"
@@ -0,0 +1,58 @@
+import time
+from types import SimpleNamespace
+
+from TwitchChannelPointsMiner.classes.DropClaimer import DropClaimer
+
+
+def make_drop(instance_id):
+    return SimpleNamespace(drop_instance_id=instance_id, is_claimed=False)
+
+
+def test_pending_drops_are_claimed_together(wait_until):
+    batches = []
+
+    def claim(drops):
+        batches.append([drop.drop_instance_id for drop in drops])
+        return [True] * len(drops)
+
+    claimer = DropClaimer(claim, pause=(0, 0))
+    drops = [make_drop("a"), make_drop("b")]
+    # Submitted before the worker starts the first batch
+    with claimer.condition:
+        for drop in drops:
+            claimer.submit(drop)
+        # Already pending
+        claimer.submit(make_drop("a"))
+    assert wait_until(lambda: len(claimer) == 0)
+    assert batches == [["a", "b"]]
+    assert all(drop.is_claimed for drop in drops)
+
+
+def test_failed_claim_is_retried_with_backoff(wait_until):
+    attempts = []
+
+    def claim(drops):
+        attempts.append(time.time())
+        return [len(attempts) == 3]
+
+    claimer = DropClaimer(claim, pause=(0, 0), retry_delay=0.05)
+    drop = make_drop("a")
+    claimer.submit(drop)
+    assert wait_until(lambda: drop.is_claimed is True)
+    assert len(attempts) == 3
+    assert attempts[2] - attempts[1] > attempts[1] - attempts[0]
+    assert len(claimer) == 0
+
+
+def test_claim_is_abandoned_after_max_attempts(wait_until):
+    attempts = []
+
+    def claim(drops):
+        attempts.append(drops)
+        raise ValueError("failed")
+
+    claimer = DropClaimer(claim, pause=(0, 0), max_attempts=2, retry_delay=0.01)
+    claimer.submit(make_drop("a"))
+    assert wait_until(lambda: len(claimer) == 0)
+    time.sleep(0.1)
+    assert len(attempts) == 2
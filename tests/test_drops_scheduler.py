@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from TwitchChannelPointsMiner.classes.DropsScheduler import DropsScheduler
+
+
+def make_drop(drop_id, minutes_left, ends_in):
+    return SimpleNamespace(
+        id=drop_id,
+        name=drop_id,
+        is_claimed=False,
+        has_preconditions_met=True,
+        minutes_required=minutes_left,
+        current_minutes_watched=0,
+        end_at=datetime.utcnow() + timedelta(minutes=ends_in),
+    )
+
+
+def make_streamer(campaigns):
+    return SimpleNamespace(
+        drops_condition=lambda: True, stream=SimpleNamespace(campaigns=campaigns)
+    )
+
+
+def make_campaign(campaign_id, drops):
+    return SimpleNamespace(
+        id=campaign_id,
+        name=campaign_id,
+        drops=drops,
+        end_at=datetime.utcnow() + timedelta(days=30),
+    )
+
+
+def test_binding_drop_defines_the_job():
+    # A long drop with a far deadline doesn't hide the urgent one of the same campaign
+    campaign = make_campaign(
+        "a", [make_drop("short", 10, 15), make_drop("long", 600, 10000)]
+    )
+    scheduler = DropsScheduler()
+    assert scheduler.select([make_streamer([campaign])], [0]) == 0
+    assert scheduler.infeasible == set()
+
+
+def test_earliest_deadline_first():
+    late = make_campaign("late", [make_drop("late", 30, 600)])
+    early = make_campaign("early", [make_drop("early", 30, 60)])
+    streamers = [make_streamer([late]), make_streamer([early])]
+    assert DropsScheduler().select(streamers, [0, 1]) == 1
+
+
+def test_infeasible_drop_is_reported_and_ignored():
+    campaign = make_campaign("a", [make_drop("too-long", 120, 60)])
+    scheduler = DropsScheduler()
+    assert scheduler.select([make_streamer([campaign])], [0]) is None
+    assert scheduler.infeasible == {"too-long"}
+
+
+def test_discarded_job_is_reported():
+    # Both fit alone, not together: the longest one is discarded (Moore-Hodgson)
+    short = make_campaign("short", [make_drop("short", 40, 60)])
+    long = make_campaign("long", [make_drop("long", 50, 61)])
+    streamers = [make_streamer([long]), make_streamer([short])]
+    scheduler = DropsScheduler()
+    assert scheduler.select(streamers, [0, 1]) == 1
+    assert scheduler.infeasible == {"long"}
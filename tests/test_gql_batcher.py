@@ -0,0 +1,74 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from TwitchChannelPointsMiner.classes.GqlBatcher import GqlBatcher
+
+
+class FakeGql(object):
+    def __init__(self, response=None):
+        self.calls = []
+        self.response = response
+
+    def send(self, json_data):
+        self.calls.append(json_data)
+        if self.response is not None:
+            return self.response
+        if isinstance(json_data, list):
+            return [{"data": item} for item in json_data]
+        return {"data": json_data}
+
+
+def test_single_operation_is_sent_alone():
+    gql = FakeGql()
+    batcher = GqlBatcher(gql.send, window=0.01)
+    assert batcher.post("a") == {"data": "a"}
+    assert gql.calls == ["a"]
+
+
+def test_concurrent_operations_are_batched_in_order():
+    gql = FakeGql()
+    batcher = GqlBatcher(gql.send, window=0.2)
+    futures = [batcher.submit(name) for name in ["a", "b", "c"]]
+    assert [future.result(2) for future in futures] == [
+        {"data": "a"},
+        {"data": "b"},
+        {"data": "c"},
+    ]
+    assert gql.calls == [["a", "b", "c"]]
+
+
+def test_full_batch_is_sent_without_waiting():
+    gql = FakeGql()
+    batcher = GqlBatcher(gql.send, window=5, max_size=2)
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(batcher.post, ["a", "b"]))
+    assert time.monotonic() - started < 1
+    assert sorted(result["data"] for result in results) == ["a", "b"]
+
+
+def test_urgent_operation_flushes_the_batch():
+    gql = FakeGql()
+    batcher = GqlBatcher(gql.send, window=5)
+    waiting = batcher.submit("a")
+    started = time.monotonic()
+    assert batcher.post("b", urgent=True) == {"data": "b"}
+    assert waiting.result(1) == {"data": "a"}
+    assert time.monotonic() - started < 1
+
+
+def test_failed_batch_is_shared_by_all_the_callers():
+    gql = FakeGql(response={"error": "Internal Server Error"})
+    batcher = GqlBatcher(gql.send, window=0.2)
+    futures = [batcher.submit(name) for name in ["a", "b"]]
+    assert [future.result(2) for future in futures] == [
+        {"error": "Internal Server Error"}
+    ] * 2
+
+
+def test_exception_resolves_the_futures():
+    def send(json_data):
+        raise ValueError("failed")
+
+    batcher = GqlBatcher(send, window=0.01)
+    assert batcher.post("a") == {}
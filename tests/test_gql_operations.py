@@ -0,0 +1,99 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from TwitchChannelPointsMiner.classes.Twitch import Twitch
+from TwitchChannelPointsMiner.constants import GQLOperation, GQLOperations
+
+HASH = "0" * 64
+
+
+def expected_body(name, variables=None):
+    body = {
+        "operationName": name,
+        "extensions": {"persistedQuery": {"version": 1, "sha256Hash": HASH}},
+    }
+    if variables is not None:
+        body["variables"] = variables
+    return body
+
+
+def test_body_without_variables():
+    request = GQLOperation("Operation", HASH).request()
+    assert request.variables is None
+    assert json.loads(request.body) == expected_body("Operation")
+
+
+def test_body_with_variables():
+    operation = GQLOperation("Operation", HASH, variables={"limit": 100})
+    assert json.loads(operation.request().body) == expected_body(
+        "Operation", {"limit": 100}
+    )
+    # The variables of the request replace the default ones
+    request = operation.request({"channel": "streamer", "nested": {"a": [1, None]}})
+    assert json.loads(request.body) == expected_body(
+        "Operation", {"channel": "streamer", "nested": {"a": [1, None]}}
+    )
+
+
+def test_default_variables_are_not_shared():
+    variables = {"input": {"sectionInputs": ["FOLLOWED_SECTION"]}}
+    operation = GQLOperation("Operation", HASH, variables=variables)
+    # Changing the dict given to the constructor doesn't change the operation
+    variables["input"]["sectionInputs"].append("OTHER")
+
+    request = operation.request()
+    request.variables["input"]["sectionInputs"].append("CHANGED")
+    assert operation.variables == {"input": {"sectionInputs": ["FOLLOWED_SECTION"]}}
+    assert operation.request().variables == operation.variables
+    assert json.loads(operation.request().body)["variables"] == operation.variables
+
+
+def test_operation_is_immutable():
+    operation = GQLOperation("Operation", HASH)
+    with pytest.raises(AttributeError):
+        operation.name = "Other"
+    assert operation.name == "Operation"
+
+
+def send(json_data):
+    sent = []
+    response = SimpleNamespace(status_code=200, text="", json=lambda: [])
+
+    def post(url, data=None, headers=None):
+        sent.append(data)
+        return response
+
+    twitch = SimpleNamespace(
+        http=SimpleNamespace(post=post),
+        gql_headers=lambda: {},
+        gql_limiter=SimpleNamespace(on_success=lambda: None),
+    )
+    Twitch._Twitch__send_gql_request(twitch, json_data)
+    return json.loads(sent[0].decode("utf-8"))
+
+
+def test_batch_body():
+    with_variables = GQLOperation("WithVariables", HASH, variables={"limit": 100})
+    without_variables = GQLOperation("WithoutVariables", HASH)
+    assert send(
+        [
+            with_variables.request(),
+            without_variables.request(),
+            with_variables.request({"limit": 1}),
+        ]
+    ) == [
+        expected_body("WithVariables", {"limit": 100}),
+        expected_body("WithoutVariables"),
+        expected_body("WithVariables", {"limit": 1}),
+    ]
+
+
+def test_single_body_is_not_a_batch():
+    request = GQLOperations.VideoPlayerStreamInfoOverlayChannel.request(
+        {"channel": "streamer"}
+    )
+    body = send(request)
+    assert body["operationName"] == "VideoPlayerStreamInfoOverlayChannel"
+    assert body["variables"] == {"channel": "streamer"}
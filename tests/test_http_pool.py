@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import pytest
+
+from TwitchChannelPointsMiner.classes.HttpPool import (
+    HeaderContext,
+    HttpPool,
+    HttpSettings,
+)
+from TwitchChannelPointsMiner.classes.Twitch import Twitch
+
+
+class FakeSession(object):
+    def __init__(self):
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        return SimpleNamespace(status_code=200)
+
+
+def test_one_session_per_host():
+    pool = HttpPool("agent", HttpSettings(pool_size=3))
+    gql = pool.session("https://gql.twitch.tv/gql")
+    assert pool.session("https://gql.twitch.tv/integrity") is gql
+    assert pool.session("https://usher.ttvnw.net/api") is not gql
+    assert gql.headers["User-Agent"] == "agent"
+    assert gql.get_adapter("https://gql.twitch.tv")._pool_maxsize == 3
+
+
+def test_default_timeout():
+    pool = HttpPool("agent", HttpSettings(connect_timeout=1, read_timeout=2))
+    session = pool.sessions["gql.twitch.tv"] = FakeSession()
+    pool.post("https://gql.twitch.tv/gql", data=b"{}")
+    pool.get("https://gql.twitch.tv/gql", timeout=(3, 4))
+    assert [kwargs["timeout"] for _, _, kwargs in session.requests] == [(1, 2), (3, 4)]
+    assert [method for method, _, _ in session.requests] == ["POST", "GET"]
+
+
+def test_header_context_is_immutable():
+    context = HeaderContext("token", "version", {"Authorization": "OAuth token"})
+    assert context.matches("token", "version") is True
+    assert context.matches("other", "version") is False
+    assert context.matches("token", "other") is False
+    with pytest.raises(AttributeError):
+        context.token = "other"
+    with pytest.raises(TypeError):
+        context.headers["Authorization"] = "OAuth other"
+
+
+def test_headers_are_rebuilt_only_on_change():
+    twitch = SimpleNamespace(
+        twitch_login=SimpleNamespace(token="token"),
+        client_version=SimpleNamespace(get=lambda: "version"),
+        header_context=None,
+        client_session="session",
+        user_agent="agent",
+        device_id="device",
+    )
+    headers = Twitch.gql_headers(twitch)
+    assert headers["Authorization"] == "OAuth token"
+    assert headers["Client-Version"] == "version"
+    assert Twitch.gql_headers(twitch) is headers
+
+    twitch.twitch_login.token = "new token"
+    assert Twitch.gql_headers(twitch)["Authorization"] == "OAuth new token"
+    twitch.client_version = SimpleNamespace(get=lambda: "new version")
+    assert Twitch.gql_headers(twitch)["Client-Version"] == "new version"
+
+
+def test_gql_is_routed_to_the_http2_transport():
+    pool = HttpPool("agent")
+    pool.async_http = FakeSession()
+    session = pool.sessions["usher.ttvnw.net"] = FakeSession()
+    pool.post("https://gql.twitch.tv/gql", data=b"{}")
+    pool.get("https://usher.ttvnw.net/api")
+    assert [url for _, url, _ in pool.async_http.requests] == [
+        "https://gql.twitch.tv/gql"
+    ]
+    assert [url for _, url, _ in session.requests] == ["https://usher.ttvnw.net/api"]
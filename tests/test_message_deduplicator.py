@@ -0,0 +1,41 @@
+from TwitchChannelPointsMiner.classes.MessageDeduplicator import MessageDeduplicator
+
+
+def test_second_copy_is_a_duplicate():
+    deduplicator = MessageDeduplicator()
+    assert deduplicator.is_duplicate("a") is False
+    assert deduplicator.is_duplicate("a") is True
+    assert deduplicator.is_duplicate("b") is False
+    assert deduplicator.stats() == {
+        "checks": 3,
+        "duplicates": 1,
+        "hit_rate": 0.3333,
+        "size": 2,
+    }
+
+
+def test_expired_message_is_forgotten():
+    deduplicator = MessageDeduplicator(window=60)
+    deduplicator.is_duplicate("a")
+    deduplicator.seen["a"] -= 61
+    assert deduplicator.is_duplicate("a") is False
+    assert len(deduplicator) == 1
+
+
+def test_oldest_message_is_evicted_when_full():
+    deduplicator = MessageDeduplicator(max_size=2)
+    deduplicator.is_duplicate("a")
+    deduplicator.is_duplicate("b")
+    # Hit, a becomes the most recent
+    assert deduplicator.is_duplicate("a") is True
+    deduplicator.is_duplicate("c")
+    assert list(deduplicator.seen) == ["a", "c"]
+    assert deduplicator.is_duplicate("b") is False
+
+
+def test_hit_on_a_full_cache_doesnt_evict():
+    deduplicator = MessageDeduplicator(max_size=2)
+    deduplicator.is_duplicate("a")
+    deduplicator.is_duplicate("b")
+    assert deduplicator.is_duplicate("b") is True
+    assert list(deduplicator.seen) == ["a", "b"]
@@ -0,0 +1,113 @@
+import math
+from types import SimpleNamespace
+
+from TwitchChannelPointsMiner.classes.PointsOptimizer import (
+    DROPS_POINTS_PER_MINUTE,
+    WATCH_POINTS_PER_MINUTE,
+    WATCH_STREAK_MINUTES,
+    WATCH_STREAK_POINTS,
+    PointsOptimizer,
+)
+
+NOW = 1_000_000
+
+
+def make_streamer(
+    username,
+    is_online=True,
+    online_at=0,
+    offline_at=0,
+    multiplier=0,
+    watch_streak_missing=False,
+    minute_watched=0,
+    drops=False,
+):
+    return SimpleNamespace(
+        username=username,
+        is_online=is_online,
+        online_at=online_at,
+        offline_at=offline_at,
+        total_points_multiplier=lambda: multiplier,
+        settings=SimpleNamespace(watch_streak=True),
+        stream=SimpleNamespace(
+            watch_streak_missing=watch_streak_missing, minute_watched=minute_watched
+        ),
+        drops_condition=lambda: drops,
+    )
+
+
+def test_multiplier_ranks_first():
+    optimizer = PointsOptimizer(
+        [make_streamer("a"), make_streamer("b", multiplier=0.5), make_streamer("c")]
+    )
+    assert optimizer.select(count=1, now=NOW) == [1]
+    assert optimizer.get_scores() == {
+        "a": WATCH_POINTS_PER_MINUTE,
+        "b": WATCH_POINTS_PER_MINUTE * 1.5,
+        "c": WATCH_POINTS_PER_MINUTE,
+    }
+
+
+def test_offline_and_just_online_are_not_eligible():
+    optimizer = PointsOptimizer(
+        [
+            make_streamer("offline", is_online=False, multiplier=1),
+            make_streamer("just-online", online_at=NOW - 10, multiplier=1),
+            make_streamer("online"),
+        ]
+    )
+    assert optimizer.select(now=NOW) == [2]
+    assert list(optimizer.get_scores()) == ["online"]
+    # Online for more than 30 seconds
+    assert optimizer.select(now=NOW + 30) == [1, 2]
+
+
+def test_watch_streak_is_spread_over_the_minutes_left():
+    optimizer = PointsOptimizer(
+        [
+            make_streamer("a", multiplier=1),
+            make_streamer("streak", watch_streak_missing=True, minute_watched=5),
+        ]
+    )
+    assert optimizer.select(count=1, now=NOW) == [1]
+    assert optimizer.get_scores()["streak"] == round(
+        WATCH_POINTS_PER_MINUTE + WATCH_STREAK_POINTS / (WATCH_STREAK_MINUTES - 5), 2
+    )
+
+
+def test_watch_streak_waits_30_minutes_offline():
+    streamer = make_streamer("streak", watch_streak_missing=True, offline_at=NOW - 60)
+    optimizer = PointsOptimizer([make_streamer("a"), streamer])
+    optimizer.compute(now=NOW)
+    assert optimizer.get_scores()["streak"] == WATCH_POINTS_PER_MINUTE
+    assert optimizer.next_change_at(now=NOW) == NOW - 60 + 31 * 60
+
+    optimizer.compute(now=NOW + 31 * 60)
+    assert optimizer.get_scores()["streak"] > WATCH_POINTS_PER_MINUTE
+    assert optimizer.next_change_at(now=NOW + 31 * 60) == math.inf
+
+
+def test_only_one_drops_streamer():
+    optimizer = PointsOptimizer(
+        [
+            make_streamer("drops-1", drops=True),
+            make_streamer("drops-2", drops=True),
+            make_streamer("points", multiplier=1),
+        ]
+    )
+    optimizer.compute(now=NOW)
+    assert optimizer.get_scores()["drops-1"] == (
+        WATCH_POINTS_PER_MINUTE + DROPS_POINTS_PER_MINUTE
+    )
+    # The second drops streamer doesn't make progress once the first is watched
+    assert optimizer.select(now=NOW) == [0, 2]
+
+
+def test_update_and_exclude():
+    streamers = [make_streamer("a"), make_streamer("b")]
+    optimizer = PointsOptimizer(streamers)
+    streamers[0].is_online = False
+    optimizer.update(0, streamers[0])
+    assert optimizer.select(now=NOW) == [1]
+    assert optimizer.select(now=NOW, exclude=[1]) == []
+    assert PointsOptimizer([]).select(now=NOW) == []
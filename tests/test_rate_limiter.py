@@ -0,0 +1,72 @@
+import time
+from threading import Thread
+
+from TwitchChannelPointsMiner.classes.RateLimiter import RateLimiter
+from TwitchChannelPointsMiner.constants import GQLPriority
+
+
+def test_burst_doesnt_wait():
+    limiter = RateLimiter(rate=10, burst=5)
+    for _ in range(5):
+        assert limiter.acquire() < 0.05
+    assert limiter.stats()["tokens"] < 1
+
+
+def test_empty_bucket_waits_for_the_refill():
+    limiter = RateLimiter(rate=20, burst=1)
+    limiter.acquire()
+    waited = limiter.acquire(cost=1)
+    assert 0.03 <= waited <= 0.2
+
+
+def test_cost_is_capped_by_the_burst():
+    limiter = RateLimiter(rate=100, burst=2)
+    assert limiter.acquire(cost=10) < 0.05
+
+
+def test_waiters_are_served_by_priority():
+    limiter = RateLimiter(rate=10, burst=1)
+    limiter.acquire()
+    served = []
+
+    def acquire(priority):
+        limiter.acquire(priority)
+        served.append(priority)
+
+    threads = [
+        Thread(target=acquire, args=(priority,))
+        for priority in [GQLPriority.BULK, GQLPriority.NORMAL, GQLPriority.CRITICAL]
+    ]
+    for count, thread in enumerate(threads, start=1):
+        thread.start()
+        # Queued in this order
+        while len(limiter.waiters) < count:
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join(2)
+
+    assert served == [GQLPriority.CRITICAL, GQLPriority.NORMAL, GQLPriority.BULK]
+
+
+def test_throttle_halves_the_rate_once_per_burst():
+    limiter = RateLimiter(rate=20, burst=40, min_rate=1)
+    limiter.on_throttled()
+    limiter.on_throttled()
+    stats = limiter.stats()
+    assert stats["rate"] == 10
+    assert stats["throttled"] == 2
+    assert stats["tokens"] <= 0
+
+
+def test_rate_is_restored_on_success():
+    limiter = RateLimiter(rate=20)
+    limiter.on_throttled()
+    limiter.last_throttled -= 11
+    limiter.on_success()
+    assert limiter.stats()["rate"] == 10.2
+
+
+def test_is_throttled():
+    assert RateLimiter.is_throttled({"errors": [{"message": "service timeout"}]})
+    assert not RateLimiter.is_throttled({"errors": [{"message": "failed integrity"}]})
+    assert not RateLimiter.is_throttled({"data": {}})
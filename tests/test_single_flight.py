@@ -0,0 +1,58 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+import pytest
+
+from TwitchChannelPointsMiner.classes.SingleFlight import SingleFlight
+
+
+def test_concurrent_calls_share_the_result():
+    single_flight = SingleFlight()
+    release = Event()
+    calls = []
+
+    def fetch(value):
+        calls.append(value)
+        release.wait(2)
+        return value * 2
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            executor.submit(single_flight.do, "key", fetch, 21) for _ in range(3)
+        ]
+        # Wait until all the followers are waiting for the leader
+        while single_flight.shared < 2:
+            time.sleep(0.001)
+        release.set()
+        assert [future.result(2) for future in futures] == [42] * 3
+    assert calls == [21]
+    assert single_flight.calls == {}
+
+
+def test_different_keys_dont_share():
+    single_flight = SingleFlight()
+    assert single_flight.do("a", str.upper, "a") == "A"
+    assert single_flight.do("b", str.upper, "b") == "B"
+    assert single_flight.shared == 0
+
+
+def test_exception_is_shared_and_forgotten():
+    single_flight = SingleFlight()
+    release = Event()
+
+    def fail():
+        release.wait(2)
+        raise ValueError("failed")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(single_flight.do, "key", fail) for _ in range(2)]
+        while single_flight.shared < 1:
+            time.sleep(0.001)
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result(2)
+
+    # The next call runs again
+    assert single_flight.do("key", int, "1") == 1
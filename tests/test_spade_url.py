@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+from TwitchChannelPointsMiner.classes.SpadeUrl import SpadeUrl
+
+PAGES = {
+    "https://www.twitch.tv/streamer": b'<script src="https://static.twitchcdn.net/config/settings.abc.js">',
+    "https://static.twitchcdn.net/config/settings.abc.js": b'{"spade_url":"https://spade.twitch.tv/track"}',
+}
+
+
+class FakeHttp(object):
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def get(self, url, headers=None, stream=False):
+        self.requested.append(url)
+        return SimpleNamespace(
+            encoding="utf-8",
+            iter_content=lambda chunk_size: iter([self.pages.get(url, b"")]),
+            close=lambda: None,
+        )
+
+
+def test_url_is_extracted_once():
+    http = FakeHttp(PAGES)
+    spade_url = SpadeUrl(http)
+    assert (
+        spade_url.get("https://www.twitch.tv/streamer")
+        == "https://spade.twitch.tv/track"
+    )
+    assert (
+        spade_url.get("https://www.twitch.tv/other") == "https://spade.twitch.tv/track"
+    )
+    assert len(http.requested) == 2
+
+
+def test_invalidate_extracts_again():
+    http = FakeHttp(PAGES)
+    spade_url = SpadeUrl(http)
+    spade_url.get("https://www.twitch.tv/streamer")
+    spade_url.invalidate()
+    spade_url.get("https://www.twitch.tv/streamer")
+    assert len(http.requested) == 4
+
+
+def test_failed_extraction_keeps_the_last_url():
+    http = FakeHttp(PAGES)
+    spade_url = SpadeUrl(http)
+    spade_url.get("https://www.twitch.tv/streamer")
+    spade_url.invalidate()
+    http.pages = {}
+    assert (
+        spade_url.get("https://www.twitch.tv/streamer")
+        == "https://spade.twitch.tv/track"
+    )
+    # Retried after a minute, not on every call
+    spade_url.get("https://www.twitch.tv/streamer")
+    assert len(http.requested) == 3
@@ -0,0 +1,55 @@
+import json
+import time
+from base64 import b64decode
+from types import SimpleNamespace
+
+import pytest
+
+from TwitchChannelPointsMiner.classes.entities.Stream import Stream
+from TwitchChannelPointsMiner.classes.Settings import Settings
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(Settings, "logger", SimpleNamespace(less=False), raising=False)
+
+
+def update(stream, broadcast_id):
+    stream.update(
+        broadcast_id=broadcast_id, title="title", game={}, tags=[], viewers_count=1
+    )
+
+
+def test_playlist_url_is_cached_until_the_token_expires():
+    stream = Stream()
+    assert stream.playlist_url_expired() is True
+    stream.set_playlist_url("https://playlist.m3u8", time.time() + 3600)
+    assert stream.playlist_url_expired() is False
+    # One minute of margin
+    stream.set_playlist_url("https://playlist.m3u8", time.time() + 30)
+    assert stream.playlist_url_expired() is True
+
+
+def test_new_broadcast_resets_the_playlist_url():
+    stream = Stream()
+    update(stream, "1")
+    stream.set_playlist_url("https://playlist.m3u8", time.time() + 3600)
+    update(stream, "1")
+    assert stream.playlist_url == "https://playlist.m3u8"
+    update(stream, "2")
+    assert stream.playlist_url is None
+    assert stream.playlist_url_expired() is True
+
+
+def test_encoded_payload_is_cached_until_the_payload_changes():
+    stream = Stream()
+    stream.payload = [{"event": "minute-watched", "properties": {"channel": "a"}}]
+    encoded = stream.encode_payload()
+    assert stream.encode_payload() is encoded
+    assert json.loads(b64decode(encoded["data"])) == stream.payload
+
+    stream.payload = [{"event": "minute-watched", "properties": {"channel": "b"}}]
+    assert stream.encode_payload() is not encoded
+    assert json.loads(b64decode(stream.encode_payload()["data"]))[0]["properties"] == {
+        "channel": "b"
+    }
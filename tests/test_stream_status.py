@@ -0,0 +1,162 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from TwitchChannelPointsMiner.classes.Chat import ChatPresence
+from TwitchChannelPointsMiner.classes.entities.Streamer import (
+    Streamer,
+    StreamerSettings,
+)
+from TwitchChannelPointsMiner.classes.Settings import Settings
+from TwitchChannelPointsMiner.classes.Twitch import Twitch
+
+OFFLINE = {"data": {"user": {"stream": None}}}
+ONLINE = {"data": {"user": {"stream": {"id": "1"}}}}
+
+
+@pytest.fixture(autouse=True)
+def settings_logger(monkeypatch):
+    monkeypatch.setattr(Settings, "logger", SimpleNamespace(less=False), raising=False)
+
+
+@pytest.fixture
+def toggled(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        Streamer, "toggle_chat", lambda streamer: calls.append(streamer.is_online)
+    )
+    return calls
+
+
+def make_streamer(username="streamer", claim_drops=False):
+    streamer = Streamer(
+        username,
+        settings=StreamerSettings(claim_drops=claim_drops, chat=ChatPresence.ONLINE),
+    )
+    streamer.channel_id = f"id-{username}"
+    return streamer
+
+
+def make_twitch():
+    def update_stream(streamer, response=None, campaigns_response=None):
+        Twitch._Twitch__parse_stream_info(None, response)
+
+    return SimpleNamespace(
+        _Twitch__parse_stream_info=lambda response: Twitch._Twitch__parse_stream_info(
+            None, response
+        ),
+        get_spade_url=lambda streamer: None,
+        update_stream=update_stream,
+        watch_selector=SimpleNamespace(notify=lambda streamer: None),
+    )
+
+
+def test_poll_of_offline_streamer_sends_nothing(toggled, caplog):
+    streamer = make_streamer()
+    twitch = make_twitch()
+    with caplog.at_level("INFO"):
+        Twitch.check_streamer_online(twitch, streamer, response=OFFLINE)
+        Twitch.check_streamer_online(twitch, streamer, response=OFFLINE)
+    assert streamer.is_online is False
+    assert toggled == []
+    assert "is Offline!" not in caplog.text
+
+
+def test_status_change_notifies_once(toggled, caplog):
+    streamer = make_streamer()
+    twitch = make_twitch()
+    with caplog.at_level("INFO"):
+        Twitch.check_streamer_online(twitch, streamer, response=ONLINE)
+        Twitch.check_streamer_online(twitch, streamer, response=ONLINE)
+    assert streamer.is_online is True
+    assert toggled == [True]
+    assert caplog.text.count("is Online!") == 1
+
+    with caplog.at_level("INFO"):
+        Twitch.check_streamer_online(twitch, streamer, response=OFFLINE)
+        streamer.set_offline()
+    assert streamer.is_online is False
+    assert toggled == [True, False]
+    assert caplog.text.count("is Offline!") == 1
+
+
+def test_poll_interval():
+    poll_interval = Twitch._Twitch__poll_interval
+    streamer = make_streamer()
+    streamer.is_online = True
+    assert poll_interval(None, streamer) == 120
+
+    streamer.is_online = False
+    streamer.offline_at = time.time() - 5 * 60
+    assert poll_interval(None, streamer) == 60
+    streamer.offline_at = time.time() - 30 * 60
+    assert poll_interval(None, streamer) == 5 * 60
+    streamer.offline_at = time.time() - 2 * 60 * 60
+    assert poll_interval(None, streamer) == 15 * 60
+
+    # Never seen online nor offline
+    streamer.offline_at = 0
+    assert poll_interval(None, streamer) == 15 * 60
+
+
+def make_batch_twitch(responses, batch_size=4):
+    sent, checked = [], []
+    twitch = SimpleNamespace(
+        http=SimpleNamespace(settings=SimpleNamespace(gql_batch_size=batch_size)),
+        post_gql_request=lambda json_data: sent.append(json_data) or responses.pop(0),
+        check_streamer_online=lambda streamer, **kwargs: checked.append(
+            (streamer.username, kwargs)
+        ),
+    )
+    return twitch, sent, checked
+
+
+def test_check_streamers_online_batches_drops_lookups():
+    online = make_streamer("online", claim_drops=True)
+    online.is_online = True
+    streamers = [make_streamer("a"), online, make_streamer("b")]
+    twitch, sent, checked = make_batch_twitch(
+        [[OFFLINE, ONLINE, {"campaigns": 1}], [OFFLINE]]
+    )
+    Twitch.check_streamers_online(twitch, streamers)
+
+    # Two streamers per request, the drops lookup shares the first one
+    assert [
+        [request.operation_name for request in json_data] for json_data in sent
+    ] == [
+        [
+            "VideoPlayerStreamInfoOverlayChannel",
+            "VideoPlayerStreamInfoOverlayChannel",
+            "DropsHighlightService_AvailableDrops",
+        ],
+        ["VideoPlayerStreamInfoOverlayChannel"],
+    ]
+    assert sent[0][2].variables == {"channelID": "id-online"}
+    assert checked == [
+        ("a", {"response": OFFLINE, "campaigns_response": None}),
+        ("online", {"response": ONLINE, "campaigns_response": {"campaigns": 1}}),
+        ("b", {"response": OFFLINE, "campaigns_response": None}),
+    ]
+
+
+def test_check_streamers_online_skips_invalid_batch():
+    streamers = [make_streamer("a"), make_streamer("b"), make_streamer("c")]
+    # Not a list, then a missing response
+    twitch, sent, checked = make_batch_twitch([{}, []])
+    Twitch.check_streamers_online(twitch, streamers)
+    assert len(sent) == 2
+    assert checked == []
+
+
+def test_check_streamers_online_invalid_item_doesnt_stop_the_chunk():
+    streamers = [make_streamer("a"), make_streamer("b"), make_streamer("c")]
+    twitch, sent, checked = make_batch_twitch([[{"data": None}, {}], [ONLINE]])
+
+    def check_streamer_online(streamer, response=None, campaigns_response=None):
+        response["data"]["user"]
+        checked.append(streamer.username)
+
+    twitch.check_streamer_online = check_streamer_online
+    Twitch.check_streamers_online(twitch, streamers)
+    assert checked == ["c"]
@@ -0,0 +1,124 @@
+import json
+import re
+import time
+from datetime import datetime, timedelta, timezone
+
+from dateutil import parser
+
+from TwitchChannelPointsMiner.utils import (
+    last_url_line,
+    parse_iso_datetime,
+    playback_token_expires,
+    search_stream,
+    server_time,
+)
+
+
+class FakeResponse(object):
+    def __init__(self, chunks, encoding="utf-8"):
+        self.chunks = chunks
+        self.encoding = encoding
+        self.read = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+    def iter_lines(self, decode_unicode=False):
+        for line in b"".join(self.chunks).splitlines():
+            self.read += 1
+            yield line.decode(self.encoding) if decode_unicode else line
+
+    def close(self):
+        self.closed = True
+
+
+def test_search_stream_stops_at_the_first_match():
+    response = FakeResponse(
+        [b"<head>", b'"spade_url":"https://spade"', b"</head>", b"x"]
+    )
+    matcher = search_stream(response, re.compile(r'"spade_url":"(.*?)"'))
+    assert matcher.group(1) == "https://spade"
+    assert response.read == 2
+    assert response.closed is True
+
+
+def test_search_stream_across_chunks():
+    # The pattern and a multibyte character are split between two chunks
+    text = 'é "spade_url":"https://spade"'.encode("utf-8")
+    response = FakeResponse([text[:1], text[1:10], text[10:]])
+    matcher = search_stream(response, re.compile(r'é "spade_url":"(.*?)"'))
+    assert matcher.group(1) == "https://spade"
+
+
+def test_search_stream_without_match():
+    response = FakeResponse([b"a" * 100, b"b" * 100])
+    assert search_stream(response, re.compile("c"), overlap=10) is None
+    assert response.closed is True
+
+
+def test_last_url_line_skips_the_tags():
+    response = FakeResponse(
+        [
+            b"#EXTM3U\n#EXT-X-MEDIA\nhttps://low.m3u8\n",
+            b"#EXT-X-STREAM\nhttps://audio.m3u8\n\n",
+        ]
+    )
+    assert last_url_line(response) == "https://audio.m3u8"
+    assert response.closed is True
+
+
+def test_playback_token_expires():
+    assert playback_token_expires(json.dumps({"expires": 1700000000})) == 1700000000
+    # Unknown format, short default TTL
+    before = time.time()
+    assert before + 300 <= playback_token_expires("not json") <= time.time() + 300
+    assert playback_token_expires("{}", default_ttl=10) <= time.time() + 10
+
+
+def test_parse_nanoseconds_utc():
+    assert parse_iso_datetime("2021-04-12T18:12:31.460786473Z") == datetime(
+        2021, 4, 12, 18, 12, 31, 460786, tzinfo=timezone.utc
+    )
+
+
+def test_parse_without_fraction_nor_offset():
+    parsed = parse_iso_datetime("2021-04-12T18:12:31")
+    assert parsed == datetime(2021, 4, 12, 18, 12, 31)
+    assert parsed.tzinfo is None
+
+
+def test_parse_short_fraction_and_offsets():
+    assert parse_iso_datetime("2021-04-12T18:12:31.5+02:00") == datetime(
+        2021, 4, 12, 18, 12, 31, 500000, tzinfo=timezone(timedelta(hours=2))
+    )
+    assert parse_iso_datetime("2021-04-12 18:12:31-0530").utcoffset() == -timedelta(
+        hours=5, minutes=30
+    )
+
+
+def test_same_result_as_dateutil():
+    for value in [
+        "2021-04-12T18:12:31.460786473Z",
+        "2021-04-12T18:12:31Z",
+        "2021-04-12T18:12:31.123+01:00",
+    ]:
+        assert parse_iso_datetime(value) == parser.parse(value)
+
+
+def test_other_formats_fall_back_to_dateutil():
+    assert parse_iso_datetime("April 12 2021 18:12") == datetime(2021, 4, 12, 18, 12)
+
+
+def test_parse_server_time():
+    value = server_time({"server_time": 1700000000.123})
+    assert value == "2023-11-14T22:13:20.123000Z"
+    assert parse_iso_datetime(value) == datetime(
+        2023, 11, 14, 22, 13, 20, 123000, tzinfo=timezone.utc
+    )
+    assert parse_iso_datetime(server_time({"server_time": 1700000000})) == (
+        datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
+    )
+    assert parse_iso_datetime(server_time(None)).tzinfo == timezone.utc
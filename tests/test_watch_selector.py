@@ -0,0 +1,115 @@
+import time
+from threading import Thread
+from types import SimpleNamespace
+
+from TwitchChannelPointsMiner.classes.Settings import Priority
+from TwitchChannelPointsMiner.classes.WatchSelector import WatchSelector
+
+
+def make_streamer(username, is_online=True, online_at=0, channel_points=0):
+    return SimpleNamespace(
+        username=username,
+        is_online=is_online,
+        online_at=online_at,
+        offline_at=0,
+        channel_points=channel_points,
+    )
+
+
+def test_attach_selects_the_online_streamers():
+    streamers = [
+        make_streamer("a", is_online=False),
+        make_streamer("b"),
+        make_streamer("c"),
+        make_streamer("d"),
+    ]
+    selector = WatchSelector()
+    selector.attach(streamers, [Priority.ORDER])
+    assert selector.select() == [1, 2]
+    # Consumed by select()
+    assert selector.changed is False
+
+
+def test_notify_updates_the_selection():
+    streamers = [make_streamer("a", is_online=False), make_streamer("b")]
+    selector = WatchSelector()
+    selector.attach(streamers, [Priority.ORDER])
+    selector.select()
+
+    streamers[0].is_online = True
+    selector.notify(streamers[0])
+    assert selector.changed is True
+    assert selector.select() == [0, 1]
+
+    streamers[1].is_online = False
+    selector.notify(streamers[1])
+    assert selector.select() == [0]
+
+    # Unknown streamer, the selection doesn't change
+    selector.notify(make_streamer("unknown"))
+    assert selector.changed is False
+
+
+def test_notify_points_only_for_the_points_priorities():
+    streamers = [make_streamer("a", channel_points=10), make_streamer("b")]
+    selector = WatchSelector()
+    selector.attach(streamers, [Priority.POINTS_ASCENDING])
+    assert selector.select() == [1, 0]
+    streamers[1].channel_points = 20
+    selector.notify_points(streamers[1])
+    assert selector.select() == [0, 1]
+
+    selector.attach(streamers, [Priority.ORDER])
+    selector.select()
+    streamers[0].is_online = False
+    # Not a status change, ORDER doesn't depend on the points
+    selector.notify_points(streamers[0])
+    assert selector.changed is False
+
+
+def test_just_online_waits_30_seconds():
+    now = time.time()
+    streamers = [make_streamer("a", online_at=now)]
+    selector = WatchSelector()
+    selector.attach(streamers, [Priority.ORDER])
+    assert selector.select() == []
+    assert selector.next_change_at == now + 30
+
+    # The selection is computed again once the time has come
+    selector.next_change_at = 0
+    streamers[0].online_at = now - 31
+    assert selector.select() == [0]
+
+
+def test_wait_returns_on_change(wait_until):
+    streamers = [make_streamer("a", is_online=False)]
+    selector = WatchSelector()
+    selector.attach(streamers, [Priority.ORDER])
+    selector.select()
+
+    returned = []
+    thread = Thread(target=lambda: returned.append(selector.wait(10)))
+    thread.start()
+    streamers[0].is_online = True
+    selector.notify(streamers[0])
+    assert wait_until(lambda: returned != []) is True
+    thread.join()
+
+
+def test_wake_interrupts_wait(wait_until):
+    selector = WatchSelector()
+    selector.attach([], [Priority.ORDER])
+
+    returned = []
+    thread = Thread(target=lambda: returned.append(selector.wait(10)))
+    thread.start()
+    time.sleep(0.05)
+    assert returned == []
+    selector.wake()
+    assert wait_until(lambda: returned != []) is True
+    thread.join()
+
+    # Already changed, don't wait at all
+    started = time.time()
+    selector.wait(10)
+    assert time.time() - started < 1
@@ -0,0 +1,126 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from TwitchChannelPointsMiner.classes import WebSocketsPool as websockets_pool
+from TwitchChannelPointsMiner.classes.WebSocketsPool import WebSocketsPool
+
+
+def make_streamer(channel_id, username):
+    return SimpleNamespace(channel_id=channel_id, username=username)
+
+
+def make_message(topic, message_type, server_time=1700000000, **data):
+    return json.dumps(
+        {
+            "type": "MESSAGE",
+            "data": {
+                "topic": topic,
+                "message": json.dumps(
+                    {"type": message_type, "server_time": server_time, **data}
+                ),
+            },
+        }
+    )
+
+
+@pytest.fixture
+def pool():
+    return WebSocketsPool(
+        None, [make_streamer(1, "one"), make_streamer("2", "two")], {}
+    )
+
+
+@pytest.fixture
+def handled(monkeypatch):
+    calls = []
+
+    def handler(ws, message, streamer):
+        calls.append((message.type, streamer.username))
+
+    for key in [
+        ("video-playback-by-id", "stream-down"),
+        ("video-playback-by-id", "viewcount"),
+    ]:
+        deduplicate = websockets_pool.MESSAGE_HANDLERS[key][1]
+        monkeypatch.setitem(
+            websockets_pool.MESSAGE_HANDLERS, key, (handler, deduplicate)
+        )
+    return calls
+
+
+def test_streamers_by_channel_id(pool):
+    # The channel_id of the messages is always a string
+    assert pool.streamers_by_channel_id["1"].username == "one"
+    assert pool.streamers_by_channel_id["2"].username == "two"
+    pool.add_streamer(make_streamer(3, "three"))
+    assert pool.streamers_by_channel_id["3"].username == "three"
+    # Updated in place
+    pool.add_streamer(make_streamer(1, "renamed"))
+    assert pool.streamers_by_channel_id["1"].username == "renamed"
+    assert len(pool.streamers_by_channel_id) == 3
+
+
+def test_message_routed_to_the_streamer(pool, handled):
+    ws = SimpleNamespace(index=0, parent_pool=pool)
+    WebSocketsPool.on_message(ws, make_message("video-playback-by-id.2", "stream-down"))
+    # Unknown channel
+    WebSocketsPool.on_message(ws, make_message("video-playback-by-id.9", "stream-down"))
+    assert handled == [("stream-down", "two")]
+
+
+def test_unhandled_message_is_not_decoded(pool, handled):
+    ws = SimpleNamespace(index=0, parent_pool=pool)
+    message = json.dumps(
+        {
+            "type": "MESSAGE",
+            "data": {
+                "topic": "video-playback-by-id.1",
+                "message": '{"type": "commercial", "invalid json',
+            },
+        }
+    )
+    WebSocketsPool.on_message(ws, message)
+    assert handled == []
+
+
+def test_deduplicated_handlers(pool, handled):
+    ws = SimpleNamespace(index=0, parent_pool=pool)
+    for _ in range(2):
+        WebSocketsPool.on_message(
+            ws, make_message("video-playback-by-id.1", "stream-down")
+        )
+        WebSocketsPool.on_message(
+            ws, make_message("video-playback-by-id.1", "viewcount", viewers=10)
+        )
+    # A viewcount only triggers an idempotent check, it's never deduplicated
+    assert handled == [
+        ("stream-down", "one"),
+        ("viewcount", "one"),
+        ("viewcount", "one"),
+    ]
+
+
+def test_handler_exception_is_logged(pool, monkeypatch, caplog):
+    def handler(ws, message, streamer):
+        raise KeyError("balance")
+
+    monkeypatch.setitem(
+        websockets_pool.MESSAGE_HANDLERS,
+        ("video-playback-by-id", "stream-down"),
+        (handler, True),
+    )
+    ws = SimpleNamespace(index=0, parent_pool=pool)
+    WebSocketsPool.on_message(ws, make_message("video-playback-by-id.1", "stream-down"))
+    assert "Exception raised for topic: video-playback-by-id" in caplog.text
+
+
+def test_every_handler_is_a_websockets_pool_handler():
+    for (topic, message_type), (
+        function,
+        deduplicate,
+    ) in websockets_pool.MESSAGE_HANDLERS.items():
+        assert function.__name__.startswith("on_")
+        assert getattr(WebSocketsPool, function.__name__) is function
+        assert isinstance(deduplicate, bool)